@@ -1,502 +1,51 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import sqlite3
-import hashlib
-import os
-import datetime
-import time
-import uuid
-import re
-from streamlit_chat import message
-
-# Configuração da página
-st.set_page_config(page_title="FeedSmart - Sistema de Feedback", layout="wide", page_icon="🤖")
-
-# ==================== ESTRUTURAS DE DADOS INTEGRADAS ====================
-
-class FeedbackQueue:
-    """
-    Implementação de uma fila para gerenciar solicitações de feedback.
-    
-    Esta estrutura de dados segue o princípio FIFO (First In, First Out),
-    onde o primeiro feedback adicionado será o primeiro a ser processado.
-    """
-    
-    def __init__(self):
-        """Inicializa uma fila vazia."""
-        self.items = []
-    
-    def is_empty(self):
-        """Verifica se a fila está vazia."""
-        return len(self.items) == 0
-    
-    def enqueue(self, item):
-        """Adiciona um item ao final da fila."""
-        self.items.append(item)
-    
-    def dequeue(self):
-        """Remove e retorna o item do início da fila."""
-        if self.is_empty():
-            return None
-        return self.items.pop(0)
-    
-    def peek(self):
-        """Retorna o item do início da fila sem removê-lo."""
-        if self.is_empty():
-            return None
-        return self.items[0]
-    
-    def size(self):
-        """Retorna o tamanho da fila."""
-        return len(self.items)
-    
-    def clear(self):
-        """Limpa a fila."""
-        self.items = []
-    
-    def get_all(self):
-        """Retorna todos os itens da fila sem removê-los."""
-        return self.items.copy()
-    
-    def process_next(self):
-        """
-        Processa o próximo feedback na fila baseado na prioridade.
-        Remove e retorna o item com maior prioridade.
-        """
-        if self.is_empty():
-            return None
-        
-        # Encontrar item com maior prioridade (maior número = maior prioridade)
-        max_priority_index = 0
-        for i in range(1, len(self.items)):
-            if self.items[i]['priority'] > self.items[max_priority_index]['priority']:
-                max_priority_index = i
-        
-        # Remover e retornar o item de maior prioridade
-        return self.items.pop(max_priority_index)
-    
-    def get_sorted_by_priority(self):
-        """Retorna itens ordenados por prioridade (maior prioridade primeiro)."""
-        return sorted(self.items, key=lambda x: x['priority'], reverse=True)
-
-# ==================== ALGORITMOS DE ORDENAÇÃO INTEGRADOS ====================
-
-def merge_sort_by_rating(arr):
-    """
-    Implementação do algoritmo Merge Sort para ordenar índices com base nos valores de avaliação.
-    Retorna uma lista de índices ordenados do maior para o menor valor.
-    
-    Complexidade: O(n log n)
-    Tipo: Divisão e conquista
-    Estável: Sim
-    
-    Args:
-        arr: Lista de valores de avaliação
-        
-    Returns:
-        Lista de índices ordenados (maior para menor)
-    """
-    # Criar lista de tuplas (valor, índice)
-    indexed_arr = [(arr[i], i) for i in range(len(arr))]
-    
-    def merge_sort(arr):
-        """Função recursiva principal do merge sort."""
-        if len(arr) <= 1:
-            return arr
-        
-        # Dividir o array
-        mid = len(arr) // 2
-        left = merge_sort(arr[:mid])
-        right = merge_sort(arr[mid:])
-        
-        # Conquistar (mesclar)
-        return merge(left, right)
-    
-    def merge(left, right):
-        """Função para mesclar duas listas ordenadas."""
-        result = []
-        i = j = 0
-        
-        # Mesclar ordenando do maior para o menor (ordem decrescente)
-        while i < len(left) and j < len(right):
-            if left[i][0] >= right[j][0]:  # Comparar valores
-                result.append(left[i])
-                i += 1
-            else:
-                result.append(right[j])
-                j += 1
-        
-        # Adicionar elementos restantes
-        result.extend(left[i:])
-        result.extend(right[j:])
-        
-        return result
-    
-    # Executar o merge sort
-    sorted_arr = merge_sort(indexed_arr)
-    
-    # Extrair apenas os índices da lista ordenada
-    return [item[1] for item in sorted_arr]
+"""
+Interface Streamlit do FeedSmart.
 
-# ==================== GRÁFICO PRODUTO VS ENTREGA ====================
+Toda a lógica (banco, fila, análise, gráficos) fica no pacote `feedsmart`,
+que não depende do Streamlit. Módulos pesados (pandas, matplotlib,
+streamlit_chat) são importados só nas páginas que os usam, para que a tela
+de login abra sem carregá-los.
+"""
+import datetime
 
-def extract_ratings_from_comments(feedbacks):
-    """
-    Extrai avaliações de produto e entrega dos comentários estruturados.
-    
-    Args:
-        feedbacks: DataFrame com feedbacks
-    
-    Returns:
-        tuple: (product_ratings, delivery_ratings)
-    """
-    product_ratings = []
-    delivery_ratings = []
-    
-    for comment in feedbacks['comment']:
-        # Padrão para extrair avaliações do comentário estruturado
-        product_match = re.search(r'Avaliação do produto: (\d+)/5', comment)
-        delivery_match = re.search(r'Avaliação da entrega: (\d+)/5', comment)
-        
-        if product_match and delivery_match:
-            product_ratings.append(int(product_match.group(1)))
-            delivery_ratings.append(int(delivery_match.group(1)))
-        else:
-            # Fallback: usar rating geral se não conseguir extrair
-            rating = feedbacks[feedbacks['comment'] == comment]['rating'].iloc[0]
-            product_ratings.append(rating)
-            delivery_ratings.append(rating)
-    
-    return product_ratings, delivery_ratings
+import streamlit as st
 
-def create_product_vs_delivery_chart(feedbacks):
-    """
-    Cria um gráfico comparativo entre satisfação com produto e entrega.
-    
-    Args:
-        feedbacks: DataFrame com os feedbacks do usuário
-    
-    Returns:
-        tuple: (matplotlib.figure.Figure, avg_product, avg_delivery)
-    """
-    if feedbacks.empty:
-        return None, 0, 0
-    
-    # Extrair avaliações de produto e entrega
-    product_ratings, delivery_ratings = extract_ratings_from_comments(feedbacks)
-    
-    # Calcular médias
-    avg_product = np.mean(product_ratings)
-    avg_delivery = np.mean(delivery_ratings)
-    
-    # Criar figura com subplots
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # === GRÁFICO 1: Comparação de Médias ===
-    categories = ['🛍️ Qualidade\ndos Produtos', '🚚 Prazo de\nEntrega']
-    averages = [avg_product, avg_delivery]
-    colors = ['#3498db', '#e74c3c']
-    
-    bars = ax1.bar(categories, averages, color=colors, alpha=0.8, width=0.6)
-    
-    # Adicionar valores nas barras
-    for bar, avg in zip(bars, averages):
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                f'{avg:.1f}/5', ha='center', va='bottom', fontsize=14, fontweight='bold')
-    
-    # Linha de referência (média geral)
-    overall_avg = (avg_product + avg_delivery) / 2
-    ax1.axhline(y=overall_avg, color='gray', linestyle='--', alpha=0.7, 
-                label=f'Média Geral: {overall_avg:.1f}/5')
-    
-    ax1.set_ylim(0, 5.5)
-    ax1.set_ylabel('Avaliação Média', fontsize=12)
-    ax1.set_title('📊 Produto vs Entrega - Comparação', fontsize=14, fontweight='bold')
-    ax1.grid(axis='y', alpha=0.3)
-    ax1.legend()
-    
-    # === GRÁFICO 2: Distribuição Detalhada ===
-    # Contar frequência de cada nota
-    product_counts = [product_ratings.count(i) for i in range(1, 6)]
-    delivery_counts = [delivery_ratings.count(i) for i in range(1, 6)]
-    
-    x = np.arange(1, 6)  # Notas de 1 a 5
-    width = 0.35
-    
-    bars1 = ax2.bar(x - width/2, product_counts, width, label='🛍️ Produto', 
-                    color='#3498db', alpha=0.8)
-    bars2 = ax2.bar(x + width/2, delivery_counts, width, label='🚚 Entrega', 
-                    color='#e74c3c', alpha=0.8)
-    
-    # Adicionar valores nas barras
-    for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:  # Só mostrar se houver valor
-                ax2.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                        f'{int(height)}', ha='center', va='bottom', fontsize=10)
-    
-    ax2.set_xlabel('Avaliação (estrelas)', fontsize=12)
-    ax2.set_ylabel('Quantidade de Avaliações', fontsize=12)
-    ax2.set_title('📈 Distribuição de Notas', fontsize=14, fontweight='bold')
-    ax2.set_xticks(x)
-    ax2.set_xticklabels([f'{i}⭐' for i in range(1, 6)])
-    ax2.legend()
-    ax2.grid(axis='y', alpha=0.3)
-    
-    plt.tight_layout()
-    return fig, avg_product, avg_delivery
+from feedsmart.analytics.insights import create_insights_text
+from feedsmart.cache import user_data_cache
+from feedsmart.comments import format_structured_comment
+from feedsmart.products import PRODUCTS
+from feedsmart.storage.exporter import EXPORT_FORMATS, export_bytes, export_filename, export_mimetype
+from feedsmart.storage.feedback import (
+    feedback_queue,
+    get_cached_user_stats,
+    get_user_feedbacks,
+    save_feedback,
+    sync_user_data_cache,
+)
+from feedsmart.storage.migrations import ensure_schema
+from feedsmart.storage.users import is_admin, register_user, verify_login
+from feedsmart import metrics, tracing
 
-def create_insights_text(avg_product, avg_delivery):
-    """
-    Gera insights personalizados baseados nas avaliações.
-    
-    Args:
-        avg_product: Média de avaliação dos produtos
-        avg_delivery: Média de avaliação da entrega
-    
-    Returns:
-        dict: Dicionário com insights e recomendações
-    """
-    diff = abs(avg_product - avg_delivery)
-    
-    insights = {
-        'better_category': '',
-        'difference': diff,
-        'recommendation': '',
-        'status': ''
-    }
-    
-    if avg_product > avg_delivery:
-        insights['better_category'] = 'produtos'
-        insights['status'] = f"🛍️ **Produtos são seu ponto forte!** ({avg_product:.1f}/5 vs {avg_delivery:.1f}/5)"
-        if diff > 1.0:
-            insights['recommendation'] = "🚚 **Atenção:** Considere conversar com a loja sobre melhorias na entrega."
-        else:
-            insights['recommendation'] = "📦 A entrega pode melhorar um pouco, mas está no caminho certo."
-    
-    elif avg_delivery > avg_product:
-        insights['better_category'] = 'entrega'
-        insights['status'] = f"🚚 **Entrega é seu ponto forte!** ({avg_delivery:.1f}/5 vs {avg_product:.1f}/5)"
-        if diff > 1.0:
-            insights['recommendation'] = "🛍️ **Atenção:** Talvez seja hora de experimentar outros produtos da loja."
-        else:
-            insights['recommendation'] = "🎯 Os produtos podem melhorar, mas você está satisfeito no geral."
-    
-    else:
-        insights['better_category'] = 'equilibrado'
-        insights['status'] = f"⚖️ **Experiência equilibrada!** (Ambos com {avg_product:.1f}/5)"
-        insights['recommendation'] = "🎉 Parabéns! Você tem uma experiência consistente em ambas as áreas."
-    
-    return insights
+# Configuração da página
+st.set_page_config(page_title="FeedSmart - Sistema de Feedback", layout="wide", page_icon="🤖")
 
 # ==================== BANCO DE DADOS ====================
 
 def init_db():
-    """Inicializa o banco de dados e cria as tabelas necessárias."""
-    conn = sqlite3.connect('feedback_app.db')
-    c = conn.cursor()
-    
-    # Criar tabela de usuários se não existir
-    c.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id TEXT PRIMARY KEY,
-        username TEXT UNIQUE,
-        password TEXT,
-        name TEXT,
-        email TEXT
-    )
-    ''')
-    
-    # Criar tabela de feedback se não existir
-    c.execute('''
-    CREATE TABLE IF NOT EXISTS feedback (
-        id TEXT PRIMARY KEY,
-        user_id TEXT,
-        rating REAL,
-        comment TEXT,
-        timestamp TEXT,
-        priority INTEGER DEFAULT 0,
-        FOREIGN KEY (user_id) REFERENCES users (id)
-    )
-    ''')
-    
-    # Sistema de migração: Verificar se a coluna priority existe
-    try:
-        c.execute("SELECT priority FROM feedback LIMIT 1")
-    except sqlite3.OperationalError:
-        # Coluna priority não existe, vamos adicioná-la
-        c.execute("ALTER TABLE feedback ADD COLUMN priority INTEGER DEFAULT 0")
-        print("✅ Migração: Coluna 'priority' adicionada à tabela feedback")
-    
-    # Criar índices para melhor performance
-    try:
-        c.execute("CREATE INDEX IF NOT EXISTS idx_feedback_user_id ON feedback(user_id)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON feedback(timestamp)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_feedback_priority ON feedback(priority)")
-    except sqlite3.Error as e:
-        print(f"Aviso: Erro ao criar índices: {e}")
-    
-    conn.commit()
-    conn.close()
-
-def hash_password(password):
-    """Criptografa uma senha usando SHA-256."""
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def verify_login(username, password):
-    """
-    Verifica as credenciais de login do usuário.
-    
-    Args:
-        username (str): Nome de usuário
-        password (str): Senha em texto plano
-        
-    Returns:
-        dict or None: Dados do usuário se válido, None se inválido
-    """
-    conn = sqlite3.connect('feedback_app.db')
-    c = conn.cursor()
-    
-    c.execute("SELECT id, password, name FROM users WHERE username = ?", (username,))
-    result = c.fetchone()
-    conn.close()
-    
-    if result and result[1] == hash_password(password):
-        return {"id": result[0], "name": result[2], "username": username}
-    return None
-
-def register_user(username, password, name, email):
-    """
-    Registra um novo usuário no sistema com validação completa.
-    
-    Args:
-        username (str): Nome de usuário único
-        password (str): Senha em texto plano
-        name (str): Nome completo
-        email (str): Email do usuário
-        
-    Returns:
-        tuple: (success, message)
-    """
-    # Validação de email usando regex
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    if not re.match(email_pattern, email):
-        return False, "Email inválido. Use o formato: exemplo@dominio.com"
-    
-    # Validações adicionais
-    if not all([username, password, name, email]):
-        return False, "Todos os campos são obrigatórios"
-    
-    if len(password) < 6:
-        return False, "A senha deve ter pelo menos 6 caracteres"
-    
-    if len(username) < 3:
-        return False, "O nome de usuário deve ter pelo menos 3 caracteres"
-    
-    if len(name) < 2:
-        return False, "O nome deve ter pelo menos 2 caracteres"
-    
-    # Conectar ao banco de dados
-    conn = sqlite3.connect('feedback_app.db')
-    c = conn.cursor()
-    
-    try:
-        user_id = str(uuid.uuid4())
-        c.execute(
-            "INSERT INTO users (id, username, password, name, email) VALUES (?, ?, ?, ?, ?)",
-            (user_id, username, hash_password(password), name, email)
-        )
-        conn.commit()
-        conn.close()
-        return True, "Usuário registrado com sucesso!"
-        
-    except sqlite3.IntegrityError:
-        conn.close()
-        return False, "Nome de usuário já existe. Escolha outro."
-    except Exception as e:
-        conn.close()
-        return False, f"Erro inesperado: {str(e)}"
-
-def save_feedback(user_id, rating, comment):
-    """
-    Salva um feedback no banco de dados e adiciona na fila de processamento.
-    
-    Args:
-        user_id (str): ID do usuário
-        rating (float): Avaliação média
-        comment (str): Comentário do feedback
-        
-    Returns:
-        str: ID do feedback criado
-    """
-    conn = sqlite3.connect('feedback_app.db')
-    c = conn.cursor()
-    
-    feedback_id = str(uuid.uuid4())
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Calcular prioridade baseada na avaliação (avaliações baixas = prioridade alta)
-    priority = 6 - int(rating)  # Avaliação 1 = prioridade 5, Avaliação 5 = prioridade 1
-    
-    c.execute(
-        "INSERT INTO feedback (id, user_id, rating, comment, timestamp, priority) VALUES (?, ?, ?, ?, ?, ?)",
-        (feedback_id, user_id, rating, comment, timestamp, priority)
-    )
-    
-    # Adicionar à fila de processamento
-    if 'feedback_queue' not in st.session_state:
-        st.session_state.feedback_queue = FeedbackQueue()
-    
-    feedback_item = {
-        'id': feedback_id,
-        'user_id': user_id,
-        'rating': rating,
-        'comment': comment,
-        'timestamp': timestamp,
-        'priority': priority
-    }
-    st.session_state.feedback_queue.enqueue(feedback_item)
-    
-    conn.commit()
-    conn.close()
-    return feedback_id
-
-def get_user_feedbacks(user_id, sort_method='timestamp'):
     """
-    Obtém todos os feedbacks de um usuário com opção de ordenação.
+    Cria/atualiza o esquema do banco (migrações versionadas).
     
-    Args:
-        user_id (str): ID do usuário
-        sort_method (str): 'timestamp' ou 'rating'
-        
-    Returns:
-        pandas.DataFrame: Feedbacks do usuário
+    Só migra na primeira execução do processo; nos reruns seguintes do
+    Streamlit faz apenas uma leitura, para descartar o cache de leitura
+    depois de uma importação feita por outro processo.
     """
-    conn = sqlite3.connect('feedback_app.db')
-    df = pd.read_sql_query(
-        "SELECT * FROM feedback WHERE user_id = ? ORDER BY timestamp DESC", 
-        conn, params=(user_id,)
-    )
-    conn.close()
-    
-    # Aplicar ordenação por avaliação usando Merge Sort se solicitado
-    if len(df) > 0 and sort_method == 'rating':
-        ratings = df['rating'].tolist()
-        sorted_indices = merge_sort_by_rating(ratings)
-        df = df.iloc[sorted_indices].reset_index(drop=True)
-    
-    return df
+    applied = ensure_schema()
+    if applied:
+        print(f"✅ Banco atualizado para a versão {applied[-1]}")
+    sync_user_data_cache()
 
 # ==================== CONFIGURAÇÕES E CONSTANTES ====================
 
-# Produtos disponíveis
-PRODUCTS = ["Camiseta", "Shorts", "Calça", "Tênis"]
-
 # Mapeamento de prioridades
 PRIORITY_LABELS = {
     5: "🔴 CRÍTICA",
@@ -506,11 +55,54 @@ PRIORITY_LABELS = {
     1: "🟢 MUITO BAIXA"
 }
 
+# Máximo de itens listados na página da fila
+QUEUE_DISPLAY_LIMIT = 200
+
+# Estados dos itens da fila (DurableFeedbackQueue.item_state)
+QUEUE_STATE_LABELS = {
+    'ready': "⏳ Aguardando",
+    'leased': "⚙️ Em processamento",
+    'failed': "❌ Falhou"
+}
+
+# Paginação do histórico no dashboard
+HISTORY_PAGE_SIZE = 50
+HISTORY_SORT_OPTIONS = {
+    "📅 Mais recentes": 'timestamp',
+    "⭐ Maior avaliação": 'rating'
+}
+
+# Períodos dos gráficos de tendência: (granularidade dos agregados, dias até agora)
+TREND_RANGES = {
+    "24 horas": ('hour', 1),
+    "7 dias": ('hour', 7),
+    "30 dias": ('day', 30),
+    "90 dias": ('day', 90),
+    "1 ano": ('day', 365),
+    "2 anos": ('day', 730)
+}
+
+# Períodos da análise global (dias até hoje; None = todo o histórico)
+ANALYTICS_PERIODS = {
+    "7 dias": 7,
+    "30 dias": 30,
+    "90 dias": 90,
+    "1 ano": 365,
+    "Tudo": None
+}
+
 # ==================== ESTADO DA SESSÃO ====================
 
+# Rastrear o rerun (FEEDSMART_TRACE=1 ou painel de desempenho ligado na sessão)
+if tracing.is_enabled() or st.session_state.get('trace_panel'):
+    tracing.start_trace('rerun', page=st.session_state.get('page', 'login'))
+
 # Inicializar o banco de dados
 init_db()
 
+# Exportar métricas do processo (FEEDSMART_METRICS_PORT / FEEDSMART_METRICS_FILE)
+metrics.start_from_env()
+
 # Inicializar estado da sessão
 if 'user' not in st.session_state:
     st.session_state.user = None
@@ -526,8 +118,6 @@ if 'current_feedback' not in st.session_state:
         "delivery_rating": None, 
         "comment": None
     }
-if 'feedback_queue' not in st.session_state:
-    st.session_state.feedback_queue = FeedbackQueue()
 
 # ==================== FUNÇÕES DE NAVEGAÇÃO ====================
 
@@ -654,10 +244,17 @@ def process_chat_input(user_input):
         avg_rating = (feedback["product_rating"] + feedback["delivery_rating"]) / 2
         
         # Criar comentário estruturado
-        structured_comment = f"Produto: {feedback['product']} | Avaliação do produto: {feedback['product_rating']}/5 | Avaliação da entrega: {feedback['delivery_rating']}/5 | Comentário: {feedback['comment']}"
+        structured_comment = format_structured_comment(
+            feedback['product'], feedback['product_rating'], feedback['delivery_rating'], feedback['comment']
+        )
         
         # Salvar feedback no banco de dados
-        feedback_id = save_feedback(st.session_state.user["id"], avg_rating, structured_comment)
+        feedback_id = save_feedback(
+            st.session_state.user["id"], avg_rating, structured_comment,
+            product=feedback['product'],
+            product_rating=feedback['product_rating'],
+            delivery_rating=feedback['delivery_rating']
+        )
         
         # Mensagem de confirmação
         confirmation_msg = f"✅ Feedback salvo com sucesso!\n\n📊 Resumo:\n• Produto: {feedback['product']}\n• Avaliação do produto: {feedback['product_rating']}/5\n• Avaliação da entrega: {feedback['delivery_rating']}/5\n• Média geral: {avg_rating:.1f}/5\n\nObrigado pelo seu feedback! 🙏\n\nDeseja fornecer outro feedback? (sim/não)"
@@ -757,6 +354,8 @@ def home_page():
             change_page('dashboard')
         if st.button("🔄 Fila de Processamento"):
             change_page('queue')
+        if is_admin(st.session_state.user) and st.button("🌐 Análise Global"):
+            change_page('analytics')
         
         st.divider()
         if st.button("🚪 Sair"):
@@ -807,26 +406,26 @@ def home_page():
     
     col1, col2, col3, col4 = st.columns(4)
     
+    stats = get_cached_user_stats(st.session_state.user["id"])
+    total_feedbacks = stats['count']
+    
     with col1:
-        queue_size = st.session_state.feedback_queue.size()
+        queue_size = feedback_queue.ready_count(user_id=st.session_state.user["id"])
         st.metric("🔄 Feedbacks na Fila", queue_size)
     
     with col2:
-        feedbacks = get_user_feedbacks(st.session_state.user["id"])
-        total_feedbacks = len(feedbacks)
         st.metric("📝 Total de Feedbacks", total_feedbacks)
     
     with col3:
         if total_feedbacks > 0:
-            avg_rating = feedbacks['rating'].mean()
-            st.metric("⭐ Avaliação Média", f"{avg_rating:.1f}/5")
+            st.metric("⭐ Avaliação Média", f"{stats['avg']:.1f}/5")
         else:
             st.metric("⭐ Avaliação Média", "N/A")
     
     with col4:
         if total_feedbacks > 0:
-            last_feedback = feedbacks.iloc[0]['timestamp']
-            last_date = pd.to_datetime(last_feedback).strftime('%d/%m/%Y')
+            last_feedback = stats['last_timestamp']
+            last_date = datetime.datetime.fromisoformat(last_feedback).strftime('%d/%m/%Y')
             st.metric("📅 Último Feedback", last_date)
         else:
             st.metric("📅 Último Feedback", "N/A")
@@ -837,6 +436,8 @@ def home_page():
 
 def chatbot_page():
     """Renderiza a interface do chatbot para coleta de feedback."""
+    from streamlit_chat import message
+    
     st.title("🤖 Chatbot de Feedback")
     
     # Barra lateral com navegação
@@ -850,6 +451,8 @@ def chatbot_page():
             change_page('dashboard')
         if st.button("🔄 Fila de Processamento"):
             change_page('queue')
+        if is_admin(st.session_state.user) and st.button("🌐 Análise Global"):
+            change_page('analytics')
         
         st.divider()
         
@@ -969,6 +572,9 @@ def chatbot_page():
 
 def dashboard_page():
     """Renderiza o dashboard analítico com gráfico produto vs entrega."""
+    import pandas as pd
+    from feedsmart.analytics.visualization import chart_cache, create_product_vs_delivery_chart_from_stats
+    
     st.title("📊 Dashboard - Produto vs Entrega")
     
     # Barra lateral com navegação
@@ -982,15 +588,17 @@ def dashboard_page():
             change_page('dashboard')
         if st.button("🔄 Fila de Processamento"):
             change_page('queue')
+        if is_admin(st.session_state.user) and st.button("🌐 Análise Global"):
+            change_page('analytics')
         
         st.divider()
         if st.button("🚪 Sair"):
             logout()
     
-    # Obter feedbacks do usuário
-    feedbacks = get_user_feedbacks(st.session_state.user["id"])
+    # Obter agregados do usuário
+    stats = get_cached_user_stats(st.session_state.user["id"])
     
-    if len(feedbacks) == 0:
+    if stats['count'] == 0:
         st.info("📝 Você ainda não tem feedbacks registrados.")
         st.write("Vá para o **Chatbot de Feedback** para registrar sua primeira avaliação!")
         
@@ -998,10 +606,10 @@ def dashboard_page():
             change_page('chatbot')
     else:
         # Calcular métricas
-        avg_rating = feedbacks['rating'].mean()
-        max_rating = feedbacks['rating'].max()
-        min_rating = feedbacks['rating'].min()
-        total_feedbacks = len(feedbacks)
+        avg_rating = stats['avg']
+        max_rating = stats['max']
+        min_rating = stats['min']
+        total_feedbacks = stats['count']
         
         # Exibir métricas em cards
         st.subheader("📈 Estatísticas Gerais")
@@ -1015,16 +623,17 @@ def dashboard_page():
                 delta=f"{avg_rating - 3:.1f}" if avg_rating != 3 else None
             )
         
+        # Sem nenhuma nota registrada, mínimo e máximo ficam vazios
         with col2:
             st.metric(
                 label="⭐ Maior Avaliação",
-                value=f"{max_rating:.1f}/5"
+                value=f"{max_rating:.1f}/5" if max_rating is not None else "—"
             )
         
         with col3:
             st.metric(
                 label="📉 Menor Avaliação",
-                value=f"{min_rating:.1f}/5"
+                value=f"{min_rating:.1f}/5" if min_rating is not None else "—"
             )
         
         with col4:
@@ -1038,11 +647,16 @@ def dashboard_page():
         # === GRÁFICO PRODUTO VS ENTREGA ===
         st.subheader("🛍️ vs 🚚 Análise Comparativa")
         
-        # Criar e exibir gráfico
-        result = create_product_vs_delivery_chart(feedbacks)
+        # Criar e exibir gráfico (renderizado uma vez por versão dos dados do usuário)
+        user_id = st.session_state.user["id"]
+        result = chart_cache.get_or_render(
+            ('product_vs_delivery', user_id, user_data_cache.version(user_id)),
+            lambda: create_product_vs_delivery_chart_from_stats(stats)
+        )
         if result[0] is not None:
-            fig, avg_product, avg_delivery = result
-            st.pyplot(fig)
+            image, avg_product, avg_delivery = result
+            with tracing.span('st.image'):
+                st.image(image, width="stretch")
             
             # Métricas principais
             col1, col2, col3 = st.columns(3)
@@ -1080,8 +694,24 @@ def dashboard_page():
         # Tabela de feedbacks
         st.subheader("📋 Histórico Detalhado")
         
+        sort_label = st.radio(
+            "Ordenar por:", list(HISTORY_SORT_OPTIONS), horizontal=True, key="history_sort"
+        )
+        sort_method = HISTORY_SORT_OPTIONS[sort_label]
+        
+        # Pilha de cursores: o topo é o início da página atual
+        if st.session_state.get('history_sort_method') != sort_method:
+            st.session_state.history_sort_method = sort_method
+            st.session_state.history_cursors = [None]
+        cursors = st.session_state.history_cursors
+        
+        page, next_cursor = get_user_feedbacks(
+            st.session_state.user["id"], sort_method=sort_method,
+            limit=HISTORY_PAGE_SIZE, cursor=cursors[-1]
+        )
+        
         # Preparar dados para exibição
-        display_df = feedbacks.copy()
+        display_df = page.copy()
         display_df['timestamp'] = pd.to_datetime(display_df['timestamp']).dt.strftime('%d/%m/%Y %H:%M')
         display_df = display_df.rename(columns={
             'rating': 'Avaliação',
@@ -1096,12 +726,60 @@ def dashboard_page():
         # Exibir tabela
         st.dataframe(
             display_df[['Data/Hora', 'Avaliação', 'Prioridade', 'Comentário']],
-            use_container_width=True,
+            width="stretch",
             hide_index=True
         )
+        
+        # Navegação entre páginas
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("⬅️ Anterior", disabled=len(cursors) == 1, key="history_prev"):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            st.caption(f"Página {len(cursors)}")
+        with col3:
+            if st.button("Próxima ➡️", disabled=next_cursor is None, key="history_next"):
+                cursors.append(next_cursor)
+                st.rerun()
+        
+        # Exportação dos feedbacks do usuário
+        with st.expander("📥 Exportar Feedbacks"):
+            col1, col2 = st.columns(2)
+            with col1:
+                export_format = st.radio("Formato:", list(EXPORT_FORMATS), horizontal=True, key="export_format")
+                export_product = st.selectbox("Produto:", ["Todos"] + PRODUCTS, key="export_product")
+                export_gzip = st.checkbox("Compactar (gzip)", key="export_gzip")
+            with col2:
+                export_start = st.date_input("De:", value=None, key="export_start", format="DD/MM/YYYY")
+                export_end = st.date_input("Até:", value=None, key="export_end", format="DD/MM/YYYY")
+            
+            export_filters = {
+                'user_id': st.session_state.user["id"],
+                'start': export_start,
+                'end': export_end,
+                'product': None if export_product == "Todos" else export_product,
+            }
+            # O arquivo só é gerado (em streaming) quando o botão é clicado
+            st.download_button(
+                "⬇️ Baixar",
+                data=lambda: export_bytes(export_format, export_gzip, **export_filters),
+                file_name=export_filename(export_format, export_gzip),
+                mime=export_mimetype(export_format, export_gzip),
+                on_click="ignore",
+                key="export_download"
+            )
+    
+    # Tendências de toda a loja (agregados globais): só para administradores,
+    # como a Análise Global
+    if is_admin(st.session_state.user):
+        st.divider()
+        trend_section('dashboard')
 
 def queue_page():
     """Renderiza a página de gerenciamento da fila de processamento."""
+    import pandas as pd
+    
     st.title("🔄 Fila de Processamento")
     
     # Barra lateral com navegação
@@ -1115,65 +793,83 @@ def queue_page():
             change_page('dashboard')
         if st.button("🔄 Fila de Processamento"):
             change_page('queue')
+        if is_admin(st.session_state.user) and st.button("🌐 Análise Global"):
+            change_page('analytics')
         
         st.divider()
         if st.button("🚪 Sair"):
             logout()
     
-    st.write("Esta página mostra os feedbacks na fila de processamento, organizados por prioridade.")
+    # A fila é compartilhada: administradores veem e operam a fila inteira,
+    # os demais usuários só os próprios feedbacks
+    if is_admin(st.session_state.user):
+        scope = None
+        st.write("Esta página mostra todos os feedbacks na fila de processamento, organizados por prioridade.")
+    else:
+        scope = st.session_state.user["id"]
+        st.write("Esta página mostra os seus feedbacks na fila de processamento, organizados por prioridade.")
     
-    queue = st.session_state.feedback_queue
+    queue = feedback_queue
+    queue_stats = queue.stats(user_id=scope)
+    ready = queue_stats['ready']
+    queue_size = sum(queue_stats.values())
     
     # Informações da fila
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📊 Itens na Fila", queue.size())
+        st.metric("📊 Itens na Fila", ready)
     
     with col2:
-        next_item = queue.peek()
+        next_item = queue.peek(user_id=scope)
         if next_item:
             st.metric("⏭️ Próximo", f"Avaliação {next_item['rating']:.1f}/5")
         else:
             st.metric("⏭️ Próximo", "Fila vazia")
     
     with col3:
-        if queue.size() > 0:
-            sorted_items = queue.get_sorted_by_priority()
-            highest_priority = sorted_items[0]['priority']
-            st.metric("🚨 Maior Prioridade", PRIORITY_LABELS.get(highest_priority, "N/A"))
+        if next_item:
+            st.metric("🚨 Maior Prioridade", PRIORITY_LABELS.get(next_item['priority'], "N/A"))
         else:
             st.metric("🚨 Maior Prioridade", "N/A")
     
+    with col4:
+        st.metric("❌ Falhas", queue_stats['failed'])
+    
+    if queue_stats['leased']:
+        st.caption(f"⚙️ {queue_stats['leased']} item(ns) em processamento por workers.")
+    
     st.divider()
     
     # Controles da fila
     col1, col2 = st.columns(2)
     
     with col1:
-        if st.button("⚡ Processar Próximo", disabled=queue.is_empty()):
-            processed = queue.process_next()
+        if st.button("⚡ Processar Próximo", disabled=ready == 0):
+            processed = queue.process_next(user_id=scope)
             if processed:
                 st.success(f"✅ Feedback processado: Avaliação {processed['rating']:.1f}/5")
                 st.rerun()
     
     with col2:
-        if st.button("🗑️ Limpar Fila", disabled=queue.is_empty()):
-            queue.clear()
-            st.success("🧹 Fila limpa com sucesso!")
+        # Itens reservados por workers não são removidos
+        if st.button("🗑️ Limpar Fila", disabled=ready + queue_stats['failed'] == 0):
+            removed = queue.clear(user_id=scope)
+            st.success(f"🧹 {removed} item(ns) removido(s) da fila!")
             st.rerun()
     
     st.divider()
     
     # Exibir itens da fila
-    if queue.size() > 0:
+    if queue_size > 0:
         st.subheader("📋 Itens na Fila (Ordenados por Prioridade)")
         
         # Obter itens ordenados por prioridade
-        sorted_items = queue.get_sorted_by_priority()
+        sorted_items = queue.get_sorted_by_priority(limit=QUEUE_DISPLAY_LIMIT, user_id=scope)
         
         # Criar DataFrame para exibição
         queue_data = []
+        now = datetime.datetime.now().timestamp()
         for item in sorted_items:
             # Converter timestamp para formato legível
             timestamp = datetime.datetime.strptime(item['timestamp'], "%Y-%m-%d %H:%M:%S")
@@ -1183,6 +879,7 @@ def queue_page():
                 "Data/Hora": formatted_time,
                 "Avaliação": f"{item['rating']:.1f}/5",
                 "Prioridade": PRIORITY_LABELS.get(item['priority'], "N/A"),
+                "Estado": QUEUE_STATE_LABELS[queue.item_state(item, now)],
                 "Comentário": item['comment'][:50] + "..." if len(item['comment']) > 50 else item['comment']
             })
         
@@ -1190,25 +887,21 @@ def queue_page():
         queue_df = pd.DataFrame(queue_data)
         st.dataframe(
             queue_df,
-            use_container_width=True,
+            width="stretch",
             hide_index=True
         )
+        if queue_size > len(sorted_items):
+            st.caption(f"Exibindo os {len(sorted_items)} primeiros de {queue_size} itens.")
         
         # Estatísticas da fila
         st.subheader("📊 Estatísticas da Fila")
         
-        # Contar por prioridade
-        priority_counts = {}
-        for item in sorted_items:
-            priority = item['priority']
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
-        
         # Exibir contadores
+        priority_counts = queue.priority_counts(user_id=scope)
         cols = st.columns(5)
         for i, (priority, label) in enumerate(PRIORITY_LABELS.items()):
             with cols[i]:
-                count = priority_counts.get(priority, 0)
-                st.metric(label, count)
+                st.metric(label, priority_counts.get(priority, 0))
     
     else:
         # Fila vazia
@@ -1218,26 +911,223 @@ def queue_page():
         if st.button("🤖 Ir para Chatbot"):
             change_page('chatbot')
 
+def trend_section(key):
+    """
+    Gráfico de tendência das avaliações de toda a loja, com período e produto selecionáveis.
+    
+    Lê os agregados por hora (até 7 dias) ou por dia (product_stats), então
+    um gráfico de 2 anos lê cerca de 730 dias por produto.
+    
+    Args:
+        key (str): Prefixo das chaves dos widgets (a seção aparece em mais de uma página)
+    """
+    from feedsmart.analytics.visualization import chart_cache, create_trend_chart
+    from feedsmart.storage import product_stats
+    
+    st.subheader("📅 Tendências da Loja")
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        range_label = st.radio("Período:", list(TREND_RANGES), index=2, horizontal=True, key=f"{key}_trend_range")
+    with col2:
+        trend_product = st.selectbox("Produto:", ["Todos"] + PRODUCTS, key=f"{key}_trend_product")
+    
+    granularity, days = TREND_RANGES[range_label]
+    if granularity == 'hour':
+        start = (datetime.datetime.now() - datetime.timedelta(days=days)).strftime("%Y-%m-%d %H")
+    else:
+        start = (datetime.date.today() - datetime.timedelta(days=days - 1)).isoformat()
+    
+    points = product_stats.trend_summary(
+        granularity, start=start, product=None if trend_product == "Todos" else trend_product
+    )
+    if not points:
+        st.info("📝 Nenhum feedback registrado no período.")
+        return
+    
+    # A chave do gráfico são os próprios pontos: muda quando os dados mudam
+    image = chart_cache.get_or_render(
+        ('trend', granularity, tuple(
+            (row[granularity], row['count'], row['avg_product'], row['avg_delivery']) for row in points
+        )),
+        lambda: create_trend_chart(points, granularity)
+    )[0]
+    with tracing.span('st.image'):
+        st.image(image, width="stretch")
+
+def analytics_page():
+    """
+    Renderiza a análise global (todos os usuários), restrita a administradores.
+    
+    Os números vêm dos agregados diários por produto (product_stats), então
+    o custo depende da quantidade de dias e produtos, não de feedbacks.
+    """
+    from feedsmart.analytics.visualization import chart_cache, create_product_comparison_chart
+    from feedsmart.storage import product_stats
+    
+    st.title("🌐 Análise Global - Produto vs Entrega")
+    
+    # Barra lateral com navegação
+    with st.sidebar:
+        st.title("🧭 Navegação")
+        if st.button("🏠 Página Inicial"):
+            change_page('home')
+        if st.button("🤖 Chatbot de Feedback"):
+            change_page('chatbot')
+        if st.button("📊 Dashboard"):
+            change_page('dashboard')
+        if st.button("🔄 Fila de Processamento"):
+            change_page('queue')
+        if is_admin(st.session_state.user) and st.button("🌐 Análise Global"):
+            change_page('analytics')
+        
+        st.divider()
+        if st.button("🚪 Sair"):
+            logout()
+    
+    if not is_admin(st.session_state.user):
+        st.error("🔒 Acesso restrito a administradores.")
+        return
+    
+    period_label = st.radio("Período:", list(ANALYTICS_PERIODS), index=1, horizontal=True, key="analytics_period")
+    period_days = ANALYTICS_PERIODS[period_label]
+    start = None
+    if period_days is not None:
+        start = (datetime.date.today() - datetime.timedelta(days=period_days - 1)).isoformat()
+    
+    totals = product_stats.store_totals(start=start)
+    if totals['count'] == 0:
+        st.info("📝 Nenhum feedback registrado no período.")
+        return
+    
+    # === MÉTRICAS GERAIS ===
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("📝 Total de Feedbacks", f"{totals['count']:,}".replace(",", "."))
+    with col2:
+        st.metric("📈 Avaliação Média", f"{totals['avg_rating']:.2f}/5")
+    with col3:
+        st.metric("🛍️ Produtos", f"{totals['avg_product']:.2f}/5")
+    with col4:
+        st.metric("🚚 Entrega", f"{totals['avg_delivery']:.2f}/5")
+    
+    st.divider()
+    
+    # === POR PRODUTO ===
+    st.subheader("🛍️ vs 🚚 Por Produto")
+    
+    summary = product_stats.product_summary(start=start)
+    # A chave do gráfico são os próprios números: muda quando os dados mudam
+    image = chart_cache.get_or_render(
+        ('product_comparison', tuple(
+            (row['product'], row['count'], row['avg_product'], row['avg_delivery']) for row in summary
+        )),
+        lambda: create_product_comparison_chart(summary)
+    )[0]
+    if image is not None:
+        with tracing.span('st.image'):
+            st.image(image, width="stretch")
+    
+    st.dataframe(
+        [{'Produto': row['product'] or '(sem produto)', 'Feedbacks': row['count'],
+          'Produto (média)': round(row['avg_product'], 2), 'Entrega (média)': round(row['avg_delivery'], 2),
+          'Diferença': round(row['avg_product'] - row['avg_delivery'], 2)}
+         for row in summary],
+        width="stretch",
+        hide_index=True
+    )
+    
+    st.divider()
+    
+    # === TENDÊNCIAS ===
+    trend_section('analytics')
+    
+    st.divider()
+    
+    # === PIORES PRODUTOS ===
+    st.subheader("⚠️ Produtos com Pior Avaliação")
+    
+    min_count = st.number_input(
+        "Mínimo de feedbacks no período:", min_value=1, value=10, step=1, key="analytics_min_count"
+    )
+    worst = product_stats.worst_products(limit=5, min_count=min_count, start=start)
+    if worst:
+        st.dataframe(
+            [{'Produto': row['product'] or '(sem produto)', 'Nota (produto + entrega)': round(row['score'], 2),
+              'Produto (média)': round(row['avg_product'], 2), 'Entrega (média)': round(row['avg_delivery'], 2),
+              'Feedbacks': row['count']}
+             for row in worst],
+            width="stretch",
+            hide_index=True
+        )
+    else:
+        st.info(f"Nenhum produto com pelo menos {min_count} feedbacks no período.")
+
+# ==================== PAINEL DE DESEMPENHO ====================
+
+def performance_panel(trace):
+    """
+    Painel opcional na barra lateral com os tempos do rerun atual.
+    
+    Args:
+        trace: Raiz da árvore de spans do rerun (None se não foi rastreado)
+    """
+    if st.session_state.user is None:
+        return
+    
+    with st.sidebar:
+        st.divider()
+        if not st.toggle("⏱️ Painel de desempenho", key='trace_panel'):
+            return
+        if trace is None:
+            st.caption("Os tempos aparecem a partir da próxima interação.")
+            return
+        
+        st.caption(f"Rerun: {trace.duration * 1000:.1f} ms (clique nas colunas para ordenar)")
+        st.dataframe(
+            [{'Trecho': row['name'], 'Chamadas': row['calls'], 'Total (ms)': round(row['total_ms'], 2),
+              'Próprio (ms)': round(row['self_ms'], 2), 'Máx. (ms)': round(row['max_ms'], 2)}
+             for row in tracing.summarize(trace)],
+            width="stretch",
+            hide_index=True
+        )
+        with st.expander("🌳 Árvore de chamadas"):
+            st.dataframe(
+                [{'Trecho': '· ' * row['depth'] + row['name'], 'Início (ms)': row['start_ms'],
+                  'Duração (ms)': row['duration_ms'], 'Próprio (ms)': row['self_ms']}
+                 for row in tracing.flatten(trace)],
+                width="stretch",
+                hide_index=True
+            )
+
 # ==================== RENDERIZAÇÃO PRINCIPAL ====================
 
 def main():
     """Função principal que controla o fluxo da aplicação."""
-    # Verificar autenticação
-    if st.session_state.user is None:
-        login_page()
-    else:
-        # Renderizar página atual
-        if st.session_state.page == 'home':
-            home_page()
-        elif st.session_state.page == 'chatbot':
-            chatbot_page()
-        elif st.session_state.page == 'dashboard':
-            dashboard_page()
-        elif st.session_state.page == 'queue':
-            queue_page()
+    try:
+        # Verificar autenticação
+        if st.session_state.user is None:
+            login_page()
         else:
-            # Página padrão
-            home_page()
+            # Renderizar página atual
+            if st.session_state.page == 'home':
+                home_page()
+            elif st.session_state.page == 'chatbot':
+                chatbot_page()
+            elif st.session_state.page == 'dashboard':
+                dashboard_page()
+            elif st.session_state.page == 'queue':
+                queue_page()
+            elif st.session_state.page == 'analytics':
+                analytics_page()
+            else:
+                # Página padrão
+                home_page()
+    finally:
+        # Fecha a árvore também quando a página chama st.rerun()
+        trace = tracing.end_trace()
+    
+    performance_panel(trace)
 
 # Executar aplicação
 if __name__ == "__main__":
@@ -0,0 +1,77 @@
+"""
+Benchmark do tempo de importação (partida a frio).
+
+Cada cenário roda em um interpretador novo e mede só o tempo dos imports
+(sem a inicialização do Python). "app (imports antigos)" reproduz o topo do
+app.py antes da separação do pacote feedsmart, que importava pandas, numpy,
+matplotlib e streamlit_chat já na tela de login; "app (login)" é o que o
+app.py importa hoje antes de desenhar a primeira página.
+
+Uso:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --repeat 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports de topo do app.py (tela de login)
+APP_CORE = (
+    "import feedsmart.analytics.insights, feedsmart.cache, feedsmart.comments, "
+    "feedsmart.storage.exporter, feedsmart.storage.feedback, "
+    "feedsmart.storage.migrations, feedsmart.storage.users"
+)
+
+SCENARIOS = [
+    ("núcleo feedsmart (storage/queue)", APP_CORE),
+    ("worker da fila", "import feedsmart.queue.worker"),
+    ("app (login)", f"import streamlit; {APP_CORE}"),
+    ("app (imports antigos)",
+     "import streamlit, pandas, numpy, matplotlib.pyplot, streamlit_chat; "
+     f"import feedsmart.analytics.visualization; {APP_CORE}"),
+    ("pandas", "import pandas"),
+    ("numpy", "import numpy"),
+    ("matplotlib.pyplot", "import matplotlib.pyplot"),
+    ("streamlit_chat", "import streamlit_chat"),
+    ("streamlit", "import streamlit"),
+]
+
+_TIMER = (
+    "import time; _t = time.perf_counter(); exec({stmt!r}); "
+    "print(time.perf_counter() - _t)"
+)
+
+
+def measure(stmt, repeat):
+    """Menor tempo (s) de `stmt` entre `repeat` interpretadores novos."""
+    best = float('inf')
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(stmt=stmt)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        best = min(best, float(output.strip().splitlines()[-1]))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results = {name: measure(stmt, args.repeat) for name, stmt in SCENARIOS}
+    width = max(len(name) for name in results)
+    print(f"{'cenário':<{width}} {'ms':>9}")
+    for name, seconds in results.items():
+        print(f"{name:<{width}} {seconds * 1000:9.1f}")
+
+    before, after = results["app (imports antigos)"], results["app (login)"]
+    print(f"\nPartida da tela de login: {before * 1000:.0f} ms -> {after * 1000:.0f} ms "
+          f"({before / after:.1f}x mais rápida)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark da extração de notas de produto/entrega dos comentários.
+
+Compara a implementação original (laço Python com re.search e fallback por
+varredura do DataFrame) com a versão vetorizada de feedsmart.analytics.data_processing e
+mostra o tempo por linha em cada escala, que deve ficar constante (escala
+linear) até 1M de linhas.
+
+Uso:
+    python -m benchmarks.bench_rating_extraction
+    python -m benchmarks.bench_rating_extraction --sizes 1000 100000 1000000
+"""
+import argparse
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from feedsmart.analytics.data_processing import extract_ratings_from_comments, rating_histogram
+
+PRODUCTS = ["Camiseta", "Shorts", "Calça", "Tênis"]
+
+# Acima deste tamanho a versão original (O(n²) no fallback) fica lenta demais
+LEGACY_MAX_ROWS = 20000
+
+
+def make_feedbacks(n, unstructured_ratio=0.05, seed=42):
+    """Gera um DataFrame sintético com comentários estruturados e livres."""
+    rng = np.random.default_rng(seed)
+    product_ratings = rng.integers(0, 6, n)
+    delivery_ratings = rng.integers(0, 6, n)
+    products = rng.choice(PRODUCTS, n)
+    ratings = (product_ratings + delivery_ratings) / 2
+
+    comments = [
+        f"Produto: {p} | Avaliação do produto: {pr}/5 | Avaliação da entrega: {dr}/5 | Comentário: #{i}"
+        for i, (p, pr, dr) in enumerate(zip(products, product_ratings, delivery_ratings))
+    ]
+    for i in np.flatnonzero(rng.random(n) < unstructured_ratio):
+        comments[i] = f"comentário livre #{i}"
+
+    return pd.DataFrame({'rating': ratings, 'comment': comments})
+
+
+def legacy_extract(feedbacks):
+    """Implementação original, mantida apenas como referência."""
+    product_ratings = []
+    delivery_ratings = []
+    for comment in feedbacks['comment']:
+        product_match = re.search(r'Avaliação do produto: (\d+)/5', comment)
+        delivery_match = re.search(r'Avaliação da entrega: (\d+)/5', comment)
+        if product_match and delivery_match:
+            product_ratings.append(int(product_match.group(1)))
+            delivery_ratings.append(int(delivery_match.group(1)))
+        else:
+            rating = feedbacks[feedbacks['comment'] == comment]['rating'].iloc[0]
+            product_ratings.append(rating)
+            delivery_ratings.append(rating)
+    product_counts = [product_ratings.count(i) for i in range(1, 6)]
+    delivery_counts = [delivery_ratings.count(i) for i in range(1, 6)]
+    return product_counts, delivery_counts
+
+
+def vectorized_extract(feedbacks):
+    """Caminho atual: str.extract + fillna + np.bincount."""
+    product_ratings, delivery_ratings = extract_ratings_from_comments(feedbacks)
+    return rating_histogram(product_ratings), rating_histogram(delivery_ratings)
+
+
+def best_of(func, arg, repeat):
+    """Retorna o menor tempo (em segundos) entre `repeat` execuções."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'original (s)':>14} {'vetorizado (s)':>15} {'µs/linha':>10} {'speedup':>9}")
+    for n in args.sizes:
+        df = make_feedbacks(n)
+        new_time = best_of(vectorized_extract, df, args.repeat)
+
+        if n <= LEGACY_MAX_ROWS:
+            old_time = best_of(legacy_extract, df, 1)
+            assert [list(c) for c in vectorized_extract(df)] == [list(c) for c in legacy_extract(df)]
+            old_col, speedup = f"{old_time:14.3f}", f"{old_time / new_time:8.1f}x"
+        else:
+            old_col, speedup = f"{'-':>14}", f"{'-':>9}"
+
+        print(f"{n:>10} {old_col} {new_time:15.3f} {new_time / n * 1e6:10.2f} {speedup}")
+
+
+if __name__ == '__main__':
+    main()
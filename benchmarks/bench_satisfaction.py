@@ -0,0 +1,77 @@
+"""
+Benchmark da categorização de satisfação.
+
+Compara a regra original (média por linha do pandas + apply com uma função
+Python) com a versão vetorizada de feedsmart.analytics.data_processing (média no array
+NumPy + np.select + dtype categórico), incluindo o tempo e a memória da
+coluna resultante.
+
+Uso:
+    python -m benchmarks.bench_satisfaction
+    python -m benchmarks.bench_satisfaction --sizes 10000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from feedsmart.analytics.data_processing import RATING_COLUMNS, average_rating, categorize_satisfaction
+
+
+def make_ratings(n, seed=42):
+    """Gera um DataFrame sintético com as três colunas de avaliação (1-5)."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({col: rng.integers(1, 6, n) for col in RATING_COLUMNS})
+
+
+def legacy_categorize(df):
+    """Implementação original, mantida apenas como referência."""
+    def categorize(rating):
+        if rating <= 2:
+            return "Insatisfeito"
+        elif rating <= 3.5:
+            return "Neutro"
+        else:
+            return "Satisfeito"
+
+    return df[RATING_COLUMNS].mean(axis=1).apply(categorize)
+
+
+def vectorized_categorize(df):
+    """Caminho atual: average_rating + np.select + Categorical."""
+    return categorize_satisfaction(average_rating(df))
+
+
+def best_of(func, arg, repeat):
+    """Retorna o menor tempo (em segundos) e o resultado entre `repeat` execuções."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'original (s)':>14} {'vetorizado (s)':>15} {'speedup':>9} "
+          f"{'MB original':>12} {'MB categórico':>14}")
+    for n in args.sizes:
+        df = make_ratings(n)
+        old_time, old = best_of(legacy_categorize, df, 1)
+        new_time, new = best_of(vectorized_categorize, df, args.repeat)
+        assert new.astype(str).tolist() == old.tolist()
+
+        old_mb = old.memory_usage(deep=True) / 1e6
+        new_mb = new.memory_usage(deep=True) / 1e6
+        print(f"{n:>10} {old_time:14.3f} {new_time:15.3f} {old_time / new_time:8.1f}x "
+              f"{old_mb:12.1f} {new_mb:14.1f}")
+
+
+if __name__ == '__main__':
+    main()
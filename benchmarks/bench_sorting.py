@@ -0,0 +1,85 @@
+"""
+Benchmark da ordenação de feedbacks por avaliação.
+
+Compara a implementação recursiva original do Merge Sort com a versão
+iterativa (bottom-up) e com o caminho NumPy de feedsmart.sorting, além da
+ordenação por várias chaves (avaliação e data).
+
+Uso:
+    python -m benchmarks.bench_sorting
+    python -m benchmarks.bench_sorting --sizes 1000 100000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from feedsmart.sorting import argsort_by_rating, merge_sort_by_rating, sort_by_keys
+
+
+def legacy_merge_sort_by_rating(arr):
+    """Implementação recursiva original, mantida apenas como referência."""
+    indexed_arr = [(arr[i], i) for i in range(len(arr))]
+
+    def merge_sort(arr):
+        if len(arr) <= 1:
+            return arr
+        mid = len(arr) // 2
+        return merge(merge_sort(arr[:mid]), merge_sort(arr[mid:]))
+
+    def merge(left, right):
+        result = []
+        i = j = 0
+        while i < len(left) and j < len(right):
+            if left[i][0] >= right[j][0]:
+                result.append(left[i])
+                i += 1
+            else:
+                result.append(right[j])
+                j += 1
+        result.extend(left[i:])
+        result.extend(right[j:])
+        return result
+
+    return [item[1] for item in merge_sort(indexed_arr)]
+
+
+def make_data(n, seed=42):
+    """Gera avaliações (médias de duas notas 0-5) e timestamps sintéticos."""
+    rng = np.random.default_rng(seed)
+    ratings = (rng.integers(0, 6, n) + rng.integers(0, 6, n)) / 2
+    seconds = rng.integers(0, 2 * 365 * 86400, n)
+    timestamps = (np.datetime64('2024-01-01T00:00:00') + seconds.astype('timedelta64[s]'))
+    timestamps = np.datetime_as_string(timestamps).astype(str)
+    return ratings, timestamps
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'recursivo (s)':>14} {'bottom-up (s)':>14} {'numpy (s)':>10} "
+          f"{'multi-chave (s)':>16}")
+    for n in args.sizes:
+        ratings, timestamps = make_data(n)
+        rating_list = ratings.tolist()
+
+        legacy_time, expected = timed(legacy_merge_sort_by_rating, rating_list)
+        bottom_up_time, bottom_up = timed(merge_sort_by_rating, rating_list)
+        numpy_time, fast = timed(argsort_by_rating, ratings)
+        multi_time, _ = timed(sort_by_keys, ratings, timestamps)
+
+        assert bottom_up == expected and fast.tolist() == expected
+
+        print(f"{n:>10} {legacy_time:14.3f} {bottom_up_time:14.3f} {numpy_time:10.4f} {multi_time:16.4f}")
+
+
+if __name__ == '__main__':
+    main()
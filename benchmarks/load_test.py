@@ -0,0 +1,272 @@
+"""
+Teste de carga com sessões simultâneas do app real (streamlit AppTest).
+
+Cada sessão percorre o fluxo completo: login, abertura do chatbot, os cinco
+estágios de process_chat_input (produto, nota do produto, nota da entrega,
+comentário e "novo feedback"), dashboard e fila. Todas as sessões usam um
+banco SQLite temporário, opcionalmente pré-carregado com dados sintéticos.
+
+O AppTest guarda o runtime do Streamlit em uma variável global durante cada
+rerun, então duas sessões não podem rodar ao mesmo tempo no mesmo
+interpretador: cada sessão roda em um processo próprio. A disputa pelo banco
+(locks de escrita do SQLite) é real; a disputa por CPU dentro de um único
+servidor (GIL) não entra na medida, então a capacidade de um processo do
+Streamlit tende a ser menor que a vazão medida aqui.
+
+Para cada interação (um clique seguido do rerun do script) são medidos
+p50/p95/p99 e máximo; no final, a vazão total em interações e feedbacks
+por segundo.
+
+Uso:
+    python -m benchmarks.load_test --sessions 8 --iterations 3
+    python -m benchmarks.load_test --sessions 1 2 4 8 16 --feedbacks 100000 --output carga.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import tempfile
+import time
+import warnings
+
+from benchmarks.synthetic import generate, write_sqlite
+from feedsmart.storage import database
+from feedsmart.storage.migrations import ensure_schema
+from feedsmart.storage.users import register_user
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_FILE = os.path.join(ROOT, 'app.py')
+
+# Limite (s) para um rerun sob carga antes de o AppTest desistir
+RUN_TIMEOUT = 300
+
+PASSWORD = 'carga123'
+
+# ==================== SESSÃO ====================
+
+class Session:
+    """
+    Uma sessão do app dirigida por AppTest, registrando a latência de cada interação.
+
+    Args:
+        index (int): Número da sessão (define o usuário)
+        product (str): Produto avaliado pela sessão
+    """
+
+    def __init__(self, index, product):
+        from streamlit.testing.v1 import AppTest
+
+        self.username = f"carga{index}"
+        self.product = product
+        self.app = AppTest.from_file(APP_FILE, default_timeout=RUN_TIMEOUT)
+        self.timings = []
+        self.error = None
+
+    def _timed(self, name, action):
+        start = time.perf_counter()
+        action()
+        self.app.run()
+        self.timings.append((name, time.perf_counter() - start))
+        if self.app.exception:
+            raise RuntimeError(f"{name}: {self.app.exception[0].message}")
+
+    def _sidebar_click(self, label):
+        next(button for button in self.app.sidebar.button if button.label == label).click()
+
+    def login(self):
+        self._timed('abrir app', lambda: None)
+
+        def fill():
+            login_tab = self.app.tabs[0]
+            login_tab.text_input[0].input(self.username)
+            login_tab.text_input[1].input(PASSWORD)
+            login_tab.button[0].click()
+
+        self._timed('login', fill)
+        if self.app.session_state.user is None:
+            raise RuntimeError("login: usuário não autenticado")
+
+    def feedback_round(self, rating):
+        app = self.app
+        self._timed('chatbot', lambda: self._sidebar_click("🤖 Chatbot de Feedback"))
+        self._timed('chat: produto', lambda: (
+            app.selectbox(key='product_select').select(self.product),
+            app.button(key='send_product').click(),
+        ))
+        self._timed('chat: nota do produto', lambda: (
+            app.selectbox(key='produto_rating_select').select(rating),
+            app.button(key='send_produto_rating').click(),
+        ))
+        self._timed('chat: nota da entrega', lambda: (
+            app.selectbox(key='entrega_rating_select').select(5 - rating),
+            app.button(key='send_entrega_rating').click(),
+        ))
+        self._timed('chat: comentário', lambda: (
+            app.text_area(key='comment_input').input("Teste de carga"),
+            app.button(key='send_comment').click(),
+        ))
+        self._timed('chat: novo feedback', lambda: next(
+            button for button in app.button if button.label == "✅ Sim, novo feedback"
+        ).click())
+        self._timed('dashboard', lambda: self._sidebar_click("📊 Dashboard"))
+        self._timed('fila', lambda: self._sidebar_click("🔄 Fila de Processamento"))
+
+    def run(self, iterations):
+        try:
+            self.login()
+            for i in range(iterations):
+                self.feedback_round(i % 6)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+
+
+def _session_process(db_path, index, product, iterations, barrier, results):
+    """Corpo de cada processo: uma sessão sobre o banco compartilhado."""
+    warnings.filterwarnings('ignore', message='Glyph')
+    database.configure(db_path)
+    session = Session(index, product)
+    barrier.wait()
+    session.run(iterations)
+    results.put((session.timings, session.error))
+
+# ==================== EXECUÇÃO ====================
+
+def percentile(sorted_values, p):
+    """Percentil p (0-100) por interpolação linear entre as amostras ordenadas."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * p / 100
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def run_load(db_path, sessions, iterations=3):
+    """
+    Executa `sessions` sessões simultâneas sobre o banco em db_path.
+
+    Args:
+        db_path (str): Banco SQLite já migrado
+        sessions (int): Sessões simultâneas (um processo cada)
+        iterations (int): Feedbacks enviados por sessão
+
+    Returns:
+        dict: Latências por interação (ms), vazão e erros
+    """
+    products = ["Camiseta", "Shorts", "Calça", "Tênis"]
+    for i in range(sessions):
+        register_user(f"carga{i}", PASSWORD, f"Sessão {i}", f"carga{i}@exemplo.com")
+
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(sessions + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=_session_process, name=f"sessao-{i}",
+                        args=(db_path, i, products[i % len(products)], iterations, barrier, results))
+        for i in range(sessions)
+    ]
+    for process in processes:
+        process.start()
+
+    # O relógio começa quando todas as sessões terminaram de importar o Streamlit
+    barrier.wait()
+    start = time.perf_counter()
+    outcomes = []
+    while len(outcomes) < sessions:
+        try:
+            outcomes.append(results.get(timeout=1))
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes) and results.empty():
+                break
+    elapsed = time.perf_counter() - start
+    for process in processes:
+        process.join()
+    errors = [error for _, error in outcomes if error]
+    errors += ["processo encerrado sem resultado"] * (sessions - len(outcomes))
+
+    by_name = {}
+    for timings, _ in outcomes:
+        for name, seconds in timings:
+            by_name.setdefault(name, []).append(seconds * 1000)
+
+    interactions = {}
+    for name, values in by_name.items():
+        values.sort()
+        interactions[name] = {
+            'n': len(values),
+            'p50_ms': percentile(values, 50),
+            'p95_ms': percentile(values, 95),
+            'p99_ms': percentile(values, 99),
+            'max_ms': values[-1],
+        }
+
+    total = sum(len(timings) for timings, _ in outcomes)
+    saved = interactions.get('chat: comentário', {}).get('n', 0)
+    return {
+        'sessions': sessions,
+        'iterations': iterations,
+        'elapsed_s': elapsed,
+        'interactions': total,
+        'throughput_per_s': total / elapsed if elapsed else 0.0,
+        'feedbacks_per_s': saved / elapsed if elapsed else 0.0,
+        'errors': errors,
+        'latency': interactions,
+    }
+
+
+def print_report(result):
+    """Imprime a tabela de latências e a vazão de uma execução."""
+    print(f"\n👥 {result['sessions']} sessões x {result['iterations']} feedbacks "
+          f"em {result['elapsed_s']:.1f} s")
+    print(f"{'interação':<24} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'máx ms':>9}")
+    for name, stats in result['latency'].items():
+        print(f"{name:<24} {stats['n']:>5} {stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} "
+              f"{stats['p99_ms']:9.1f} {stats['max_ms']:9.1f}")
+    print(f"Vazão: {result['throughput_per_s']:.1f} interações/s, "
+          f"{result['feedbacks_per_s']:.2f} feedbacks/s")
+    for error in result['errors']:
+        print(f"⚠️ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do FeedSmart com sessões simultâneas")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[8],
+                        help="Sessões simultâneas (vários valores = uma execução para cada)")
+    parser.add_argument('--iterations', type=int, default=3, help="Feedbacks enviados por sessão")
+    parser.add_argument('--feedbacks', type=int, default=0,
+                        help="Feedbacks sintéticos pré-carregados no banco")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help="Grava os resultados em JSON")
+    args = parser.parse_args()
+
+    # Os emojis dos títulos não existem na fonte padrão do matplotlib
+    warnings.filterwarnings('ignore', message='Glyph')
+
+    results = []
+    for sessions in args.sessions:
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, 'carga.db')
+            if args.feedbacks:
+                users, feedbacks = generate(max(10, args.feedbacks // 50), args.feedbacks, args.seed)
+                manager = write_sqlite(users, feedbacks, path)
+            else:
+                manager = database.configure(path)
+                ensure_schema(manager)
+            try:
+                result = run_load(path, sessions, args.iterations)
+            finally:
+                manager.close_all()
+        print_report(result)
+        results.append(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ Resultados salvos em {args.output}")
+    if any(result['errors'] for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,401 @@
+"""
+Suíte de benchmarks do FeedSmart sobre dados sintéticos.
+
+Para cada escala (quantidade de feedbacks) gera dados com benchmarks.synthetic
+em um diretório temporário (banco SQLite + CSV legado) e mede os caminhos
+quentes da aplicação: gravação e leitura de feedbacks, ordenação, extração de
+notas, gráfico produto x entrega, fila de prioridade (em memória e a fila
+durável do app, no SQLite) e processamento do CSV.
+
+Os resultados vão para um JSON (por padrão benchmarks/results/<commit>.json)
+com os metadados da execução; --compare confronta dois desses arquivos e
+aponta regressões, para acompanhar o desempenho entre commits.
+
+Uso:
+    python -m benchmarks.suite
+    python -m benchmarks.suite --scales 1000 10000 --repeat 3 --only queue sort
+    python -m benchmarks.suite --compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate, write_csv, write_sqlite
+from feedsmart.analytics.data_processing import extract_ratings_from_comments, process_feedback
+from feedsmart.analytics.visualization import create_product_vs_delivery_chart
+from feedsmart.cache import user_data_cache
+from feedsmart.queue.data_structures import FeedbackQueue
+from feedsmart.queue.durable_queue import DurableFeedbackQueue
+from feedsmart.sorting import merge_sort_by_rating
+from feedsmart.storage.feedback import get_user_feedbacks, query_user_feedbacks, save_feedback
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+DEFAULT_SCALES = [1000, 10000, 100000]
+
+# Tamanho da página do histórico no app
+PAGE_SIZE = 50
+
+# Gravações medidas por repetição (cada uma é uma transação)
+SAVE_OPS = 200
+
+# Itens da fila durável enfileirados/consumidos por repetição e tamanho do lote do worker
+QUEUE_OPS = 500
+QUEUE_BATCH = 32
+
+# Variação (relativa ao tempo base) a partir da qual --compare aponta regressão
+REGRESSION_THRESHOLD = 0.10
+
+# ==================== MEDIÇÃO ====================
+
+def measure(func, repeat, number=1, setup=None):
+    """
+    Mede func em `repeat` rodadas de `number` chamadas.
+
+    Args:
+        func: Função chamada com o retorno de setup (ou sem argumentos)
+        repeat (int): Quantidade de rodadas
+        number (int): Chamadas por rodada (para operações muito curtas)
+        setup: Função sem argumentos executada fora do tempo, antes de cada rodada
+
+    Returns:
+        tuple: (melhor, mediana) em segundos por chamada
+    """
+    times = []
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args)
+        times.append((time.perf_counter() - start) / number)
+    return min(times), statistics.median(times)
+
+
+class Context:
+    """Dados sintéticos de uma escala, compartilhados pelos benchmarks."""
+
+    def __init__(self, scale, seed, workdir):
+        self.scale = scale
+        self.users, self.feedbacks = generate(max(10, scale // 50), scale, seed)
+        self.manager = write_sqlite(self.users, self.feedbacks, os.path.join(workdir, 'bench.db'))
+        csv_path = os.path.join(workdir, 'bench.csv')
+        write_csv(self.users, self.feedbacks, csv_path)
+        self.legacy = pd.read_csv(csv_path)
+
+        # O usuário com mais feedbacks é o pior caso do histórico e do dashboard
+        self.heavy_user = self.feedbacks['user_id'].value_counts().index[0]
+        self.heavy_feedbacks, _ = query_user_feedbacks(self.heavy_user)
+
+    def close(self):
+        self.manager.close_all()
+
+# ==================== BENCHMARKS ====================
+# Cada benchmark recebe (ctx, repeat) e devolve uma lista de
+# (nome, operações por chamada, melhor, mediana).
+
+def bench_save_feedback(ctx, repeat):
+    rows = ctx.feedbacks.sample(SAVE_OPS, replace=True, random_state=0)
+    args = [
+        (user_id, float(rating), comment, None if pd.isna(product) else product,
+         None if pd.isna(pr) else int(pr), None if pd.isna(dr) else int(dr))
+        for user_id, rating, comment, product, pr, dr in rows[
+            ['user_id', 'rating', 'comment', 'product', 'product_rating', 'delivery_rating']
+        ].itertuples(index=False, name=None)
+    ]
+
+    def run():
+        for row in args:
+            save_feedback(*row)
+
+    return [('save_feedback', SAVE_OPS, *measure(run, repeat))]
+
+
+def bench_user_feedbacks(ctx, repeat):
+    results = []
+    ops = len(ctx.heavy_feedbacks)
+    for sort_method in ('timestamp', 'rating'):
+        results.append((
+            f'query_user_feedbacks[{sort_method},página]', PAGE_SIZE,
+            *measure(lambda: query_user_feedbacks(ctx.heavy_user, sort_method, PAGE_SIZE), repeat)
+        ))
+        results.append((
+            f'query_user_feedbacks[{sort_method},tudo]', ops,
+            *measure(lambda: query_user_feedbacks(ctx.heavy_user, sort_method), repeat)
+        ))
+
+    # Leitura repetida: acerto no cache de leitura
+    user_data_cache.bump(ctx.heavy_user)
+    get_user_feedbacks(ctx.heavy_user, 'timestamp', PAGE_SIZE)
+    results.append((
+        'get_user_feedbacks[cache]', 1,
+        *measure(lambda: get_user_feedbacks(ctx.heavy_user, 'timestamp', PAGE_SIZE), repeat, number=1000)
+    ))
+    return results
+
+
+def bench_merge_sort(ctx, repeat):
+    ratings = ctx.feedbacks['rating'].tolist()
+    return [('merge_sort_by_rating', len(ratings), *measure(lambda: merge_sort_by_rating(ratings), repeat))]
+
+
+def bench_extract_ratings(ctx, repeat):
+    feedbacks = ctx.feedbacks[['rating', 'comment']]
+    return [('extract_ratings_from_comments', len(feedbacks),
+             *measure(lambda: extract_ratings_from_comments(feedbacks), repeat))]
+
+
+def bench_product_vs_delivery_chart(ctx, repeat):
+    def run():
+        fig, _, _ = create_product_vs_delivery_chart(ctx.heavy_feedbacks)
+        plt.close(fig)
+
+    return [('create_product_vs_delivery_chart', len(ctx.heavy_feedbacks), *measure(run, repeat))]
+
+
+def bench_queue(ctx, repeat):
+    items = [{'id': feedback_id, 'priority': int(priority)}
+             for feedback_id, priority in zip(ctx.feedbacks['id'], ctx.feedbacks['priority'])]
+    updates = [(item['id'], (item['priority'] % 5) + 1) for item in items[::10]]
+
+    def filled():
+        queue = FeedbackQueue()
+        for item in items:
+            queue.enqueue(item)
+        return queue
+
+    def enqueue_all():
+        queue = FeedbackQueue()
+        for item in items:
+            queue.enqueue(item)
+
+    def update_all(queue):
+        for item_id, priority in updates:
+            queue.update_priority(item_id, priority)
+
+    def dequeue_all(queue):
+        while queue.dequeue() is not None:
+            pass
+
+    queue = filled()
+    return [
+        ('FeedbackQueue.enqueue', len(items), *measure(enqueue_all, repeat)),
+        ('FeedbackQueue.peek', 1, *measure(queue.peek, repeat, number=10000)),
+        ('FeedbackQueue.update_priority', len(updates), *measure(update_all, repeat, setup=filled)),
+        ('FeedbackQueue.dequeue', len(items), *measure(dequeue_all, repeat, setup=filled)),
+    ]
+
+
+def bench_durable_queue(ctx, repeat):
+    queue = DurableFeedbackQueue(ctx.manager)
+    ops = min(QUEUE_OPS, ctx.scale)
+    fresh_ids = [(feedback_id, int(priority)) for feedback_id, priority in
+                 ctx.feedbacks[['id', 'priority']].head(ops).itertuples(index=False, name=None)]
+
+    def refill():
+        # Fila cheia (um item por feedback, como no banco sintético), fora do tempo medido
+        with ctx.manager.transaction() as conn:
+            conn.execute("DELETE FROM feedback_queue")
+            conn.execute(
+                "INSERT INTO feedback_queue (feedback_id, priority, enqueued_at) "
+                "SELECT id, priority, ? FROM feedback", (time.time(),)
+            )
+        return queue
+
+    def without_fresh_ids():
+        refill()
+        with ctx.manager.transaction() as conn:
+            conn.executemany("DELETE FROM feedback_queue WHERE feedback_id = ?",
+                             [(feedback_id,) for feedback_id, _ in fresh_ids])
+        return queue
+
+    def enqueue_all(queue):
+        for feedback_id, priority in fresh_ids:
+            queue.enqueue(feedback_id, priority)
+
+    def claim_ack(queue):
+        # Laço do worker: reserva um lote (UPDATE ... RETURNING) e confirma item a item
+        done = 0
+        while done < ops:
+            for item in queue.claim('bench', batch_size=min(QUEUE_BATCH, ops - done)):
+                queue.ack(item['queue_id'], 'bench')
+                done += 1
+
+    def process_all(queue):
+        for _ in range(ops):
+            queue.process_next('bench')
+
+    results = [
+        ('DurableFeedbackQueue.enqueue', ops, *measure(enqueue_all, repeat, setup=without_fresh_ids)),
+        (f'DurableFeedbackQueue.claim+ack[lote {QUEUE_BATCH}]', ops,
+         *measure(claim_ack, repeat, setup=refill)),
+        ('DurableFeedbackQueue.process_next', ops, *measure(process_all, repeat, setup=refill)),
+    ]
+    refill()
+    results += [
+        ('DurableFeedbackQueue.ready_count', 1, *measure(queue.ready_count, repeat, number=100)),
+        ('DurableFeedbackQueue.stats', 1, *measure(queue.stats, repeat, number=100)),
+    ]
+    return results
+
+
+def bench_process_feedback(ctx, repeat):
+    return [('process_feedback', len(ctx.legacy), *measure(lambda: process_feedback(ctx.legacy), repeat))]
+
+
+# Ordem de execução; save_feedback por último, pois altera o banco
+BENCHMARKS = {
+    'user_feedbacks': bench_user_feedbacks,
+    'sort': bench_merge_sort,
+    'extract': bench_extract_ratings,
+    'chart': bench_product_vs_delivery_chart,
+    'queue': bench_queue,
+    'durable_queue': bench_durable_queue,
+    'process': bench_process_feedback,
+    'save': bench_save_feedback,
+}
+
+# ==================== EXECUÇÃO E RESULTADOS ====================
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(seed, repeat, scales):
+    """Informações da execução gravadas junto com os resultados."""
+    return {
+        'commit': _git('rev-parse', '--short', 'HEAD'),
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'seed': seed,
+        'repeat': repeat,
+        'scales': scales,
+    }
+
+
+def run_suite(scales, repeat=5, seed=42, only=None):
+    """
+    Executa os benchmarks selecionados em cada escala.
+
+    Args:
+        scales (list): Quantidades de feedbacks
+        repeat (int): Rodadas por medição
+        seed (int): Semente do gerador de dados
+        only (list): Nomes (de BENCHMARKS) a executar; None = todos
+
+    Returns:
+        list: Um dict por medição (name, scale, ops, best_s, median_s, per_op_us)
+    """
+    selected = {name: bench for name, bench in BENCHMARKS.items() if not only or name in only}
+    results = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as workdir:
+            ctx = Context(scale, seed, workdir)
+            try:
+                for bench in selected.values():
+                    for name, ops, best, median in bench(ctx, repeat):
+                        results.append({
+                            'name': name, 'scale': scale, 'ops': ops,
+                            'best_s': best, 'median_s': median,
+                            'per_op_us': best / max(ops, 1) * 1e6,
+                        })
+                        print(f"{name:<42} {scale:>9} {best * 1000:11.3f} ms "
+                              f"{results[-1]['per_op_us']:10.3f} µs/op")
+            finally:
+                ctx.close()
+    return results
+
+
+def compare(base, new, threshold=REGRESSION_THRESHOLD):
+    """
+    Compara dois arquivos de resultados pelo melhor tempo de cada medição.
+
+    Returns:
+        int: Quantidade de regressões (novo mais lento que base além de threshold)
+    """
+    def load(path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return data['meta'], {(r['name'], r['scale']): r for r in data['results']}
+
+    base_meta, base_results = load(base)
+    new_meta, new_results = load(new)
+    print(f"base: {base_meta.get('commit')} ({base_meta.get('created_at')})  "
+          f"novo: {new_meta.get('commit')} ({new_meta.get('created_at')})")
+    print(f"{'medição':<42} {'escala':>9} {'base ms':>11} {'novo ms':>11} {'razão':>7}")
+
+    regressions = 0
+    for key in sorted(base_results.keys() & new_results.keys(), key=lambda k: (k[1], k[0])):
+        before, after = base_results[key]['best_s'], new_results[key]['best_s']
+        ratio = after / before if before else float('inf')
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  ⚠️ regressão"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            flag = "  ✅ melhora"
+        print(f"{key[0]:<42} {key[1]:>9} {before * 1000:11.3f} {after * 1000:11.3f} {ratio:7.2f}{flag}")
+
+    missing = base_results.keys() ^ new_results.keys()
+    if missing:
+        print(f"\n{len(missing)} medições existem em apenas um dos arquivos")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do FeedSmart")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=None)
+    parser.add_argument('--output', default=None,
+                        help="Arquivo JSON de saída (padrão: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NOVO'), default=None,
+                        help="Compara dois arquivos de resultados em vez de executar")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    # Os emojis dos títulos não existem na fonte padrão do matplotlib
+    warnings.filterwarnings('ignore', message='Glyph')
+
+    if args.compare:
+        regressions = compare(*args.compare, threshold=args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    meta = run_metadata(args.seed, args.repeat, args.scales)
+    results = run_suite(args.scales, args.repeat, args.seed, args.only)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        name = (meta['commit'] or 'sem-commit') + ('-dirty' if meta['dirty'] else '')
+        output = os.path.join(RESULTS_DIR, f"{name}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Resultados salvos em {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Gerador de dados sintéticos reprodutíveis para os benchmarks.
+
+Gera N usuários e M feedbacks com a mesma semente sempre produzindo os
+mesmos dados: poucos usuários concentram muitos feedbacks (distribuição de
+cauda longa), as datas se espalham por um ano com mais movimento de dia do
+que de madrugada, as notas tendem ao positivo e os comentários seguem o
+formato estruturado do chatbot (com uma fração de comentários livres, como
+os feedbacks antigos).
+
+Os dados podem ser gravados em um banco SQLite (esquema completo, via
+migrações) e no formato do CSV legado.
+
+Uso:
+    python -m benchmarks.synthetic --users 1000 --feedbacks 100000 --db /tmp/bench.db --csv /tmp/bench.csv
+"""
+import argparse
+import datetime
+import time
+
+import numpy as np
+import pandas as pd
+
+from feedsmart.analytics.data_processing import CSV_COLUMNS
+from feedsmart.comments import format_structured_comment
+from feedsmart.storage import database
+from feedsmart.storage.migrations import ensure_schema
+from feedsmart.storage.product_stats import catch_up
+from feedsmart.storage.user_stats import rebuild_stats
+
+PRODUCTS = ["Camiseta", "Shorts", "Calça", "Tênis"]
+
+# Probabilidade de cada nota (0 a 5): maioria satisfeita, cauda de insatisfeitos
+STAR_WEIGHTS = np.array([0.03, 0.05, 0.10, 0.17, 0.30, 0.35])
+
+# Movimento relativo por hora do dia (0h a 23h)
+HOUR_WEIGHTS = np.array([
+    1, 1, 1, 1, 1, 2, 3, 5, 7, 8, 8, 8,
+    9, 9, 8, 8, 8, 9, 10, 10, 9, 7, 4, 2,
+], dtype=float)
+
+COMMENTS = [
+    "Sem comentários adicionais", "Chegou antes do prazo", "Tamanho ficou pequeno",
+    "Ótima qualidade", "Entrega atrasou", "Embalagem danificada", "Recomendo",
+    "Cor diferente da foto", "Atendimento excelente", "Não gostei do tecido",
+]
+
+# Fração de comentários livres (sem o formato estruturado nem colunas tipadas)
+UNSTRUCTURED_RATIO = 0.05
+
+# Data de referência fixa, para que os dados não dependam do dia da execução
+END_DATE = datetime.datetime(2025, 1, 1)
+
+
+def generate(n_users, n_feedbacks, seed=42, days=365):
+    """
+    Gera usuários e feedbacks sintéticos.
+
+    Args:
+        n_users (int): Quantidade de usuários
+        n_feedbacks (int): Quantidade de feedbacks
+        seed (int): Semente do gerador
+        days (int): Período coberto pelas datas (terminando em END_DATE)
+
+    Returns:
+        tuple: (users, feedbacks) — DataFrames com as colunas das tabelas
+        `users` e `feedback` (mais service_rating, usada no CSV)
+    """
+    rng = np.random.default_rng(seed)
+
+    user_ids = [f"user-{i:07d}" for i in range(n_users)]
+    users = pd.DataFrame({
+        'id': user_ids,
+        'username': [f"usuario{i}" for i in range(n_users)],
+        'password': None,
+        'name': [f"Usuário {i}" for i in range(n_users)],
+        'email': [f"usuario{i}@exemplo.com" for i in range(n_users)],
+    })
+
+    # Atividade de cauda longa: poucos usuários com muitos feedbacks
+    activity = rng.pareto(1.2, n_users) + 1
+    owners = rng.choice(n_users, size=n_feedbacks, p=activity / activity.sum())
+
+    # Datas: dia uniforme no período, hora conforme o movimento do dia
+    day = rng.integers(0, days, n_feedbacks)
+    hour = rng.choice(24, size=n_feedbacks, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+    second = rng.integers(0, 3600, n_feedbacks)
+    offsets = pd.to_timedelta(day * 86400 + hour * 3600 + second - days * 86400, unit='s')
+    timestamps = (pd.Timestamp(END_DATE) + offsets).strftime("%Y-%m-%d %H:%M:%S")
+
+    stars = np.arange(6)
+    product_rating = rng.choice(stars, size=n_feedbacks, p=STAR_WEIGHTS)
+    delivery_rating = rng.choice(stars, size=n_feedbacks, p=STAR_WEIGHTS)
+    service_rating = rng.choice(stars[1:], size=n_feedbacks, p=STAR_WEIGHTS[1:] / STAR_WEIGHTS[1:].sum())
+    products = rng.choice(PRODUCTS, size=n_feedbacks)
+    texts = rng.choice(COMMENTS, size=n_feedbacks)
+    rating = (product_rating + delivery_rating) / 2
+
+    comments = [
+        format_structured_comment(p, pr, dr, text)
+        for p, pr, dr, text in zip(products, product_rating, delivery_rating, texts)
+    ]
+    structured = rng.random(n_feedbacks) >= UNSTRUCTURED_RATIO
+    for i in np.flatnonzero(~structured):
+        comments[i] = texts[i]
+
+    feedbacks = pd.DataFrame({
+        'id': [f"fb-{i:09d}" for i in range(n_feedbacks)],
+        'user_id': np.asarray(user_ids, dtype=object)[owners],
+        'rating': rating,
+        'comment': comments,
+        'timestamp': timestamps,
+        'priority': 6 - np.floor(rating).astype(int),
+        'product': pd.Series(products, dtype=object).where(structured, None),
+        'product_rating': pd.Series(product_rating, dtype='Int64').where(structured, pd.NA),
+        'delivery_rating': pd.Series(delivery_rating, dtype='Int64').where(structured, pd.NA),
+        'service_rating': service_rating,
+    })
+    return users, feedbacks
+
+
+def _records(df, columns):
+    """Linhas do DataFrame como tuplas de tipos nativos (None para ausentes)."""
+    data = df[columns].astype(object)
+    return list(data.where(data.notna(), None).itertuples(index=False, name=None))
+
+
+def write_sqlite(users, feedbacks, path, enqueue=True):
+    """
+    Grava os dados em um banco SQLite novo (ou vazio) e o torna o banco do processo.
+
+    Args:
+        users, feedbacks: Resultado de generate
+        path (str): Arquivo do banco
+        enqueue (bool): Também colocar os feedbacks na fila de processamento
+
+    Returns:
+        ConnectionManager: Gerenciador configurado para o banco
+    """
+    manager = database.configure(path)
+    ensure_schema(manager)
+    enqueued_at = time.time()
+
+    feedback_columns = ['id', 'user_id', 'rating', 'comment', 'timestamp', 'priority',
+                        'product', 'product_rating', 'delivery_rating']
+    with manager.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO users (id, username, password, name, email) VALUES (?, ?, ?, ?, ?)",
+            _records(users, ['id', 'username', 'password', 'name', 'email'])
+        )
+        conn.executemany(
+            f"INSERT INTO feedback ({', '.join(feedback_columns)}) VALUES ({', '.join('?' * len(feedback_columns))})",
+            _records(feedbacks, feedback_columns)
+        )
+        if enqueue:
+            conn.executemany(
+                "INSERT INTO feedback_queue (feedback_id, priority, enqueued_at) VALUES (?, ?, ?)",
+                [(*row, enqueued_at) for row in _records(feedbacks, ['id', 'priority'])]
+            )
+        rebuild_stats(conn)
+    catch_up(manager)
+    return manager
+
+
+def write_csv(users, feedbacks, path):
+    """Grava os feedbacks no formato do CSV legado (data/feedback_data.csv)."""
+    people = users.set_index('id').loc[feedbacks['user_id']]
+    legacy = pd.DataFrame({
+        'nome': people['name'].to_numpy(),
+        'email': people['email'].to_numpy(),
+        'produto': feedbacks['product'].fillna(PRODUCTS[0]),
+        'avaliacao_produto': feedbacks['product_rating'].fillna(feedbacks['rating'].round()),
+        'avaliacao_entrega': feedbacks['delivery_rating'].fillna(feedbacks['rating'].round()),
+        'avaliacao_atendimento': feedbacks['service_rating'],
+        'comentario': feedbacks['comment'],
+        'data': feedbacks['timestamp'],
+    })
+    legacy[CSV_COLUMNS].to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos do FeedSmart")
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--feedbacks', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--db', default=None, help="Banco SQLite de destino")
+    parser.add_argument('--csv', default=None, help="CSV legado de destino")
+    args = parser.parse_args()
+
+    if not args.db and not args.csv:
+        parser.error("informe --db e/ou --csv")
+
+    users, feedbacks = generate(args.users, args.feedbacks, args.seed)
+    if args.db:
+        write_sqlite(users, feedbacks, args.db)
+        print(f"✅ {args.db}: {len(users)} usuários, {len(feedbacks)} feedbacks")
+    if args.csv:
+        write_csv(users, feedbacks, args.csv)
+        print(f"✅ {args.csv}: {len(feedbacks)} linhas")
+
+
+if __name__ == '__main__':
+    main()
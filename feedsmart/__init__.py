@@ -0,0 +1,28 @@
+"""
+Núcleo do FeedSmart, independente do Streamlit.
+
+Subpacotes:
+    storage    Banco SQLite: conexões, migrações, usuários, feedbacks,
+               agregados, importação e exportação
+    queue      Filas de processamento (heap em memória e fila durável) e worker
+    analytics  Processamento com pandas, insights e gráficos com matplotlib
+
+Módulos avulsos: cache (caches LRU), sorting (ordenação), comments
+(formato do comentário estruturado), products (catálogo de produtos),
+tracing (medição de tempos) e metrics (métricas no formato do Prometheus).
+
+Importar o pacote não carrega nenhum subpacote; pandas, numpy e matplotlib
+só são importados por quem usa `analytics` (ou `sorting`).
+"""
+import importlib
+
+_SUBMODULES = {
+    'analytics', 'cache', 'comments', 'metrics', 'products', 'queue', 'sorting', 'storage', 'tracing'
+}
+
+
+def __getattr__(name):
+    # Acesso preguiçoso: feedsmart.storage importa o subpacote no primeiro uso
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
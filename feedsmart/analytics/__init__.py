@@ -0,0 +1,7 @@
+"""
+Análise de feedbacks (pandas/numpy) e gráficos (matplotlib).
+
+    data_processing  CSV legado, notas, satisfação e agregados em streaming
+    visualization    Gráficos e cache de imagens renderizadas
+    insights         Textos de insights do dashboard (sem dependências)
+"""
@@ -0,0 +1,582 @@
+import argparse
+import pandas as pd
+import numpy as np
+import csv
+import io
+import os
+import threading
+from contextlib import contextmanager
+
+from feedsmart.comments import STRUCTURED_COMMENT_PATTERN
+from feedsmart.tracing import traced
+
+# Caminho para o arquivo CSV
+DATA_FILE = 'data/feedback_data.csv'
+
+# Colunas do CSV, na ordem em que são gravadas
+CSV_COLUMNS = [
+    'nome', 'email', 'produto', 'avaliacao_produto',
+    'avaliacao_entrega', 'avaliacao_atendimento',
+    'comentario', 'data'
+]
+
+RATING_COLUMNS = ['avaliacao_produto', 'avaliacao_entrega', 'avaliacao_atendimento']
+
+# Tipos compactos para leitura em blocos (notas de 0 a 5 cabem em int8)
+CSV_DTYPES = {
+    'nome': 'string',
+    'email': 'string',
+    'produto': 'category',
+    'avaliacao_produto': 'Int8',
+    'avaliacao_entrega': 'Int8',
+    'avaliacao_atendimento': 'Int8',
+    'comentario': 'string',
+}
+
+# Tamanho padrão dos blocos no modo streaming
+CHUNK_SIZE = 100000
+
+# Faixas de satisfação pela média das avaliações (limites superiores inclusivos)
+SATISFACTION_LABELS = ['Insatisfeito', 'Neutro', 'Satisfeito']
+SATISFACTION_DTYPE = pd.CategoricalDtype(SATISFACTION_LABELS, ordered=True)
+SATISFACTION_BOUNDS = (2, 3.5)
+
+def ensure_data_file_exists():
+    """Garante que o arquivo de dados existe e tem a estrutura correta."""
+    directory = os.path.dirname(DATA_FILE)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    
+    if not os.path.exists(DATA_FILE):
+        # Criar um arquivo vazio com as colunas necessárias
+        with _file_lock(DATA_FILE):
+            if not os.path.exists(DATA_FILE):
+                pd.DataFrame(columns=CSV_COLUMNS).to_csv(DATA_FILE, index=False)
+
+@traced
+def load_feedback_data(chunksize=None):
+    """
+    Carrega os dados de feedback do arquivo CSV.
+    
+    Args:
+        chunksize (int): Se informado, retorna um iterador de DataFrames com
+            até `chunksize` linhas cada e tipos compactos (modo streaming)
+    """
+    ensure_data_file_exists()
+    if chunksize is not None:
+        return iter_feedback_chunks(DATA_FILE, chunksize)
+    return pd.read_csv(DATA_FILE)
+
+def iter_feedback_chunks(path=None, chunksize=CHUNK_SIZE):
+    """
+    Lê o CSV em blocos com tipos explícitos: notas em Int8, produto como
+    categoria e data já convertida para datetime.
+    
+    Args:
+        path (str): Arquivo CSV (padrão: DATA_FILE)
+        chunksize (int): Linhas por bloco
+    
+    Yields:
+        pandas.DataFrame: Um bloco do arquivo
+    """
+    reader = pd.read_csv(path or DATA_FILE, dtype=CSV_DTYPES, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            chunk['data'] = pd.to_datetime(chunk['data'], format='ISO8601', errors='coerce')
+            yield chunk
+
+# ==================== ESCRITA APPEND-ONLY ====================
+# As gravações só acrescentam linhas; a compactação (compact_data_file) é uma
+# manutenção explícita, fora do caminho de escrita:
+#     python -m feedsmart.analytics.data_processing --compact [--sort] [--drop-duplicates]
+
+_thread_lock = threading.Lock()
+
+@contextmanager
+def _file_lock(path):
+    """
+    Lock exclusivo entre processos (arquivo '<path>.lock') e entre threads.
+    
+    Usa fcntl.flock no Linux/macOS e msvcrt.locking no Windows.
+    """
+    with _thread_lock:
+        with open(path + '.lock', 'a+b') as lock_file:
+            if os.name == 'nt':
+                import msvcrt
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def _format_rows(rows):
+    """Converte dicionários de feedback em linhas CSV, na ordem de CSV_COLUMNS."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for row in rows:
+        writer.writerow(['' if row.get(col) is None else row.get(col) for col in CSV_COLUMNS])
+    return buffer.getvalue()
+
+@traced
+def append_feedback_rows(rows, path=None):
+    """
+    Acrescenta linhas ao final do CSV sob lock, sem reler o arquivo.
+    
+    O custo depende apenas do número de linhas novas, não do tamanho do
+    arquivo. Chaves fora de CSV_COLUMNS são ignoradas.
+    
+    Args:
+        rows (list[dict]): Feedbacks a gravar
+        path (str): Arquivo CSV (padrão: DATA_FILE)
+    """
+    path = path or DATA_FILE
+    if path == DATA_FILE:
+        ensure_data_file_exists()
+    data = _format_rows(rows).encode('utf-8')
+    
+    with _file_lock(path):
+        with open(path, 'a+b') as f:
+            # Garantir que a linha anterior terminou antes de acrescentar
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    data = b'\n' + data
+            f.write(data)
+            f.flush()
+
+def save_feedback(feedback_data):
+    """Salva um novo feedback no arquivo CSV (append de uma única linha)."""
+    append_feedback_rows([feedback_data])
+    return True
+
+class FeedbackAppendBuffer:
+    """
+    Agrupa gravações em rajadas: acumula linhas e as grava com um único
+    append (um lock e uma escrita) ao atingir `max_rows` ou `max_delay`
+    segundos desde a primeira linha pendente.
+    
+    O prazo é cumprido por um timer em segundo plano, então um lote parado
+    também é gravado. Chame close() (ou use o bloco with) ao terminar para
+    gravar o que faltar antes de o processo sair.
+    
+    Uso:
+        with FeedbackAppendBuffer() as buffer:
+            for feedback in feedbacks:
+                buffer.add(feedback)
+    """
+    
+    def __init__(self, path=None, max_rows=500, max_delay=1.0):
+        self.path = path
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._rows = []
+        self._timer = None
+        self._lock = threading.Lock()
+    
+    def add(self, feedback_data):
+        """Adiciona um feedback ao lote, gravando se o lote estiver cheio."""
+        with self._lock:
+            self._rows.append(feedback_data)
+            due = len(self._rows) >= self.max_rows
+            if not due and self._timer is None:
+                # Primeira linha pendente: grava no máximo max_delay segundos depois
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+    
+    def flush(self):
+        """Grava as linhas pendentes."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        if rows:
+            append_feedback_rows(rows, self.path)
+    
+    def close(self):
+        """Grava as linhas pendentes e encerra o timer."""
+        self.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+@traced
+def compact_data_file(path=None, drop_duplicates=False, sort=False):
+    """
+    Reescreve o CSV com todas as colunas esperadas, na ordem de CSV_COLUMNS.
+    
+    Manutenção explícita (não roda nas gravações): lê e reescreve o arquivo
+    inteiro sob o mesmo lock dos appends, bloqueando-os enquanto isso. A
+    escrita vai para um arquivo temporário que substitui o original de
+    forma atômica.
+    
+    Args:
+        path (str): Arquivo CSV (padrão: DATA_FILE)
+        drop_duplicates (bool): Remove linhas idênticas (dois feedbacks reais
+            iguais, até no segundo, viram um só)
+        sort (bool): Ordena as linhas por data (ordenação estável)
+    
+    Returns:
+        int: Quantidade de linhas após a compactação
+    """
+    path = path or DATA_FILE
+    with _file_lock(path):
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        df = df.reindex(columns=CSV_COLUMNS, fill_value='')
+        if drop_duplicates:
+            df = df.drop_duplicates()
+        if sort:
+            df = df.sort_values('data', kind='stable')
+        
+        temp_path = path + '.tmp'
+        df.to_csv(temp_path, index=False)
+        os.replace(temp_path, path)
+    return len(df)
+
+def satisfaction_codes(media):
+    """
+    Códigos de satisfação (0 = Insatisfeito, 1 = Neutro, 2 = Satisfeito).
+    
+    Média <= 2 é insatisfeito, <= 3.5 é neutro e o resto (inclusive médias
+    ausentes) é satisfeito, como na regra original linha a linha.
+    
+    Args:
+        media: Sequência de médias de avaliação
+    
+    Returns:
+        numpy.ndarray: Códigos int8
+    """
+    values = np.asarray(media, dtype=float)
+    low, mid = SATISFACTION_BOUNDS
+    return np.select([values <= low, values <= mid], [0, 1], default=2).astype(np.int8)
+
+def categorize_satisfaction(media):
+    """
+    Classifica médias de avaliação em faixas de satisfação, de forma vetorizada.
+    
+    Args:
+        media: pandas.Series (ou sequência) de médias
+    
+    Returns:
+        pandas.Series categórica com SATISFACTION_LABELS
+    """
+    categories = pd.Categorical.from_codes(satisfaction_codes(media), dtype=SATISFACTION_DTYPE)
+    index = media.index if isinstance(media, pd.Series) else None
+    return pd.Series(categories, index=index, name='categoria_satisfacao')
+
+def satisfaction_counts(media):
+    """Quantidade de médias em cada faixa de satisfação ({rótulo: contagem})."""
+    counts = np.bincount(satisfaction_codes(media), minlength=len(SATISFACTION_LABELS))
+    return {label: int(count) for label, count in zip(SATISFACTION_LABELS, counts)}
+
+def average_rating(df):
+    """
+    Média das três avaliações de cada linha, ignorando notas ausentes.
+    
+    Equivale a df[RATING_COLUMNS].mean(axis=1), calculada direto no array
+    NumPy (bem mais rápido que a redução por linha do pandas).
+    """
+    values = df[RATING_COLUMNS].to_numpy(dtype=float, na_value=np.nan)
+    present = ~np.isnan(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = np.where(present, values, 0).sum(axis=1) / present.sum(axis=1)
+    return pd.Series(media, index=df.index, name='avaliacao_media')
+
+@traced
+def process_feedback(df):
+    """
+    Processa os dados de feedback para análise.
+    
+    Retorna um novo DataFrame com avaliacao_media, data convertida e
+    categoria_satisfacao; o DataFrame recebido não é alterado.
+    """
+    if df.empty:
+        return df
+    
+    media = average_rating(df)
+    return df.assign(
+        avaliacao_media=media,
+        data=pd.to_datetime(df['data']),
+        categoria_satisfacao=categorize_satisfaction(media)
+    )
+
+@traced
+def extract_ratings_from_comments(feedbacks):
+    """
+    Extrai avaliações de produto e entrega dos comentários estruturados.
+    
+    A extração é vetorizada (um único str.extract sobre a coluna inteira);
+    feedbacks cujo comentário não segue o formato estruturado usam a nota
+    geral da própria linha.
+    
+    Args:
+        feedbacks: DataFrame com as colunas 'comment' e 'rating'
+    
+    Returns:
+        tuple: (product_ratings, delivery_ratings) como pd.Series de float
+    """
+    extracted = feedbacks['comment'].astype(str).str.extract(STRUCTURED_COMMENT_PATTERN)
+    
+    # O fallback só vale quando as duas notas foram encontradas
+    matched = extracted['product_rating'].notna() & extracted['delivery_rating'].notna()
+    fallback = feedbacks['rating'].astype(float)
+    
+    product_ratings = pd.to_numeric(extracted['product_rating']).where(matched).fillna(fallback)
+    delivery_ratings = pd.to_numeric(extracted['delivery_rating']).where(matched).fillna(fallback)
+    return product_ratings, delivery_ratings
+
+@traced
+def get_product_delivery_ratings(feedbacks):
+    """
+    Obtém as notas de produto e entrega de cada feedback.
+    
+    Usa as colunas product_rating/delivery_rating quando disponíveis e recorre
+    à nota geral para feedbacks antigos sem essas colunas preenchidas. Só
+    analisa o texto do comentário se o DataFrame não tiver as colunas.
+    
+    Args:
+        feedbacks: DataFrame com feedbacks
+    
+    Returns:
+        tuple: (product_ratings, delivery_ratings) como pd.Series de float
+    """
+    if 'product_rating' not in feedbacks.columns or 'delivery_rating' not in feedbacks.columns:
+        return extract_ratings_from_comments(feedbacks)
+    
+    fallback = feedbacks['rating'].astype(float)
+    product_ratings = feedbacks['product_rating'].astype(float).fillna(fallback)
+    delivery_ratings = feedbacks['delivery_rating'].astype(float).fillna(fallback)
+    return product_ratings, delivery_ratings
+
+def rating_histogram(ratings):
+    """
+    Conta quantas avaliações inteiras existem para cada nota de 1 a 5.
+    
+    Notas fracionárias (ex.: média 3.5 usada como fallback) ou fora da faixa
+    não entram na contagem.
+    
+    Args:
+        ratings: Sequência de notas
+    
+    Returns:
+        numpy.ndarray: Contagens para as notas 1, 2, 3, 4 e 5
+    """
+    values = np.asarray(ratings, dtype=float)
+    whole = values[np.isfinite(values) & (values == np.floor(values)) & (values >= 0) & (values <= 5)]
+    return np.bincount(whole.astype(np.int64), minlength=6)[1:6]
+
+# ==================== ANÁLISE EM STREAMING ====================
+
+class FeedbackAggregates:
+    """
+    Agregados acumulados bloco a bloco, com memória constante.
+    
+    Guarda contagens e somas (não médias), de modo que cada bloco é somado
+    ao resultado parcial e as médias só são calculadas no final.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.rating_sums = dict.fromkeys(RATING_COLUMNS, 0)
+        self.rating_counts = dict.fromkeys(RATING_COLUMNS, 0)
+        self.satisfaction_counts = dict.fromkeys(SATISFACTION_LABELS, 0)
+        self.products = {}
+        self.first_date = None
+        self.last_date = None
+    
+    def update(self, chunk):
+        """Soma um bloco (DataFrame com as colunas do CSV) aos agregados."""
+        if chunk.empty:
+            return self
+        
+        ratings = chunk[RATING_COLUMNS].astype('float32')
+        self.count += len(chunk)
+        for col in RATING_COLUMNS:
+            self.rating_sums[col] += float(ratings[col].sum())
+            self.rating_counts[col] += int(ratings[col].count())
+        
+        # Faixas de satisfação pela média das três notas
+        for label, count in satisfaction_counts(average_rating(ratings)).items():
+            self.satisfaction_counts[label] += count
+        
+        # Estatísticas por produto
+        grouped = ratings.groupby(chunk['produto'], observed=True)
+        sums = grouped.sum()
+        counts = grouped.count()
+        sizes = grouped.size()
+        for produto in sizes.index:
+            key = str(produto).strip()
+            stats = self.products.setdefault(key, {
+                'count': 0,
+                'sums': dict.fromkeys(RATING_COLUMNS, 0.0),
+                'counts': dict.fromkeys(RATING_COLUMNS, 0),
+            })
+            stats['count'] += int(sizes[produto])
+            for col in RATING_COLUMNS:
+                stats['sums'][col] += float(sums.at[produto, col])
+                stats['counts'][col] += int(counts.at[produto, col])
+        
+        dates = chunk['data']
+        if dates.notna().any():
+            first, last = dates.min(), dates.max()
+            self.first_date = first if self.first_date is None else min(self.first_date, first)
+            self.last_date = last if self.last_date is None else max(self.last_date, last)
+        return self
+    
+    def means(self):
+        """Média de cada categoria de avaliação."""
+        return {
+            col: self.rating_sums[col] / self.rating_counts[col] if self.rating_counts[col] else None
+            for col in RATING_COLUMNS
+        }
+    
+    def chart_aggregates(self):
+        """Agregados no formato dos gráficos (ver chart_aggregates)."""
+        return {
+            'means': self.means(),
+            'counts': dict(self.rating_counts),
+            'satisfaction': dict(self.satisfaction_counts),
+        }
+    
+    def product_stats(self):
+        """DataFrame com quantidade e médias por produto."""
+        rows = []
+        for produto, stats in self.products.items():
+            row = {'produto': produto, 'quantidade': stats['count']}
+            for col in RATING_COLUMNS:
+                count = stats['counts'][col]
+                row[f'media_{col}'] = stats['sums'][col] / count if count else None
+            rows.append(row)
+        return pd.DataFrame(rows).sort_values('quantidade', ascending=False, ignore_index=True) if rows else pd.DataFrame()
+
+@traced
+def process_feedback_stream(chunks):
+    """
+    Versão em streaming de process_feedback: consome blocos (por exemplo,
+    de load_feedback_data(chunksize=...)) e devolve apenas os agregados.
+    
+    Args:
+        chunks: Iterável de DataFrames
+    
+    Returns:
+        FeedbackAggregates
+    """
+    aggregates = FeedbackAggregates()
+    for chunk in chunks:
+        aggregates.update(chunk)
+    return aggregates
+
+# ==================== AGREGADOS PARA GRÁFICOS ====================
+
+@traced
+def chart_aggregates(df):
+    """
+    Agregados usados pelos gráficos de categoria e de satisfação.
+    
+    O resultado é um dicionário pequeno, independente do tamanho dos dados,
+    que pode ser guardado em cache separado da renderização:
+        {'means': {coluna: média ou None},
+         'counts': {coluna: notas não nulas},
+         'satisfaction': {faixa: quantidade}}
+    
+    Args:
+        df: DataFrame com as colunas de RATING_COLUMNS
+    
+    Returns:
+        dict
+    """
+    counts = {col: int(df[col].count()) for col in RATING_COLUMNS}
+    return {
+        'means': {col: float(df[col].mean()) if counts[col] else None for col in RATING_COLUMNS},
+        'counts': counts,
+        'satisfaction': satisfaction_counts(average_rating(df)),
+    }
+
+@traced
+def chart_aggregates_from_query(conn, query, params=()):
+    """
+    Calcula os agregados dos gráficos no próprio SQLite.
+    
+    A consulta deve devolver as colunas de RATING_COLUMNS; ela é usada como
+    subconsulta e só uma linha de resultado sai do banco. Exemplo com a
+    tabela `feedback`:
+        SELECT product_rating AS avaliacao_produto,
+               delivery_rating AS avaliacao_entrega,
+               rating AS avaliacao_atendimento
+        FROM feedback WHERE user_id = ?
+    
+    Args:
+        conn: Conexão SQLite
+        query (str): Consulta com as colunas de avaliação
+        params: Parâmetros da consulta
+    
+    Returns:
+        dict: Mesmo formato de chart_aggregates
+    """
+    total = " + ".join(f"COALESCE({col}, 0)" for col in RATING_COLUMNS)
+    present = " + ".join(f"({col} IS NOT NULL)" for col in RATING_COLUMNS)
+    media = f"(({total}) * 1.0 / NULLIF({present}, 0))"
+    low, mid = SATISFACTION_BOUNDS
+    columns = ", ".join(f"AVG({col}), COUNT({col})" for col in RATING_COLUMNS)
+    row = conn.execute(f"""
+        SELECT {columns},
+               COALESCE(SUM({media} <= {low}), 0),
+               COALESCE(SUM({media} > {low} AND {media} <= {mid}), 0),
+               COUNT(*)
+        FROM ({query})
+    """, params).fetchone()
+    
+    means = {col: row[2 * i] for i, col in enumerate(RATING_COLUMNS)}
+    counts = {col: row[2 * i + 1] for i, col in enumerate(RATING_COLUMNS)}
+    insatisfeito, neutro, total_rows = row[-3:]
+    # Médias ausentes (linha sem notas) contam como satisfeito, como em satisfaction_codes
+    values = [insatisfeito, neutro, total_rows - insatisfeito - neutro]
+    return {
+        'means': means,
+        'counts': counts,
+        'satisfaction': dict(zip(SATISFACTION_LABELS, values)),
+    }
+
+@traced
+def chart_aggregates_from_stream(chunks):
+    """
+    Agregados dos gráficos a partir de blocos (ex.: load_feedback_data(chunksize=...)),
+    com memória constante.
+    
+    Returns:
+        dict: Mesmo formato de chart_aggregates
+    """
+    return process_feedback_stream(chunks).chart_aggregates()
+
+def main():
+    parser = argparse.ArgumentParser(description="Manutenção do CSV de feedbacks")
+    parser.add_argument('csv', nargs='?', default=DATA_FILE, help="Arquivo CSV")
+    parser.add_argument('--compact', action='store_true', help="Reescreve o CSV com as colunas canônicas")
+    parser.add_argument('--sort', action='store_true', help="Ordena as linhas por data ao compactar")
+    parser.add_argument('--drop-duplicates', action='store_true',
+                        help="Remove linhas idênticas ao compactar")
+    args = parser.parse_args()
+
+    if not args.compact:
+        parser.error("nada a fazer (use --compact)")
+    rows = compact_data_file(args.csv, drop_duplicates=args.drop_duplicates, sort=args.sort)
+    print(f"✅ {args.csv} compactado ({rows} linhas)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Textos de insights do dashboard a partir das médias de produto e entrega.
+"""
+
+
+def create_insights_text(avg_product, avg_delivery):
+    """
+    Gera insights personalizados baseados nas avaliações.
+    
+    Args:
+        avg_product: Média de avaliação dos produtos
+        avg_delivery: Média de avaliação da entrega
+    
+    Returns:
+        dict: Dicionário com insights e recomendações
+    """
+    diff = abs(avg_product - avg_delivery)
+    
+    insights = {
+        'better_category': '',
+        'difference': diff,
+        'recommendation': '',
+        'status': ''
+    }
+    
+    if avg_product > avg_delivery:
+        insights['better_category'] = 'produtos'
+        insights['status'] = f"🛍️ **Produtos são seu ponto forte!** ({avg_product:.1f}/5 vs {avg_delivery:.1f}/5)"
+        if diff > 1.0:
+            insights['recommendation'] = "🚚 **Atenção:** Considere conversar com a loja sobre melhorias na entrega."
+        else:
+            insights['recommendation'] = "📦 A entrega pode melhorar um pouco, mas está no caminho certo."
+    
+    elif avg_delivery > avg_product:
+        insights['better_category'] = 'entrega'
+        insights['status'] = f"🚚 **Entrega é seu ponto forte!** ({avg_delivery:.1f}/5 vs {avg_product:.1f}/5)"
+        if diff > 1.0:
+            insights['recommendation'] = "🛍️ **Atenção:** Talvez seja hora de experimentar outros produtos da loja."
+        else:
+            insights['recommendation'] = "🎯 Os produtos podem melhorar, mas você está satisfeito no geral."
+    
+    else:
+        insights['better_category'] = 'equilibrado'
+        insights['status'] = f"⚖️ **Experiência equilibrada!** (Ambos com {avg_product:.1f}/5)"
+        insights['recommendation'] = "🎉 Parabéns! Você tem uma experiência consistente em ambas as áreas."
+    
+    return insights
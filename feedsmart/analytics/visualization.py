@@ -0,0 +1,431 @@
+import io
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import numpy as np
+
+from feedsmart import metrics
+from feedsmart.cache import LRUCache, monitored_caches
+from feedsmart.analytics.data_processing import (
+    RATING_COLUMNS,
+    SATISFACTION_LABELS,
+    chart_aggregates,
+    get_product_delivery_ratings,
+    rating_histogram,
+)
+from feedsmart.tracing import traced
+
+# Cores das faixas de satisfação, na ordem de SATISFACTION_LABELS
+SATISFACTION_COLORS = ['#e74c3c', '#f39c12', '#2ecc71']
+
+# Orçamento de memória do cache de gráficos renderizados
+CHART_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+@traced
+def create_category_chart(df):
+    """Cria um gráfico de barras para as avaliações por categoria."""
+    return create_category_chart_from_aggregates(chart_aggregates(df))
+
+@traced
+def create_category_chart_from_aggregates(aggregates):
+    """
+    Gráfico de barras por categoria a partir dos agregados.
+    
+    Args:
+        aggregates (dict): Resultado de chart_aggregates, chart_aggregates_from_query
+            ou chart_aggregates_from_stream
+    
+    Returns:
+        matplotlib.figure.Figure
+    """
+    means = aggregates['means']
+    
+    # Criar figura
+    fig, ax = plt.subplots(figsize=(10, 6))
+    
+    # Dados para o gráfico (categorias sem notas ficam sem barra)
+    categorias = ['Produto', 'Entrega', 'Atendimento']
+    valores = [np.nan if means[col] is None else means[col] for col in RATING_COLUMNS]
+    cores = ['#3498db', '#2ecc71', '#e74c3c']
+    
+    # Criar barras
+    bars = ax.bar(categorias, valores, color=cores, width=0.6)
+    
+    # Adicionar valores nas barras
+    for bar in bars:
+        height = bar.get_height()
+        if not np.isnan(height):
+            ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                    f'{height:.1f}', ha='center', va='bottom')
+    
+    # Configurar eixos
+    ax.set_ylim(0, 5.5)
+    ax.set_ylabel('Avaliação Média (1-5)')
+    ax.set_title('Avaliação Média por Categoria')
+    
+    # Adicionar linha de referência
+    ax.axhline(y=3, color='gray', linestyle='--', alpha=0.7)
+    
+    # Estilo
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    
+    fig.tight_layout()
+    return fig
+
+@traced
+def create_satisfaction_chart(df):
+    """Cria um gráfico de pizza para a distribuição de satisfação."""
+    return create_satisfaction_chart_from_aggregates(chart_aggregates(df))
+
+@traced
+def create_satisfaction_chart_from_aggregates(aggregates):
+    """
+    Gráfico de pizza da distribuição de satisfação a partir dos agregados.
+    
+    Args:
+        aggregates (dict): Agregados com a chave 'satisfaction' ({faixa: quantidade})
+    
+    Returns:
+        matplotlib.figure.Figure
+    """
+    # Contagens na ordem das faixas, omitindo faixas vazias
+    satisfaction = aggregates['satisfaction']
+    slices = [
+        (label, satisfaction.get(label, 0), color)
+        for label, color in zip(SATISFACTION_LABELS, SATISFACTION_COLORS)
+        if satisfaction.get(label, 0) > 0
+    ]
+    labels = [label for label, _, _ in slices]
+    satisfaction_counts = [count for _, count, _ in slices]
+    colors = [color for _, _, color in slices]
+    
+    # Criar figura
+    fig, ax = plt.subplots(figsize=(8, 8))
+    
+    if not slices:
+        ax.text(0.5, 0.5, 'Sem feedbacks', ha='center', va='center', fontsize=14)
+        ax.set_title('Distribuição de Satisfação dos Clientes', fontsize=14)
+        ax.axis('off')
+        return fig
+    
+    # Criar gráfico de pizza
+    wedges, texts, autotexts = ax.pie(
+        satisfaction_counts, 
+        labels=labels, 
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=colors,
+        wedgeprops={'edgecolor': 'white', 'linewidth': 2}
+    )
+    
+    # Estilo dos textos
+    for text in texts:
+        text.set_fontsize(12)
+    for autotext in autotexts:
+        autotext.set_fontsize(12)
+        autotext.set_fontweight('bold')
+        autotext.set_color('white')
+    
+    # Título
+    ax.set_title('Distribuição de Satisfação dos Clientes', fontsize=14)
+    
+    # Círculo no centro para efeito de donut
+    centre_circle = plt.Circle((0, 0), 0.5, fc='white')
+    ax.add_artist(centre_circle)
+    
+    # Igual aspecto para garantir círculo
+    ax.set_aspect('equal')
+    
+    fig.tight_layout()
+    return fig
+
+@traced
+def create_product_vs_delivery_chart(feedbacks):
+    """
+    Cria um gráfico comparativo entre satisfação com produto e entrega.
+    
+    Args:
+        feedbacks: DataFrame com os feedbacks do usuário
+    
+    Returns:
+        tuple: (matplotlib.figure.Figure, avg_product, avg_delivery)
+    """
+    if feedbacks.empty:
+        return None, 0, 0
+    
+    # Obter avaliações de produto e entrega
+    product_ratings, delivery_ratings = get_product_delivery_ratings(feedbacks)
+    
+    # Calcular médias
+    avg_product = np.mean(product_ratings)
+    avg_delivery = np.mean(delivery_ratings)
+    
+    fig = plot_product_vs_delivery(
+        avg_product, avg_delivery,
+        rating_histogram(product_ratings), rating_histogram(delivery_ratings)
+    )
+    return fig, avg_product, avg_delivery
+
+@traced
+def create_product_vs_delivery_chart_from_stats(stats):
+    """
+    Cria o gráfico produto vs entrega a partir dos agregados do usuário
+    (feedsmart.storage.user_stats.get_user_stats), sem carregar os feedbacks.
+    
+    Args:
+        stats (dict): Agregados do usuário
+    
+    Returns:
+        tuple: (matplotlib.figure.Figure, avg_product, avg_delivery)
+    """
+    if not stats['count']:
+        return None, 0, 0
+    
+    # Os histogramas vão de 0 a 5; o gráfico mostra as notas de 1 a 5
+    fig = plot_product_vs_delivery(
+        stats['avg_product'], stats['avg_delivery'],
+        stats['product_hist'][1:6], stats['delivery_hist'][1:6]
+    )
+    return fig, stats['avg_product'], stats['avg_delivery']
+
+@traced
+def plot_product_vs_delivery(avg_product, avg_delivery, product_counts, delivery_counts):
+    """
+    Desenha o gráfico comparativo a partir de médias e contagens já calculadas.
+    
+    Args:
+        avg_product (float): Média das notas do produto
+        avg_delivery (float): Média das notas da entrega
+        product_counts: Quantidade de notas 1 a 5 do produto
+        delivery_counts: Quantidade de notas 1 a 5 da entrega
+    
+    Returns:
+        matplotlib.figure.Figure
+    """
+    # Criar figura com subplots
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    
+    # === GRÁFICO 1: Comparação de Médias ===
+    categories = ['🛍️ Qualidade\ndos Produtos', '🚚 Prazo de\nEntrega']
+    averages = [avg_product, avg_delivery]
+    colors = ['#3498db', '#e74c3c']
+    
+    bars = ax1.bar(categories, averages, color=colors, alpha=0.8, width=0.6)
+    
+    # Adicionar valores nas barras
+    for bar, avg in zip(bars, averages):
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                f'{avg:.1f}/5', ha='center', va='bottom', fontsize=14, fontweight='bold')
+    
+    # Linha de referência (média geral)
+    overall_avg = (avg_product + avg_delivery) / 2
+    ax1.axhline(y=overall_avg, color='gray', linestyle='--', alpha=0.7, 
+                label=f'Média Geral: {overall_avg:.1f}/5')
+    
+    ax1.set_ylim(0, 5.5)
+    ax1.set_ylabel('Avaliação Média', fontsize=12)
+    ax1.set_title('📊 Produto vs Entrega - Comparação', fontsize=14, fontweight='bold')
+    ax1.grid(axis='y', alpha=0.3)
+    ax1.legend()
+    
+    # === GRÁFICO 2: Distribuição Detalhada ===
+    x = np.arange(1, 6)  # Notas de 1 a 5
+    width = 0.35
+    
+    bars1 = ax2.bar(x - width/2, product_counts, width, label='🛍️ Produto', 
+                    color='#3498db', alpha=0.8)
+    bars2 = ax2.bar(x + width/2, delivery_counts, width, label='🚚 Entrega', 
+                    color='#e74c3c', alpha=0.8)
+    
+    # Adicionar valores nas barras
+    for bars in [bars1, bars2]:
+        for bar in bars:
+            height = bar.get_height()
+            if height > 0:  # Só mostrar se houver valor
+                ax2.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                        f'{int(height)}', ha='center', va='bottom', fontsize=10)
+    
+    ax2.set_xlabel('Avaliação (estrelas)', fontsize=12)
+    ax2.set_ylabel('Quantidade de Avaliações', fontsize=12)
+    ax2.set_title('📈 Distribuição de Notas', fontsize=14, fontweight='bold')
+    ax2.set_xticks(x)
+    ax2.set_xticklabels([f'{i}⭐' for i in range(1, 6)])
+    ax2.legend()
+    ax2.grid(axis='y', alpha=0.3)
+    
+    fig.tight_layout()
+    return fig
+
+# ==================== ANÁLISES GLOBAIS ====================
+
+@traced
+def create_product_comparison_chart(summary):
+    """
+    Barras com as médias de produto e entrega de cada produto.
+    
+    Args:
+        summary (list[dict]): Resultado de product_stats.product_summary
+    
+    Returns:
+        matplotlib.figure.Figure (None se não houver dados)
+    """
+    if not summary:
+        return None
+    
+    labels = [row['product'] or '(sem produto)' for row in summary]
+    x = np.arange(len(labels))
+    width = 0.35
+    
+    fig, ax = plt.subplots(figsize=(12, 6))
+    bars1 = ax.bar(x - width/2, [row['avg_product'] for row in summary], width,
+                   label='🛍️ Produto', color='#3498db', alpha=0.8)
+    bars2 = ax.bar(x + width/2, [row['avg_delivery'] for row in summary], width,
+                   label='🚚 Entrega', color='#e74c3c', alpha=0.8)
+    
+    for bars in [bars1, bars2]:
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height + 0.05,
+                    f'{height:.1f}', ha='center', va='bottom', fontsize=10)
+    
+    ax.set_ylim(0, 5.5)
+    ax.set_ylabel('Avaliação Média', fontsize=12)
+    ax.set_title('📊 Produto vs Entrega por Produto', fontsize=14, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels([f"{label}\n({row['count']} feedbacks)" for label, row in zip(labels, summary)])
+    ax.legend()
+    ax.grid(axis='y', alpha=0.3)
+    
+    fig.tight_layout()
+    return fig
+
+# Formato da chave de cada granularidade de product_stats.trend_summary
+TREND_FORMATS = {
+    'hour': ('%Y-%m-%d %H', 'hora', 'por Hora'),
+    'day': ('%Y-%m-%d', 'dia', 'Diária'),
+}
+
+@traced
+def create_trend_chart(points, granularity='day'):
+    """
+    Evolução das médias de produto e entrega, com o volume de feedbacks.
+    
+    Args:
+        points (list[dict]): Resultado de product_stats.trend_summary
+        granularity (str): 'hour' ou 'day', a mesma usada na consulta
+    
+    Returns:
+        matplotlib.figure.Figure (None se não houver dados)
+    """
+    if not points:
+        return None
+    
+    date_format, unit, title = TREND_FORMATS[granularity]
+    dates = pd.to_datetime([row[granularity] for row in points], format=date_format)
+    marker = 'o' if len(points) <= 60 else None
+    
+    fig, ax1 = plt.subplots(figsize=(12, 6))
+    
+    # Volume no eixo secundário, atrás das linhas
+    ax2 = ax1.twinx()
+    width = 0.8 / 24 if granularity == 'hour' else 0.8
+    ax2.bar(dates, [row['count'] for row in points], width=width, color='gray', alpha=0.2)
+    ax2.set_ylabel(f'Feedbacks por {unit}', fontsize=12)
+    ax1.set_zorder(ax2.get_zorder() + 1)
+    ax1.patch.set_visible(False)
+    
+    ax1.plot(dates, [row['avg_product'] for row in points], color='#3498db',
+             marker=marker, label='🛍️ Produto')
+    ax1.plot(dates, [row['avg_delivery'] for row in points], color='#e74c3c',
+             marker=marker, label='🚚 Entrega')
+    
+    ax1.set_ylim(0, 5.5)
+    ax1.set_ylabel('Avaliação Média', fontsize=12)
+    ax1.set_title(f'📈 Evolução {title} das Avaliações', fontsize=14, fontweight='bold')
+    ax1.legend(loc='lower left')
+    ax1.grid(axis='y', alpha=0.3)
+    fig.autofmt_xdate()
+    
+    fig.tight_layout()
+    return fig
+
+# ==================== CACHE DE GRÁFICOS ====================
+
+RENDER_LATENCY = metrics.histogram(
+    'feedsmart_chart_render_seconds', 'Tempo para renderizar um gráfico em imagem, em segundos'
+)
+
+@traced
+@RENDER_LATENCY.time()
+def render_figure(fig, fmt='png', dpi=120):
+    """
+    Renderiza uma figura para bytes e a fecha em seguida.
+    
+    Fechar a figura a remove do registro global do pyplot; sem isso, cada
+    renderização deixaria uma figura viva na memória do servidor.
+    
+    Args:
+        fig: matplotlib.figure.Figure
+        fmt (str): 'png' ou 'svg'
+        dpi (int): Resolução para formatos raster
+    
+    Returns:
+        bytes: Imagem renderizada
+    """
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+class ChartCache:
+    """
+    Cache LRU de gráficos já renderizados, limitado em bytes.
+    
+    A chave deve identificar os dados do gráfico, por exemplo
+    (nome do gráfico, usuário, versão dos dados do usuário).
+    """
+    
+    def __init__(self, max_bytes=CHART_CACHE_MAX_BYTES, max_entries=256):
+        self.lru = LRUCache(max_entries=max_entries, max_bytes=max_bytes,
+                            sizeof=lambda value: len(value[0]))
+    
+    @traced
+    def get_or_render(self, key, builder, fmt='png'):
+        """
+        Retorna o gráfico da chave, renderizando só em caso de falha no cache.
+        
+        Args:
+            key (tuple): Chave do gráfico
+            builder: Função sem argumentos que retorna a figura, ou uma tupla
+                (figura, *extras) como create_product_vs_delivery_chart;
+                figura None indica que não há gráfico
+            fmt (str): 'png' ou 'svg'
+        
+        Returns:
+            tuple: (bytes da imagem ou None, *extras)
+        """
+        def load():
+            result = builder()
+            fig, *extras = result if isinstance(result, tuple) else (result,)
+            image = render_figure(fig, fmt) if fig is not None else b''
+            return (image, *extras)
+        
+        image, *extras = self.lru.get_or_load((fmt,) + tuple(key), load)
+        return (image or None, *extras)
+    
+    def memory_bytes(self):
+        """Bytes ocupados pelas imagens em cache."""
+        return self.lru.bytes
+    
+    def stats(self):
+        """Contadores do cache (entradas, bytes, acertos, falhas...)."""
+        return self.lru.stats()
+
+# Cache compartilhado por todas as sessões do processo
+chart_cache = ChartCache()
+monitored_caches['chart'] = chart_cache
@@ -0,0 +1,221 @@
+"""
+Caches em memória do processo.
+
+LRUCache é um cache LRU genérico, limitado por número de entradas e,
+opcionalmente, por bytes. UserDataCache usa um LRUCache para guardar
+resultados de consultas por usuário: cada usuário tem uma versão de dados
+que entra na chave, e save_feedback incrementa essa versão após o commit,
+então um resultado em cache continua válido até o usuário gravar algo novo.
+
+As versões são por processo. Gravações feitas por outro processo só são
+vistas depois que a entrada expira pelo `ttl` (se configurado) ou sai do
+cache por LRU. A exceção são as reescritas em massa (importação do CSV
+legado): elas incrementam uma geração gravada no banco, e sync_generation
+descarta o cache inteiro quando a geração muda.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from feedsmart import metrics
+
+_MISSING = object()
+
+
+def estimate_size(value):
+    """Estimativa do tamanho em bytes de um valor em cache."""
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage):
+        # pandas.DataFrame / Series
+        usage = memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Cache LRU seguro para threads, com contadores de acertos e falhas.
+
+    Args:
+        max_entries (int): Quantidade máxima de entradas
+        max_bytes (int): Orçamento de memória (None = sem limite de bytes)
+        ttl (float): Validade das entradas em segundos (None = sem expiração)
+        sizeof: Função que estima o tamanho de um valor em bytes
+    """
+
+    def __init__(self, max_entries=256, max_bytes=None, ttl=None, sizeof=estimate_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Retorna o valor em cache (e o marca como usado) ou `default`."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                self._pop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        """Guarda um valor, removendo os menos usados se passar dos limites."""
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Maior que o orçamento inteiro: não vale a pena guardar
+                return
+            self._data[key] = (value, size, time.monotonic())
+            self.bytes += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        """Leitura com carga automática: chama `loader()` apenas em caso de falha."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def discard(self, predicate):
+        """Remove as entradas cuja chave satisfaz `predicate(key)`."""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                self._pop(key)
+
+    def clear(self):
+        """Esvazia o cache (os contadores são mantidos)."""
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """Contadores do cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'bytes': self.bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _pop(self, key):
+        value, size, _ = self._data.pop(key)
+        self.bytes -= size
+        return value
+
+    def __len__(self):
+        return len(self._data)
+
+
+class UserDataCache:
+    """
+    Cache de leituras por usuário com invalidação por versão.
+
+    Os valores guardados são compartilhados entre sessões: quem os recebe
+    não deve modificá-los (use .copy() antes de alterar um DataFrame).
+    """
+
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024, ttl=None):
+        self.lru = LRUCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+        self._versions = {}
+        self._base = 0
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def version(self, user_id):
+        """Versão atual dos dados do usuário."""
+        return self._base + self._versions.get(user_id, 0)
+
+    def bump(self, user_id):
+        """
+        Invalida os dados em cache do usuário.
+
+        Deve ser chamado depois do commit da gravação: uma leitura concorrente
+        que termine depois disso grava na versão antiga e nunca é servida.
+        """
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self.lru.discard(lambda key: key[0] == user_id)
+
+    def bump_all(self):
+        """Invalida os dados em cache de todos os usuários."""
+        with self._lock:
+            self._base += 1
+        self.lru.clear()
+
+    def sync_generation(self, generation):
+        """
+        Invalida tudo se a geração dos dados no banco mudou desde a última chamada.
+
+        Args:
+            generation (int): Geração lida do banco (ver user_stats.get_generation)
+        """
+        with self._lock:
+            changed = self._generation is not None and generation != self._generation
+            self._generation = generation
+        if changed:
+            self.bump_all()
+
+    def get_or_load(self, user_id, key, loader):
+        """
+        Retorna o valor de (user_id, key) na versão atual, carregando se preciso.
+
+        Args:
+            user_id (str): ID do usuário
+            key (tuple): Identifica a consulta (ex.: ('feedbacks', sort, limit, cursor))
+            loader: Função sem argumentos que executa a consulta
+        """
+        return self.lru.get_or_load((user_id, self.version(user_id)) + tuple(key), loader)
+
+    def stats(self):
+        """Contadores do LRU subjacente."""
+        return self.lru.stats()
+
+
+# Cache compartilhado por todas as sessões do processo
+user_data_cache = UserDataCache()
+
+# ==================== MÉTRICAS ====================
+
+# Caches expostos nas métricas, por nome (outros módulos podem acrescentar os seus)
+monitored_caches = {'user_data': user_data_cache}
+
+
+def _cache_samples(field):
+    return lambda: [({'cache': name}, cache.stats()[field]) for name, cache in monitored_caches.items()]
+
+
+metrics.counter('feedsmart_cache_hits_total', 'Acertos nos caches em memória',
+                labelnames=('cache',), callback=_cache_samples('hits'))
+metrics.counter('feedsmart_cache_misses_total', 'Falhas nos caches em memória',
+                labelnames=('cache',), callback=_cache_samples('misses'))
+metrics.gauge('feedsmart_cache_bytes', 'Memória estimada ocupada pelos caches',
+              labelnames=('cache',), callback=_cache_samples('bytes'))
@@ -0,0 +1,22 @@
+"""
+Formato do comentário estruturado gravado pelo chatbot.
+
+Fica em um módulo próprio, sem dependências pesadas, porque é usado tanto
+pela análise (pandas) quanto pelas migrações e pelo worker da fila.
+"""
+import re
+
+# Formato do comentário estruturado gerado pelo chatbot
+STRUCTURED_COMMENT_PATTERN = re.compile(
+    r'Produto: (?P<product>.*?) \| '
+    r'Avaliação do produto: (?P<product_rating>\d+)/5 \| '
+    r'Avaliação da entrega: (?P<delivery_rating>\d+)/5'
+)
+
+
+def format_structured_comment(product, product_rating, delivery_rating, comment):
+    """Monta o comentário estruturado gravado junto com o feedback."""
+    return (
+        f"Produto: {product} | Avaliação do produto: {product_rating}/5 | "
+        f"Avaliação da entrega: {delivery_rating}/5 | Comentário: {comment}"
+    )
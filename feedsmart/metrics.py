@@ -0,0 +1,399 @@
+"""
+Métricas operacionais do processo no formato de texto do Prometheus.
+
+Contadores e histogramas ficam em um registro do processo; cada módulo
+declara as suas métricas em nível de módulo:
+
+    FEEDBACK_SAVES = metrics.counter('feedsmart_feedback_saves_total', 'Feedbacks gravados')
+    FEEDBACK_SAVES.inc()
+
+    SAVE_LATENCY = metrics.histogram('feedsmart_save_feedback_seconds', 'Latência de save_feedback')
+    @SAVE_LATENCY.time()
+    def save_feedback(...): ...
+
+As gravações não usam lock: cada thread incrementa a sua própria cópia dos
+valores, e a coleta soma as cópias (as de threads encerradas são
+incorporadas a um total acumulado). Métricas com `callback` são lidas na
+coleta (ex.: profundidade da fila, consultada no banco).
+
+Exportação:
+    FEEDSMART_METRICS_PORT=9464  servidor HTTP local em /metrics
+    FEEDSMART_METRICS_FILE=...    arquivo reescrito a cada 15 s (textfile collector)
+
+Uso (métricas calculadas do banco, sem os contadores de outro processo):
+    python -m feedsmart.metrics
+    python -m feedsmart.metrics --file /var/lib/node_exporter/feedsmart.prom
+"""
+import argparse
+import bisect
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Limites (s) dos histogramas de latência
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Intervalo (s) entre gravações do arquivo de métricas
+FILE_INTERVAL = 15
+
+# ==================== TIPOS DE MÉTRICA ====================
+
+class _ShardLocal(threading.local):
+    """Cópia dos valores de uma métrica para a thread atual."""
+
+    def __init__(self, metric):
+        self.values = metric._new_shard()
+
+
+class _Metric:
+    """
+    Base das métricas: nome, ajuda, rótulos e valores por thread.
+
+    Args:
+        name (str): Nome da métrica
+        help (str): Descrição exibida em # HELP
+        labelnames (tuple): Nomes dos rótulos
+        callback: Função sem argumentos lida na coleta; retorna um número ou
+            uma lista de (dict de rótulos, valor)
+    """
+
+    type = 'untyped'
+
+    def __init__(self, name, help, labelnames=(), callback=None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._shards = []
+        self._retired = {}
+        self._local = _ShardLocal(self)
+
+    def _key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} espera os rótulos {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _new_shard(self):
+        values = {}
+        with self._lock:
+            self._retire_dead()
+            self._shards.append((threading.current_thread(), values))
+        return values
+
+    def _retire_dead(self):
+        # Chamado com self._lock; incorpora valores de threads encerradas
+        alive = []
+        for thread, values in self._shards:
+            if thread.is_alive():
+                alive.append((thread, values))
+            else:
+                self._merge(self._retired, values)
+        self._shards = alive
+
+    def _merge(self, target, source):
+        for key, value in list(source.items()):
+            target[key] = target.get(key, 0) + value
+
+    def _totals(self):
+        totals = {}
+        with self._lock:
+            self._retire_dead()
+            self._merge(totals, self._retired)
+            for _, values in self._shards:
+                self._merge(totals, values)
+        return totals
+
+    def _callback_values(self):
+        result = self.callback()
+        if isinstance(result, (int, float)):
+            return {(): result}
+        return {self._key(labels): value for labels, value in result}
+
+    def samples(self):
+        """Lista de (sufixo, dict de rótulos, valor) para a exposição."""
+        values = self._callback_values() if self.callback else self._totals()
+        if not values and not self.labelnames:
+            # Métrica sem rótulos aparece com zero antes da primeira observação
+            values = {(): 0}
+        return [('', dict(zip(self.labelnames, key)), value) for key, value in sorted(values.items())]
+
+
+class Counter(_Metric):
+    """Contador monotônico (ex.: feedbacks gravados)."""
+
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Soma `amount` ao contador."""
+        key = self._key(labels) if labels or self.labelnames else ()
+        values = self._local.values
+        values[key] = values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Valor instantâneo (ex.: itens na fila); normalmente lido por callback."""
+
+    type = 'gauge'
+
+    def __init__(self, name, help, labelnames=(), callback=None):
+        super().__init__(name, help, labelnames, callback)
+        self._values = {}
+
+    def set(self, value, **labels):
+        """Define o valor atual."""
+        self._values[self._key(labels) if labels or self.labelnames else ()] = value
+
+    def _totals(self):
+        return dict(self._values)
+
+
+class Histogram(_Metric):
+    """
+    Histograma com limites fixos (ex.: latências em segundos).
+
+    Args:
+        buckets (tuple): Limites superiores, em ordem crescente
+    """
+
+    type = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        """Registra uma observação."""
+        key = self._key(labels) if labels or self.labelnames else ()
+        values = self._local.values
+        counts = values.get(key)
+        if counts is None:
+            # Contagem por faixa (a última é +Inf) seguida da soma
+            counts = values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Mede a duração do bloco (ou de cada chamada, usado como decorador)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _merge(self, target, source):
+        for key, counts in list(source.items()):
+            current = target.get(key)
+            target[key] = list(counts) if current is None else [a + b for a, b in zip(current, counts)]
+
+    def samples(self):
+        totals = self._totals()
+        if not totals and not self.labelnames:
+            totals = {(): [0] * (len(self.buckets) + 1) + [0.0]}
+        samples = []
+        for key, counts in sorted(totals.items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append(('_bucket', {**labels, 'le': bound}, cumulative))
+            samples.append(('_sum', labels, counts[-1]))
+            samples.append(('_count', labels, cumulative))
+        return samples
+
+# ==================== REGISTRO ====================
+
+def _format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        if math.isnan(value):
+            return 'NaN'
+        return repr(value)
+    return str(value)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = []
+    for name, value in labels.items():
+        text = _format_value(value) if isinstance(value, float) else str(value)
+        text = text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{text}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class Registry:
+    """Conjunto de métricas exportadas juntas."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """
+        Adiciona uma métrica ao registro.
+
+        Um nome repetido substitui a métrica anterior, o que acontece quando
+        o Streamlit recarrega um módulo alterado durante o desenvolvimento.
+        """
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        """Texto no formato de exposição do Prometheus (0.0.4)."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            try:
+                samples = metric.samples()
+            except Exception:
+                # Callback indisponível (ex.: banco sem a tabela): omite a métrica
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, labels, value in samples:
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+# Registro do processo
+registry = Registry()
+
+
+def counter(name, help, labelnames=(), callback=None):
+    """Cria e registra um Counter no registro do processo."""
+    return registry.register(Counter(name, help, labelnames, callback))
+
+
+def gauge(name, help, labelnames=(), callback=None):
+    """Cria e registra um Gauge no registro do processo."""
+    return registry.register(Gauge(name, help, labelnames, callback))
+
+
+def histogram(name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+    """Cria e registra um Histogram no registro do processo."""
+    return registry.register(Histogram(name, help, labelnames, buckets))
+
+# ==================== EXPORTAÇÃO ====================
+
+_servers = {}
+_file_exporters = {}
+_export_lock = threading.Lock()
+_env_started = False
+
+
+def serve(port, addr='127.0.0.1', registry=registry):
+    """
+    Serve as métricas em http://addr:port/metrics em uma thread de fundo.
+
+    Chamadas repetidas com a mesma porta reutilizam o servidor já aberto.
+
+    Returns:
+        ThreadingHTTPServer: Servidor em execução
+    """
+    with _export_lock:
+        if port in _servers:
+            return _servers[port]
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((addr, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='feedsmart-metrics', daemon=True).start()
+        _servers[port] = server
+        return server
+
+
+def write_textfile(path, registry=registry):
+    """Grava as métricas em `path` de forma atômica (arquivo temporário + rename)."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(registry.render())
+    os.replace(tmp_path, path)
+
+
+def start_file_exporter(path, interval=FILE_INTERVAL, registry=registry):
+    """Reescreve o arquivo de métricas a cada `interval` segundos em uma thread de fundo."""
+    with _export_lock:
+        if path in _file_exporters:
+            return _file_exporters[path]
+
+        def loop():
+            while True:
+                try:
+                    write_textfile(path, registry)
+                except OSError as e:
+                    print(f"⚠️ Falha ao gravar métricas em {path}: {e}")
+                time.sleep(interval)
+
+        thread = threading.Thread(target=loop, name='feedsmart-metrics-file', daemon=True)
+        thread.start()
+        _file_exporters[path] = thread
+        return thread
+
+
+def start_from_env():
+    """
+    Inicia a exportação configurada por FEEDSMART_METRICS_PORT e/ou
+    FEEDSMART_METRICS_FILE (só na primeira chamada do processo).
+    """
+    global _env_started
+    with _export_lock:
+        if _env_started:
+            return
+        _env_started = True
+    port = os.environ.get('FEEDSMART_METRICS_PORT')
+    if port:
+        try:
+            serve(int(port), os.environ.get('FEEDSMART_METRICS_ADDR', '127.0.0.1'))
+            print(f"✅ Métricas em http://127.0.0.1:{port}/metrics")
+        except OSError as e:
+            print(f"⚠️ Não foi possível abrir a porta de métricas {port}: {e}")
+    path = os.environ.get('FEEDSMART_METRICS_FILE')
+    if path:
+        start_file_exporter(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Métricas do FeedSmart calculadas a partir do banco")
+    parser.add_argument('--db', default=None, help="Caminho do banco SQLite")
+    parser.add_argument('--file', default=None, help="Grava em arquivo em vez de imprimir")
+    args = parser.parse_args()
+
+    # Com -m este arquivo roda como __main__; as métricas ficam no módulo importado
+    from feedsmart import metrics
+    from feedsmart.storage import database
+    import feedsmart.queue.durable_queue  # noqa: F401 (registra as métricas da fila)
+
+    if args.db:
+        database.configure(args.db)
+    if args.file:
+        metrics.write_textfile(args.file)
+        print(f"✅ Métricas gravadas em {args.file}")
+    else:
+        print(metrics.registry.render(), end='')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Catálogo de produtos do chatbot e nomes legados equivalentes.
+
+O CSV legado traz os produtos digitados à mão ('camisa', 'short ', ...);
+canonical_product os converte para os nomes do catálogo, para que os
+feedbacks importados caiam nos mesmos filtros e agregados dos feedbacks do
+chatbot.
+"""
+import unicodedata
+
+# Produtos disponíveis no chatbot
+PRODUCTS = ["Camiseta", "Shorts", "Calça", "Tênis"]
+
+# Nomes legados (minúsculos e sem acento) -> produto do catálogo
+LEGACY_PRODUCT_NAMES = {
+    'camisa': "Camiseta",
+    'camiseta': "Camiseta",
+    'camisetas': "Camiseta",
+    'short': "Shorts",
+    'shorts': "Shorts",
+    'bermuda': "Shorts",
+    'calca': "Calça",
+    'calcas': "Calça",
+    'tenis': "Tênis",
+}
+
+
+def _fold(name):
+    """Minúsculas, sem acentos e sem espaços nas pontas."""
+    decomposed = unicodedata.normalize('NFKD', name.strip().casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def canonical_product(name):
+    """
+    Nome do catálogo para um produto digitado no CSV legado.
+
+    Nomes desconhecidos são mantidos (sem os espaços nas pontas), para não
+    perder a informação; vazio vira None.
+    """
+    if name is None:
+        return None
+    name = str(name).strip()
+    if not name:
+        return None
+    return LEGACY_PRODUCT_NAMES.get(_fold(name), name)
@@ -0,0 +1,7 @@
+"""
+Filas de processamento de feedbacks.
+
+    data_structures  Fila de prioridade em memória (heap indexado)
+    durable_queue    Fila persistente no SQLite, com lease/ack
+    worker           Worker em lote (python -m feedsmart.queue.worker)
+"""
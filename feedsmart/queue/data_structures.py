@@ -0,0 +1,195 @@
+import itertools
+
+
+class FeedbackQueue:
+    """
+    Implementação de uma fila de prioridade para gerenciar feedbacks.
+
+    Os itens ficam em um heap binário indexado, ordenado por
+    (prioridade, ordem de chegada): o item de maior prioridade sai primeiro e,
+    entre itens de mesma prioridade, vale o princípio FIFO (First In, First Out).
+
+    Complexidade:
+        enqueue / dequeue / remove / update_priority: O(log n)
+        peek / size / contagem por prioridade: O(1)
+    """
+
+    def __init__(self):
+        """Inicializa uma fila vazia."""
+        self.clear()
+
+    # ---------- API pública ----------
+
+    def is_empty(self):
+        """Verifica se a fila está vazia."""
+        return len(self._heap) == 0
+
+    def enqueue(self, item):
+        """
+        Adiciona um item à fila.
+
+        Args:
+            item (dict): Feedback; usa as chaves 'priority' (padrão 0) e 'id'
+        """
+        seq = next(self._counter)
+        item_id = item.get('id', seq)
+        if item_id in self._index:
+            raise ValueError(f"Item {item_id} já está na fila")
+
+        priority = item.get('priority', 0)
+        entry = [(-priority, seq), item_id, item]
+        self._heap.append(entry)
+        self._index[item_id] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+        self._counts[priority] = self._counts.get(priority, 0) + 1
+
+    def dequeue(self):
+        """Remove e retorna o item de maior prioridade (o mais antigo em caso de empate)."""
+        if self.is_empty():
+            return None
+        return self._remove_at(0)
+
+    def peek(self):
+        """Retorna o item de maior prioridade sem removê-lo."""
+        if self.is_empty():
+            return None
+        return self._heap[0][2]
+
+    def size(self):
+        """Retorna o tamanho da fila."""
+        return len(self._heap)
+
+    def clear(self):
+        """Limpa a fila."""
+        self._heap = []
+        self._index = {}
+        self._counts = {}
+        self._counter = itertools.count()
+
+    def get_all(self):
+        """Retorna todos os itens da fila, em ordem de chegada, sem removê-los."""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[0][1])]
+
+    def process_next(self):
+        """
+        Processa o próximo feedback na fila baseado na prioridade.
+        Remove e retorna o item com maior prioridade.
+        """
+        return self.dequeue()
+
+    def get_sorted_by_priority(self):
+        """Retorna itens ordenados por prioridade (maior prioridade primeiro)."""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[0])]
+
+    def remove(self, item_id):
+        """
+        Remove um item específico da fila.
+
+        Args:
+            item_id: ID do feedback
+
+        Returns:
+            dict or None: Item removido, ou None se não estiver na fila
+        """
+        position = self._index.get(item_id)
+        if position is None:
+            return None
+        return self._remove_at(position)
+
+    def update_priority(self, item_id, priority):
+        """
+        Altera a prioridade de um item mantendo sua posição de chegada.
+
+        Args:
+            item_id: ID do feedback
+            priority (int): Nova prioridade
+
+        Returns:
+            bool: True se o item estava na fila
+        """
+        position = self._index.get(item_id)
+        if position is None:
+            return False
+
+        entry = self._heap[position]
+        item = entry[2]
+        old_priority = item.get('priority', 0)
+        self._decrement(old_priority)
+        self._counts[priority] = self._counts.get(priority, 0) + 1
+
+        item['priority'] = priority
+        entry[0] = (-priority, entry[0][1])
+        self._sift_up(position)
+        self._sift_down(self._index[item_id])
+        return True
+
+    def count_by_priority(self, priority):
+        """Retorna quantos itens da fila têm a prioridade informada."""
+        return self._counts.get(priority, 0)
+
+    def priority_counts(self):
+        """Retorna um dicionário {prioridade: quantidade} dos itens na fila."""
+        return dict(self._counts)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, item_id):
+        return item_id in self._index
+
+    # ---------- Manutenção do heap ----------
+
+    def _remove_at(self, position):
+        """Remove o item na posição informada do heap."""
+        heap = self._heap
+        entry = heap[position]
+        last = heap.pop()
+        del self._index[entry[1]]
+
+        if position < len(heap):
+            # Coloca o último item no lugar do removido e reequilibra
+            heap[position] = last
+            self._index[last[1]] = position
+            self._sift_up(position)
+            self._sift_down(self._index[last[1]])
+
+        self._decrement(entry[2].get('priority', 0))
+        return entry[2]
+
+    def _decrement(self, priority):
+        remaining = self._counts.get(priority, 0) - 1
+        if remaining > 0:
+            self._counts[priority] = remaining
+        else:
+            self._counts.pop(priority, None)
+
+    def _swap(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._index[heap[i][1]] = i
+        self._index[heap[j][1]] = j
+
+    def _sift_up(self, position):
+        heap = self._heap
+        while position > 0:
+            parent = (position - 1) // 2
+            if heap[position][0] >= heap[parent][0]:
+                break
+            self._swap(position, parent)
+            position = parent
+
+    def _sift_down(self, position):
+        heap = self._heap
+        size = len(heap)
+        while True:
+            smallest = position
+            left = 2 * position + 1
+            right = left + 1
+            if left < size and heap[left][0] < heap[smallest][0]:
+                smallest = left
+            if right < size and heap[right][0] < heap[smallest][0]:
+                smallest = right
+            if smallest == position:
+                break
+            self._swap(position, smallest)
+            position = smallest
@@ -0,0 +1,343 @@
+"""
+Fila de processamento durável, compartilhada entre processos via SQLite.
+
+Cada feedback salvo ganha uma linha em `feedback_queue`. Consumidores (a
+página da fila no Streamlit ou workers independentes) reservam itens por
+*lease*: a reserva marca o item como invisível por `visibility_timeout`
+segundos e incrementa o contador de tentativas. Se o consumidor confirmar
+(ack), o item sai da fila; se travar ou desistir, o item volta a ficar
+visível quando o lease expira e pode ser reservado por outro consumidor.
+Itens que atingem `max_attempts` deixam de ser entregues e ficam como
+falhas (dead-letter) até serem removidos.
+
+Os métodos de consumo e consulta aceitam `user_id` para restringir a fila
+aos feedbacks de um usuário (a fila é compartilhada por todos).
+"""
+import os
+import socket
+import time
+
+from feedsmart import metrics
+from feedsmart.storage.database import get_manager
+from feedsmart.tracing import traced
+
+# Tempo (s) que um item reservado fica invisível para outros consumidores
+VISIBILITY_TIMEOUT = 60
+
+# Número máximo de entregas antes de o item ser considerado falho
+MAX_ATTEMPTS = 5
+
+# Colunas retornadas para cada item (fila + dados do feedback)
+_ITEM_COLUMNS = """
+    q.id AS queue_id, q.attempts, q.lease_owner, q.lease_expires_at,
+    f.id, f.user_id, f.rating, f.comment, f.timestamp, q.priority
+"""
+
+
+def create_queue_table(conn):
+    """Cria a tabela da fila e seus índices, se ainda não existirem."""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS feedback_queue (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        feedback_id TEXT UNIQUE NOT NULL,
+        priority INTEGER NOT NULL DEFAULT 0,
+        enqueued_at REAL NOT NULL,
+        lease_owner TEXT,
+        lease_expires_at REAL NOT NULL DEFAULT 0,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (feedback_id) REFERENCES feedback (id)
+    )
+    ''')
+    # Ordem de entrega: maior prioridade primeiro, FIFO dentro da prioridade
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_feedback_queue_order ON feedback_queue(priority DESC, id)"
+    )
+
+
+def _user_filter(user_id, column='feedback_id'):
+    """Condição extra (SQL, parâmetros) que restringe os itens aos feedbacks de um usuário."""
+    if user_id is None:
+        return "", ()
+    return f" AND {column} IN (SELECT id FROM feedback WHERE user_id = ?)", (user_id,)
+
+
+def default_worker_id():
+    """Identificador do consumidor atual (host:pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class DurableFeedbackQueue:
+    """
+    Fila de feedbacks persistida no SQLite com semântica de lease/ack.
+
+    Args:
+        manager: ConnectionManager (padrão: o gerenciador do processo)
+        visibility_timeout (float): Duração do lease em segundos
+        max_attempts (int): Entregas permitidas antes de desistir do item
+    """
+
+    def __init__(self, manager=None, visibility_timeout=VISIBILITY_TIMEOUT, max_attempts=MAX_ATTEMPTS):
+        self.manager = manager
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+    @property
+    def _db(self):
+        return self.manager or get_manager()
+
+    # ---------- Produção ----------
+
+    @traced
+    def enqueue(self, feedback_id, priority=0):
+        """
+        Adiciona um feedback à fila.
+
+        Quando chamado dentro de uma transação aberta na mesma thread (ex.:
+        em save_feedback), participa dela: o feedback e o item da fila são
+        gravados juntos ou nenhum dos dois.
+        """
+        with self._db.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO feedback_queue (feedback_id, priority, enqueued_at) VALUES (?, ?, ?)",
+                (feedback_id, priority, time.time())
+            )
+
+    # ---------- Consumo ----------
+
+    @traced
+    def claim(self, worker_id=None, batch_size=1, visibility_timeout=None, user_id=None):
+        """
+        Reserva atomicamente até `batch_size` itens visíveis.
+
+        Args:
+            worker_id (str): Identificador do consumidor
+            batch_size (int): Quantidade máxima de itens reservados
+            visibility_timeout (float): Duração do lease (padrão da fila)
+            user_id (str): Reserva só itens dos feedbacks deste usuário
+
+        Returns:
+            list[dict]: Itens reservados, em ordem de prioridade
+        """
+        worker_id = worker_id or default_worker_id()
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        now = time.time()
+        scope, scope_params = _user_filter(user_id)
+
+        with self._db.transaction(immediate=True) as conn:
+            claimed = conn.execute(f'''
+                UPDATE feedback_queue
+                SET lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1
+                WHERE id IN (
+                    SELECT id FROM feedback_queue
+                    WHERE lease_expires_at <= ? AND attempts < ?{scope}
+                    ORDER BY priority DESC, id
+                    LIMIT ?
+                )
+                RETURNING id
+            ''', (worker_id, now + timeout, now, self.max_attempts, *scope_params, batch_size)).fetchall()
+
+            if not claimed:
+                return []
+            ids = [row[0] for row in claimed]
+            placeholders = ','.join('?' * len(ids))
+            return self._fetch_items(conn, f"q.id IN ({placeholders})", ids)
+
+    @traced
+    def ack(self, queue_id, worker_id=None):
+        """
+        Confirma o processamento e remove o item da fila.
+
+        Returns:
+            bool: False se o lease já expirou e o item foi reservado por outro
+        """
+        worker_id = worker_id or default_worker_id()
+        with self._db.transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM feedback_queue WHERE id = ? AND lease_owner = ?",
+                (queue_id, worker_id)
+            )
+            acked = cursor.rowcount == 1
+        if acked:
+            QUEUE_PROCESSED.inc()
+        return acked
+
+    @traced
+    def release(self, queue_id, worker_id=None, delay=0):
+        """
+        Devolve um item reservado à fila (ex.: falha no processamento).
+
+        Args:
+            delay (float): Segundos até o item voltar a ficar visível
+        """
+        worker_id = worker_id or default_worker_id()
+        with self._db.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE feedback_queue SET lease_owner = NULL, lease_expires_at = ? "
+                "WHERE id = ? AND lease_owner = ?",
+                (time.time() + delay, queue_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    @traced
+    def process_next(self, worker_id=None, user_id=None):
+        """
+        Reserva e confirma o próximo item de maior prioridade.
+
+        Args:
+            user_id (str): Processa só itens dos feedbacks deste usuário
+
+        Returns:
+            dict or None: Item processado
+        """
+        items = self.claim(worker_id, batch_size=1, user_id=user_id)
+        if not items:
+            return None
+        item = items[0]
+        self.ack(item['queue_id'], item['lease_owner'])
+        return item
+
+    @traced
+    def clear(self, user_id=None):
+        """
+        Remove os itens da fila que não estão reservados por um consumidor.
+
+        Itens com lease ativo (sendo processados por um worker agora) ficam;
+        se o lease expirar, podem ser removidos por uma nova chamada.
+
+        Args:
+            user_id (str): Remove só itens dos feedbacks deste usuário
+
+        Returns:
+            int: Itens removidos
+        """
+        scope, scope_params = _user_filter(user_id)
+        with self._db.transaction() as conn:
+            cursor = conn.execute(
+                f"DELETE FROM feedback_queue WHERE lease_expires_at <= ?{scope}",
+                (time.time(), *scope_params)
+            )
+            return cursor.rowcount
+
+    # ---------- Consulta ----------
+
+    @traced
+    def size(self):
+        """
+        Quantidade total de linhas da fila, inclusive itens reservados e falhas.
+
+        Para saber quantos itens claim/process_next ainda entregariam, use
+        ready_count.
+        """
+        return self._db.execute("SELECT COUNT(*) FROM feedback_queue")[0][0]
+
+    def is_empty(self):
+        """Verifica se não há nenhuma linha na fila (nem reservada nem falha)."""
+        return not self._db.execute("SELECT 1 FROM feedback_queue LIMIT 1")
+
+    @traced
+    def ready_count(self, user_id=None):
+        """Quantidade de itens que claim entregaria agora (mesmo filtro de claim)."""
+        scope, scope_params = _user_filter(user_id)
+        return self._db.execute(
+            f"SELECT COUNT(*) FROM feedback_queue WHERE lease_expires_at <= ? AND attempts < ?{scope}",
+            (time.time(), self.max_attempts, *scope_params)
+        )[0][0]
+
+    @traced
+    def peek(self, user_id=None):
+        """Retorna o próximo item que seria entregue, sem reservá-lo."""
+        scope, scope_params = _user_filter(user_id, 'q.feedback_id')
+        with self._db.connection() as conn:
+            items = self._fetch_items(
+                conn, f"q.lease_expires_at <= ? AND q.attempts < ?{scope}",
+                (time.time(), self.max_attempts, *scope_params), limit=1
+            )
+        return items[0] if items else None
+
+    @traced
+    def get_sorted_by_priority(self, limit=None, user_id=None):
+        """Retorna os itens (de todos os estados) ordenados por prioridade (maior primeiro)."""
+        scope, scope_params = _user_filter(user_id, 'q.feedback_id')
+        with self._db.connection() as conn:
+            return self._fetch_items(conn, f"1 = 1{scope}", scope_params, limit=limit)
+
+    @traced
+    def priority_counts(self, user_id=None):
+        """Retorna um dicionário {prioridade: quantidade}."""
+        scope, scope_params = _user_filter(user_id)
+        rows = self._db.execute(
+            f"SELECT priority, COUNT(*) FROM feedback_queue WHERE 1 = 1{scope} GROUP BY priority",
+            scope_params
+        )
+        return dict(rows)
+
+    @traced
+    def count_by_priority(self, priority):
+        """Retorna quantos itens da fila têm a prioridade informada."""
+        return self._db.execute(
+            "SELECT COUNT(*) FROM feedback_queue WHERE priority = ?", (priority,)
+        )[0][0]
+
+    @traced
+    def oldest_age(self):
+        """Segundos desde a entrada do item mais antigo da fila (0 se vazia)."""
+        oldest = self._db.execute("SELECT MIN(enqueued_at) FROM feedback_queue")[0][0]
+        return max(0.0, time.time() - oldest) if oldest is not None else 0.0
+
+    @traced
+    def stats(self, user_id=None):
+        """
+        Resumo operacional: itens prontos (entregáveis), reservados e falhos
+        (tentativas esgotadas, não são mais entregues).
+        """
+        now = time.time()
+        scope, scope_params = _user_filter(user_id)
+        ready, leased, failed = self._db.execute(f'''
+            SELECT
+                COALESCE(SUM(lease_expires_at <= ? AND attempts < ?), 0),
+                COALESCE(SUM(lease_expires_at > ?), 0),
+                COALESCE(SUM(lease_expires_at <= ? AND attempts >= ?), 0)
+            FROM feedback_queue
+            WHERE 1 = 1{scope}
+        ''', (now, self.max_attempts, now, now, self.max_attempts, *scope_params))[0]
+        return {'ready': ready, 'leased': leased, 'failed': failed}
+
+    def item_state(self, item, now=None):
+        """Estado de um item retornado pela fila: 'ready', 'leased' ou 'failed'."""
+        now = time.time() if now is None else now
+        if item['lease_expires_at'] > now:
+            return 'leased'
+        return 'failed' if item['attempts'] >= self.max_attempts else 'ready'
+
+    def _fetch_items(self, conn, where, params, limit=None):
+        """Busca itens da fila, em ordem de entrega, junto com os dados do feedback."""
+        cursor = conn.execute(
+            f"SELECT {_ITEM_COLUMNS} FROM feedback_queue q "
+            f"JOIN feedback f ON f.id = q.feedback_id WHERE {where} "
+            "ORDER BY q.priority DESC, q.id LIMIT ?",
+            (*params, -1 if limit is None else limit)
+        )
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+# ==================== MÉTRICAS ====================
+# Lidas do banco a cada coleta, valem para qualquer processo que use a fila
+
+_metrics_queue = DurableFeedbackQueue()
+
+QUEUE_PROCESSED = metrics.counter(
+    'feedsmart_queue_processed_total', 'Itens da fila processados (ack) por este processo'
+)
+metrics.gauge(
+    'feedsmart_queue_depth', 'Itens na fila por prioridade', labelnames=('priority',),
+    callback=lambda: [({'priority': priority}, count)
+                      for priority, count in _metrics_queue.priority_counts().items()]
+)
+metrics.gauge(
+    'feedsmart_queue_items', 'Itens na fila por estado (ready, leased, failed)', labelnames=('state',),
+    callback=lambda: [({'state': state}, count) for state, count in _metrics_queue.stats().items()]
+)
+metrics.gauge(
+    'feedsmart_queue_oldest_item_age_seconds', 'Idade do item mais antigo da fila em segundos',
+    callback=_metrics_queue.oldest_age
+)
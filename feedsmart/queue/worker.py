@@ -0,0 +1,213 @@
+"""
+Worker de processamento em lote da fila de feedbacks.
+
+Reserva lotes da fila durável (feedsmart.queue.durable_queue), processa os itens em
+um pool de threads ou processos com concorrência limitada e confirma cada
+item individualmente. Um novo lote só é reservado quando o anterior termina,
+o que limita a quantidade de itens em voo (backpressure) a `batch_size`.
+
+Com a fila vazia, o worker soma aos agregados por produto os feedbacks
+gravados por fora de save_feedback (feedsmart.storage.product_stats).
+
+Uso:
+    python -m feedsmart.queue.worker --batch-size 64 --concurrency 8
+    python -m feedsmart.queue.worker --executor process --once
+"""
+import argparse
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from feedsmart import metrics
+from feedsmart.storage import database
+from feedsmart.comments import STRUCTURED_COMMENT_PATTERN
+from feedsmart.queue.durable_queue import DurableFeedbackQueue, default_worker_id
+from feedsmart.storage.migrations import ensure_schema
+from feedsmart.storage.product_stats import catch_up_product_stats
+
+
+def process_item(item):
+    """
+    Processamento padrão de um feedback da fila.
+
+    Interpreta o comentário estruturado e devolve um resumo do feedback.
+    Precisa ser uma função de módulo para funcionar com o pool de processos.
+
+    Args:
+        item (dict): Item reservado da fila
+
+    Returns:
+        dict: Resultado do processamento
+    """
+    result = {'id': item['id'], 'priority': item['priority'], 'rating': item['rating']}
+    match = STRUCTURED_COMMENT_PATTERN.search(item['comment'] or '')
+    if match:
+        result['product'] = match.group('product')
+        result['product_rating'] = int(match.group('product_rating'))
+        result['delivery_rating'] = int(match.group('delivery_rating'))
+    return result
+
+
+class BatchWorker:
+    """
+    Consome a fila de feedbacks em lotes.
+
+    Args:
+        queue: DurableFeedbackQueue a consumir
+        handler: Função chamada para cada item (deve ser picklable com 'process')
+        batch_size (int): Máximo de itens reservados por vez
+        concurrency (int): Threads/processos processando em paralelo
+        executor (str): 'thread' ou 'process'
+        worker_id (str): Identificador usado nos leases
+        retry_delay (float): Segundos até um item com falha voltar à fila
+    """
+
+    def __init__(self, queue=None, handler=process_item, batch_size=32, concurrency=4,
+                 executor='thread', worker_id=None, retry_delay=5.0):
+        if executor not in ('thread', 'process'):
+            raise ValueError("executor deve ser 'thread' ou 'process'")
+        self.queue = queue or DurableFeedbackQueue()
+        self.handler = handler
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.executor = executor
+        self.worker_id = worker_id or default_worker_id()
+        self.retry_delay = retry_delay
+        self.processed = 0
+        self.failed = 0
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Pede para o worker parar ao fim do lote atual."""
+        self._stop.set()
+
+    def process_batch(self, pool):
+        """
+        Reserva, processa e confirma um lote.
+
+        Returns:
+            dict or None: Estatísticas do lote, ou None se a fila estava vazia
+        """
+        items = self.queue.claim(self.worker_id, batch_size=self.batch_size)
+        if not items:
+            return None
+
+        start = time.perf_counter()
+        futures = [(item, pool.submit(self.handler, item)) for item in items]
+        ok = failed = 0
+        for item, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"⚠️ Falha ao processar {item['id']}: {e}")
+                self.queue.release(item['queue_id'], self.worker_id, delay=self.retry_delay)
+                failed += 1
+            else:
+                if self.queue.ack(item['queue_id'], self.worker_id):
+                    ok += 1
+        latency = time.perf_counter() - start
+
+        self.processed += ok
+        self.failed += failed
+        return {'items': len(items), 'ok': ok, 'failed': failed, 'latency': latency}
+
+    def catch_up_rollups(self):
+        """
+        Soma um lote de feedbacks pendentes aos agregados por produto.
+
+        Returns:
+            int: Feedbacks somados (0 se os agregados já estavam em dia)
+        """
+        with self.queue._db.transaction(immediate=True) as conn:
+            return catch_up_product_stats(conn)
+
+    def run(self, once=False, max_items=None, poll_interval=1.0):
+        """
+        Executa o laço principal do worker.
+
+        Args:
+            once (bool): Para quando a fila ficar vazia
+            max_items (int): Para depois de processar esta quantidade de itens
+            poll_interval (float): Espera entre consultas com a fila vazia
+
+        Returns:
+            dict: Totais (processados, falhas, tempo e itens/s)
+        """
+        pool_class = ThreadPoolExecutor if self.executor == 'thread' else ProcessPoolExecutor
+        started = time.perf_counter()
+        batch_number = 0
+
+        with pool_class(max_workers=self.concurrency) as pool:
+            while not self._stop.is_set():
+                if max_items is not None and self.processed >= max_items:
+                    break
+
+                stats = self.process_batch(pool)
+                if stats is None:
+                    # Fila vazia: aproveita para pôr os agregados por produto em dia
+                    rolled = self.catch_up_rollups()
+                    if rolled:
+                        print(f"📈 {rolled} feedback(s) somados aos agregados por produto")
+                        continue
+                    if once:
+                        break
+                    self._stop.wait(poll_interval)
+                    continue
+
+                batch_number += 1
+                elapsed = time.perf_counter() - started
+                print(
+                    f"Lote {batch_number}: {stats['ok']}/{stats['items']} ok, "
+                    f"{stats['failed']} falhas, latência {stats['latency'] * 1000:.1f} ms, "
+                    f"{stats['items'] / max(stats['latency'], 1e-9):.0f} itens/s no lote, "
+                    f"{self.processed / elapsed:.0f} itens/s acumulado"
+                )
+
+        elapsed = time.perf_counter() - started
+        return {
+            'processed': self.processed,
+            'failed': self.failed,
+            'elapsed': elapsed,
+            'throughput': self.processed / elapsed if elapsed else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker de processamento da fila de feedbacks")
+    parser.add_argument('--db', default=database.DB_PATH, help="Caminho do banco SQLite")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--visibility-timeout', type=float, default=None,
+                        help="Duração do lease em segundos")
+    parser.add_argument('--once', action='store_true', help="Encerra quando a fila esvaziar")
+    parser.add_argument('--max-items', type=int, default=None)
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="Serve métricas do Prometheus em http://127.0.0.1:<porta>/metrics")
+    args = parser.parse_args()
+
+    database.configure(args.db)
+    ensure_schema()
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+    metrics.start_from_env()
+    queue = DurableFeedbackQueue()
+    if args.visibility_timeout is not None:
+        queue.visibility_timeout = args.visibility_timeout
+
+    worker = BatchWorker(queue, batch_size=args.batch_size, concurrency=args.concurrency,
+                         executor=args.executor)
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+
+    print(f"🔄 Worker {worker.worker_id} consumindo {args.db} "
+          f"(lotes de {args.batch_size}, {args.concurrency} {args.executor}s)")
+    totals = worker.run(once=args.once, max_items=args.max_items, poll_interval=args.poll_interval)
+    print(f"✅ {totals['processed']} itens processados, {totals['failed']} falhas, "
+          f"{totals['elapsed']:.1f} s, {totals['throughput']:.0f} itens/s")
+
+
+if __name__ == '__main__':
+    main()
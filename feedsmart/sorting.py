@@ -0,0 +1,144 @@
+import numpy as np
+
+from feedsmart.tracing import traced
+
+# A partir deste tamanho compensa converter para NumPy
+NUMPY_THRESHOLD = 64
+
+
+def _is_missing(value):
+    """None ou NaN (avaliação ausente)."""
+    return value is None or (isinstance(value, (float, np.floating)) and np.isnan(value))
+
+
+@traced
+def merge_sort_by_rating(arr):
+    """
+    Implementação do algoritmo Merge Sort para ordenar índices com base nos valores de avaliação.
+    Retorna uma lista de índices ordenados do maior para o menor valor.
+
+    Versão iterativa (bottom-up): intercala blocos de tamanho 1, 2, 4, ...
+    alternando entre dois buffers de índices alocados uma única vez, sem
+    recursão e sem fatiar listas a cada nível.
+
+    Avaliações ausentes (None/NaN) vão para o final, na ordem original,
+    como em argsort_by_rating.
+
+    Complexidade: O(n log n)
+    Memória extra: O(n)
+    Estável: Sim (empates mantêm a ordem original)
+
+    Args:
+        arr: Lista de valores de avaliação (ou tuplas, para ordenar por várias chaves)
+
+    Returns:
+        Lista de índices ordenados (maior para menor)
+    """
+    values = list(arr)
+    # NaN não se compara com nada: fica fora da intercalação
+    missing = [i for i, value in enumerate(values) if _is_missing(value)]
+    if missing:
+        src = [i for i, value in enumerate(values) if not _is_missing(value)]
+    else:
+        src = list(range(len(values)))
+    n = len(src)
+    dst = [0] * n
+
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+
+            # Blocos já em ordem: basta copiar
+            if mid >= hi or values[src[mid - 1]] >= values[src[mid]]:
+                dst[lo:hi] = src[lo:hi]
+                continue
+
+            # Mesclar ordenando do maior para o menor (ordem decrescente)
+            i, j, k = lo, mid, lo
+            while i < mid and j < hi:
+                if values[src[i]] >= values[src[j]]:
+                    dst[k] = src[i]
+                    i += 1
+                else:
+                    dst[k] = src[j]
+                    j += 1
+                k += 1
+
+            # Adicionar elementos restantes
+            if i < mid:
+                dst[k:hi] = src[i:mid]
+            else:
+                dst[k:hi] = src[j:hi]
+
+        src, dst = dst, src
+        width *= 2
+
+    return src + missing if missing else src
+
+
+@traced
+def argsort_by_rating(arr):
+    """
+    Mesma ordenação de merge_sort_by_rating usando NumPy.
+
+    Usa argsort(kind='stable') sobre os valores negados, o que mantém a
+    ordem decrescente e a estabilidade entre empates. Avaliações ausentes
+    (None/NaN) vão para o final, na ordem original.
+
+    Args:
+        arr: Sequência numérica de avaliações
+
+    Returns:
+        numpy.ndarray: Índices ordenados (maior para menor)
+    """
+    values = np.asarray(arr, dtype=float)
+    return np.argsort(-values, kind='stable')
+
+
+@traced
+def sort_by_keys(*keys, descending=True):
+    """
+    Ordenação estável por várias chaves (ex.: avaliação e depois data).
+
+    A primeira chave é a principal; as seguintes desempatam. Chaves não
+    numéricas (como timestamps em texto ISO) são convertidas em postos
+    antes da ordenação. NaN fica depois dos demais valores da chave, nas
+    duas direções.
+
+    Args:
+        *keys: Sequências de mesmo tamanho
+        descending (bool): Ordem decrescente (padrão) ou crescente
+
+    Returns:
+        numpy.ndarray: Índices ordenados
+    """
+    ranks = []
+    for key in keys:
+        values = np.asarray(key)
+        if values.dtype.kind not in 'biuf':
+            values = np.unique(values, return_inverse=True)[1]
+        elif values.dtype.kind != 'f':
+            # Inteiros sem sinal/booleanos não podem ser negados diretamente
+            values = values.astype(np.int64)
+        ranks.append(-values if descending else values)
+
+    # np.lexsort usa a última chave como principal
+    return np.lexsort(ranks[::-1])
+
+
+@traced
+def sort_indices_by_rating(arr):
+    """
+    Escolhe a implementação mais rápida para o tamanho da entrada.
+
+    Args:
+        arr: Sequência de avaliações
+
+    Returns:
+        Lista de índices ordenados (maior para menor)
+    """
+    if len(arr) < NUMPY_THRESHOLD:
+        return merge_sort_by_rating(arr)
+    return argsort_by_rating(arr).tolist()
@@ -0,0 +1,12 @@
+"""
+Persistência no SQLite (sem pandas no caminho de importação).
+
+    database    Gerenciador de conexões por thread
+    migrations  Migrações versionadas (PRAGMA user_version)
+    users       Cadastro e login
+    feedback    Gravação/leitura de feedbacks com cache
+    user_stats  Agregados por usuário
+    product_stats  Agregados por produto, por hora e por dia (análises e tendências)
+    importer    Importação em massa do CSV legado
+    exporter    Exportação em streaming para CSV/JSONL
+"""
@@ -0,0 +1,196 @@
+"""
+Gerenciador de conexões SQLite compartilhado por todo o processo.
+
+Cada thread que acessa o banco recebe uma conexão exclusiva enquanto a
+utiliza; ao terminar, a conexão volta para o pool e é reaproveitada pela
+próxima thread (o Streamlit cria uma thread nova a cada rerun). Manter as
+conexões abertas preserva o cache de comandos preparados do sqlite3 e as
+PRAGMAs de desempenho configuradas na abertura.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+
+# Caminho padrão do banco (pode ser sobrescrito pela variável de ambiente)
+DB_PATH = os.environ.get('FEEDSMART_DB', 'feedback_app.db')
+
+# PRAGMAs aplicadas em toda conexão nova
+PRAGMAS = {
+    'journal_mode': 'WAL',        # Leitores não bloqueiam escritores
+    'synchronous': 'NORMAL',      # Seguro com WAL e bem mais rápido que FULL
+    'cache_size': -20000,         # ~20 MB de cache de páginas por conexão
+    'mmap_size': 268435456,       # 256 MB de leitura via mmap
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,         # Espera até 5 s por um lock antes de falhar
+}
+
+# Quantidade de comandos preparados mantidos em cache por conexão
+CACHED_STATEMENTS = 256
+
+class ConnectionManager:
+    """
+    Pool de conexões SQLite com uma conexão por thread ativa.
+
+    Args:
+        db_path (str): Caminho do arquivo do banco ou ':memory:' (banco
+            descartável em um arquivo temporário, removido em close_all)
+        max_idle (int): Máximo de conexões ociosas mantidas no pool
+        pragmas (dict): PRAGMAs aplicadas em cada conexão nova
+    """
+
+    def __init__(self, db_path=DB_PATH, max_idle=8, pragmas=None):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self.pragmas = dict(PRAGMAS if pragmas is None else pragmas)
+        self._idle = []
+        self._all = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._temp_dir = None
+
+        if db_path == ':memory:':
+            # Um banco em memória compartilhado (cache=shared) entre as conexões
+            # do pool não tem WAL e responde conflitos de escrita com
+            # SQLITE_LOCKED, que o busy_timeout não repete. Um arquivo
+            # temporário tem o mesmo comportamento concorrente de um banco real.
+            self._temp_dir = tempfile.mkdtemp(prefix='feedsmart_')
+            self.db_path = os.path.join(self._temp_dir, 'feedback.db')
+
+    def _open(self):
+        """Abre uma nova conexão e aplica as PRAGMAs configuradas."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=CACHED_STATEMENTS)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._lock:
+            self._all.add(conn)
+        return conn
+
+    def _acquire(self):
+        """Retira uma conexão ociosa do pool ou abre uma nova."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._open()
+
+    def _release(self, conn):
+        """Devolve a conexão ao pool (ou fecha, se o pool estiver cheio)."""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+            self._all.discard(conn)
+        conn.close()
+
+    @contextmanager
+    def connection(self):
+        """
+        Fornece a conexão da thread atual.
+
+        Chamadas aninhadas na mesma thread recebem a mesma conexão, de forma
+        que funções auxiliares possam participar da transação de quem chamou.
+        """
+        local = self._local
+        if getattr(local, 'depth', 0):
+            local.depth += 1
+            try:
+                yield local.conn
+            finally:
+                local.depth -= 1
+            return
+
+        conn = self._acquire()
+        local.conn = conn
+        local.depth = 1
+        try:
+            yield conn
+        finally:
+            local.depth = 0
+            local.conn = None
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Executa um bloco dentro de uma transação.
+
+        Faz commit ao final do bloco mais externo e rollback em caso de erro.
+
+        Args:
+            immediate (bool): Obtém o lock de escrita já no início (BEGIN
+                IMMEDIATE), evitando conflito de snapshot em leituras seguidas
+                de escrita concorrentes
+        """
+        with self.connection() as conn:
+            local = self._local
+            if getattr(local, 'tx_depth', 0):
+                local.tx_depth += 1
+                try:
+                    yield conn
+                finally:
+                    local.tx_depth -= 1
+                return
+
+            local.tx_depth = 1
+            try:
+                if immediate and not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                local.tx_depth = 0
+
+    def execute(self, sql, params=()):
+        """Executa uma consulta de leitura e retorna todas as linhas."""
+        with self.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def close_all(self):
+        """Fecha todas as conexões abertas pelo gerenciador."""
+        with self._lock:
+            conns = list(self._all)
+            self._all.clear()
+            self._idle.clear()
+        for conn in conns:
+            conn.close()
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_manager():
+    """Retorna o gerenciador de conexões do processo, criando-o se necessário."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ConnectionManager()
+    return _manager
+
+
+def configure(db_path=DB_PATH, **kwargs):
+    """
+    Substitui o gerenciador do processo por um novo apontando para db_path.
+
+    Útil para testes e benchmarks (por exemplo, db_path=':memory:' para um
+    banco descartável).
+    """
+    global _manager
+    with _manager_lock:
+        old = _manager
+        _manager = ConnectionManager(db_path, **kwargs)
+    if old is not None:
+        old.close_all()
+    return _manager
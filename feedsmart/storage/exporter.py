@@ -0,0 +1,264 @@
+"""
+Exportação em streaming dos feedbacks do SQLite para CSV ou JSONL.
+
+As linhas são lidas com fetchmany e escritas direto no arquivo de destino
+(opcionalmente compactado com gzip), então a memória usada não depende do
+tamanho da exportação. Filtros: usuário, intervalo de datas e produto.
+
+Uso:
+    python -m feedsmart.storage.exporter feedbacks.csv
+    python -m feedsmart.storage.exporter feedbacks.jsonl.gz --user USER_ID --start 2025-01-01 --end 2025-01-31
+    python -m feedsmart.storage.exporter - --format jsonl --product Camiseta > feedbacks.jsonl
+"""
+import argparse
+import csv
+import datetime
+import gzip
+import io
+import json
+import sys
+import tempfile
+import time
+
+from feedsmart.storage import database
+from feedsmart.tracing import traced
+
+# Colunas exportadas, na ordem do arquivo
+EXPORT_COLUMNS = [
+    'id', 'user_id', 'timestamp', 'rating', 'priority',
+    'product', 'product_rating', 'delivery_rating', 'comment'
+]
+
+# Tipos MIME de cada formato
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+# Linhas lidas do banco por vez
+FETCH_SIZE = 1000
+
+# Compressão gzip: nível padrão do utilitário gzip (9 é bem mais lento)
+GZIP_LEVEL = 6
+GZIP_BUFFER_SIZE = 64 * 1024
+
+# Acima deste tamanho o arquivo temporário da exportação vai para o disco
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+def _parse_date(value):
+    """Aceita date, datetime ou texto ISO ('AAAA-MM-DD' ou com hora)."""
+    if isinstance(value, str):
+        return datetime.datetime.fromisoformat(value) if len(value) > 10 else datetime.date.fromisoformat(value)
+    return value
+
+
+def _start_condition(value):
+    """Condição SQL do início do intervalo."""
+    value = _parse_date(value)
+    if isinstance(value, datetime.datetime):
+        return "timestamp >= ?", value.strftime("%Y-%m-%d %H:%M:%S")
+    return "timestamp >= ?", value.strftime("%Y-%m-%d")
+
+
+def _end_condition(value):
+    """Condição SQL do fim do intervalo; uma data sem hora inclui o dia inteiro."""
+    value = _parse_date(value)
+    if isinstance(value, datetime.datetime):
+        return "timestamp <= ?", value.strftime("%Y-%m-%d %H:%M:%S")
+    return "timestamp < ?", (value + datetime.timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def build_export_query(user_id=None, start=None, end=None, product=None):
+    """
+    Monta a consulta de exportação com os filtros informados.
+
+    Args:
+        user_id (str): Apenas feedbacks deste usuário
+        start: Data/hora inicial (date, datetime ou texto ISO)
+        end: Data/hora final; uma data sem hora inclui o dia inteiro
+        product (str): Apenas feedbacks deste produto
+
+    Returns:
+        tuple: (sql, params)
+    """
+    conditions = []
+    params = []
+    if user_id is not None:
+        conditions.append("user_id = ?")
+        params.append(user_id)
+    for value, condition in ((start, _start_condition), (end, _end_condition)):
+        if value is not None:
+            sql, param = condition(value)
+            conditions.append(sql)
+            params.append(param)
+    if product is not None:
+        conditions.append("product = ?")
+        params.append(product)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    sql = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM feedback {where} ORDER BY timestamp, rowid"
+    return sql, params
+
+
+def iter_feedback_rows(user_id=None, start=None, end=None, product=None,
+                       fetch_size=FETCH_SIZE, manager=None):
+    """
+    Gera as linhas da exportação em blocos de `fetch_size`.
+
+    Yields:
+        tuple: Valores na ordem de EXPORT_COLUMNS
+    """
+    sql, params = build_export_query(user_id, start, end, product)
+    with (manager or database.get_manager()).connection() as conn:
+        cursor = conn.execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+
+class _Counter:
+    """Iterador que conta os itens consumidos."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+def write_rows(rows, fileobj, fmt='csv'):
+    """
+    Escreve as linhas em um arquivo binário já aberto.
+
+    Args:
+        rows: Iterável de tuplas na ordem de EXPORT_COLUMNS
+        fileobj: Arquivo binário de destino (não é fechado)
+        fmt (str): 'csv' ou 'jsonl'
+
+    Returns:
+        int: Quantidade de linhas escritas
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato inválido: {fmt} (use {', '.join(EXPORT_FORMATS)})")
+
+    counter = _Counter(rows)
+    text = io.TextIOWrapper(fileobj, encoding='utf-8', newline='', write_through=False)
+    try:
+        if fmt == 'csv':
+            writer = csv.writer(text)
+            writer.writerow(EXPORT_COLUMNS)
+            writer.writerows(counter)
+        else:
+            text.writelines(
+                json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + '\n'
+                for row in counter
+            )
+        text.flush()
+    finally:
+        # Solta o arquivo subjacente sem fechá-lo
+        text.detach()
+    return counter.count
+
+
+@traced
+def export_feedback(fileobj, fmt='csv', compress=False, **filters):
+    """
+    Exporta os feedbacks filtrados para um arquivo binário já aberto.
+
+    Args:
+        fileobj: Arquivo binário de destino (não é fechado)
+        fmt (str): 'csv' ou 'jsonl'
+        compress (bool): Compactar com gzip
+        **filters: user_id, start, end, product (ver build_export_query)
+
+    Returns:
+        int: Quantidade de linhas exportadas
+    """
+    rows = iter_feedback_rows(**filters)
+    if not compress:
+        return write_rows(rows, fileobj, fmt)
+    with gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=GZIP_LEVEL) as gz:
+        # GzipFile comprime a cada write: agrupar as escritas em blocos maiores
+        buffered = io.BufferedWriter(gz, buffer_size=GZIP_BUFFER_SIZE)
+        count = write_rows(rows, buffered, fmt)
+        buffered.flush()
+        buffered.detach()
+        return count
+
+
+def export_to_spooled_file(fmt='csv', compress=False, max_memory=SPOOL_MAX_MEMORY, **filters):
+    """
+    Exporta para um arquivo temporário que só vai para o disco se passar de `max_memory`.
+
+    Returns:
+        tempfile.SpooledTemporaryFile: Posicionado no início; quem chama deve fechá-lo
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=max_memory, mode='w+b')
+    try:
+        export_feedback(spooled, fmt, compress, **filters)
+    except BaseException:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled
+
+
+def export_bytes(fmt='csv', compress=False, **filters):
+    """Conteúdo da exportação em bytes (para o botão de download do Streamlit)."""
+    with export_to_spooled_file(fmt, compress, **filters) as spooled:
+        return spooled.read()
+
+
+def export_filename(fmt='csv', compress=False, prefix='feedbacks'):
+    """Nome de arquivo sugerido para a exportação."""
+    return f"{prefix}.{fmt}{'.gz' if compress else ''}"
+
+
+def export_mimetype(fmt='csv', compress=False):
+    """Tipo MIME do arquivo exportado."""
+    return 'application/gzip' if compress else EXPORT_FORMATS[fmt]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta feedbacks do SQLite para CSV ou JSONL")
+    parser.add_argument('output', help="Arquivo de destino ('-' para a saída padrão)")
+    parser.add_argument('--db', default=database.DB_PATH, help="Caminho do banco SQLite")
+    parser.add_argument('--format', choices=list(EXPORT_FORMATS), default=None,
+                        help="Formato (padrão: pela extensão do arquivo, senão csv)")
+    parser.add_argument('--gzip', action='store_true', help="Compactar (automático para .gz)")
+    parser.add_argument('--user', default=None, help="Apenas feedbacks deste usuário")
+    parser.add_argument('--start', default=None, help="Data inicial (AAAA-MM-DD)")
+    parser.add_argument('--end', default=None, help="Data final, inclusive (AAAA-MM-DD)")
+    parser.add_argument('--product', default=None, help="Apenas feedbacks deste produto")
+    args = parser.parse_args()
+
+    name = args.output.lower()
+    compress = args.gzip or name.endswith('.gz')
+    fmt = args.format or ('jsonl' if name.removesuffix('.gz').endswith(('.jsonl', '.ndjson')) else 'csv')
+    filters = {'user_id': args.user, 'start': args.start, 'end': args.end, 'product': args.product}
+
+    database.configure(args.db)
+    started = time.perf_counter()
+    if args.output == '-':
+        count = export_feedback(sys.stdout.buffer, fmt, compress, **filters)
+        sys.stdout.buffer.flush()
+    else:
+        with open(args.output, 'wb') as f:
+            count = export_feedback(f, fmt, compress, **filters)
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ {count} feedbacks exportados ({fmt}{', gzip' if compress else ''}) em {elapsed:.1f} s "
+          f"({count / elapsed if elapsed else 0:.0f} linhas/s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Gravação e leitura dos feedbacks no SQLite.
+
+save_feedback grava o feedback, atualiza os agregados do usuário e coloca o
+item na fila de processamento na mesma transação. As leituras por usuário
+passam pelo cache de leitura (feedsmart.cache.user_data_cache), invalidado a
+cada gravação. O pandas só é importado na primeira consulta que devolve um
+DataFrame.
+"""
+import datetime
+import uuid
+
+from feedsmart import metrics
+from feedsmart.cache import user_data_cache
+from feedsmart.queue.durable_queue import DurableFeedbackQueue
+from feedsmart.storage.database import get_manager
+from feedsmart.storage import product_stats
+from feedsmart.storage.user_stats import get_generation, get_user_stats, record_feedback
+from feedsmart.tracing import traced
+
+# Fila de processamento persistente, compartilhada por todas as sessões
+feedback_queue = DurableFeedbackQueue()
+
+FEEDBACK_SAVES = metrics.counter('feedsmart_feedback_saves_total', 'Feedbacks gravados')
+SAVE_LATENCY = metrics.histogram('feedsmart_save_feedback_seconds', 'Latência de save_feedback em segundos')
+READ_LATENCY = metrics.histogram(
+    'feedsmart_get_user_feedbacks_seconds', 'Latência de get_user_feedbacks (com cache) em segundos'
+)
+
+
+@traced
+@SAVE_LATENCY.time()
+def save_feedback(user_id, rating, comment, product=None, product_rating=None, delivery_rating=None):
+    """
+    Salva um feedback no banco de dados, atualiza os agregados do usuário e
+    do produto e adiciona na fila de processamento (tudo na mesma transação).
+    
+    Args:
+        user_id (str): ID do usuário
+        rating (float): Avaliação média
+        comment (str): Comentário do feedback
+        product (str): Produto avaliado
+        product_rating (int): Nota do produto (0-5)
+        delivery_rating (int): Nota da entrega (0-5)
+        
+    Returns:
+        str: ID do feedback criado
+    """
+    feedback_id = str(uuid.uuid4())
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    # Calcular prioridade baseada na avaliação (avaliações baixas = prioridade alta)
+    priority = 6 - int(rating)  # Avaliação 1 = prioridade 5, Avaliação 5 = prioridade 1
+    
+    with get_manager().transaction() as conn:
+        cursor = conn.execute(
+            "INSERT INTO feedback (id, user_id, rating, comment, timestamp, priority, "
+            "product, product_rating, delivery_rating) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (feedback_id, user_id, rating, comment, timestamp, priority,
+             product, product_rating, delivery_rating)
+        )
+        
+        # Atualizar agregados do usuário
+        record_feedback(conn, user_id, rating, timestamp, product_rating, delivery_rating)
+        # Agregados por hora/dia (ou fica para o catch-up, se houver feedbacks pendentes)
+        product_stats.record_feedback(
+            conn, cursor.lastrowid, timestamp, product, rating, product_rating, delivery_rating
+        )
+        
+        # Adicionar à fila de processamento
+        feedback_queue.enqueue(feedback_id, priority)
+    
+    # Invalidar leituras em cache do usuário (depois do commit)
+    user_data_cache.bump(user_id)
+    FEEDBACK_SAVES.inc()
+    
+    return feedback_id
+
+# Chaves de ordenação (todas decrescentes); rowid desempata registros iguais
+SORT_KEYS = {
+    'timestamp': ('timestamp', 'rowid'),
+    'rating': ('rating', 'timestamp', 'rowid'),
+}
+
+@traced
+@READ_LATENCY.time()
+def get_user_feedbacks(user_id, sort_method='timestamp', limit=None, cursor=None):
+    """
+    Obtém os feedbacks de um usuário, passando pelo cache de leitura.
+    
+    O resultado fica em cache por (usuário, ordenação, página) até o usuário
+    gravar um novo feedback. O DataFrame retornado é compartilhado: faça
+    .copy() antes de alterá-lo.
+    
+    Args e Returns: iguais a query_user_feedbacks.
+    """
+    return user_data_cache.get_or_load(
+        user_id, ('feedbacks', sort_method, limit, cursor),
+        lambda: query_user_feedbacks(user_id, sort_method, limit, cursor)
+    )
+
+@traced
+def sync_user_data_cache():
+    """Descarta o cache de leitura se os dados foram reescritos em massa por outro processo."""
+    with get_manager().connection() as conn:
+        user_data_cache.sync_generation(get_generation(conn))
+
+@traced
+def get_cached_user_stats(user_id):
+    """Agregados do usuário (ver user_stats), passando pelo cache de leitura."""
+    return user_data_cache.get_or_load(user_id, ('stats',), lambda: get_user_stats(user_id))
+
+@traced
+def query_user_feedbacks(user_id, sort_method='timestamp', limit=None, cursor=None):
+    """
+    Obtém os feedbacks de um usuário com ordenação e paginação feitas no SQL.
+    
+    A paginação é por keyset: o cursor guarda as chaves de ordenação do
+    último item da página, e a próxima página começa logo depois dele usando
+    os índices (user_id, timestamp) e (user_id, rating, timestamp).
+    
+    Args:
+        user_id (str): ID do usuário
+        sort_method (str): 'timestamp' ou 'rating'
+        limit (int): Tamanho da página (None = todos os feedbacks)
+        cursor (tuple): Cursor retornado pela página anterior
+        
+    Returns:
+        tuple: (pandas.DataFrame, next_cursor) — next_cursor é None na última página
+    """
+    keys = SORT_KEYS.get(sort_method, SORT_KEYS['timestamp'])
+    
+    query = "SELECT *, rowid AS row_id FROM feedback WHERE user_id = ?"
+    params = [user_id]
+    if cursor is not None:
+        query += f" AND ({', '.join(keys)}) < ({', '.join('?' * len(keys))})"
+        params.extend(cursor)
+    query += " ORDER BY " + ", ".join(f"{key} DESC" for key in keys)
+    if limit is not None:
+        # Um item a mais indica se existe próxima página
+        query += " LIMIT ?"
+        params.append(limit + 1)
+    
+    import pandas as pd
+    
+    with get_manager().connection() as conn:
+        df = pd.read_sql_query(query, conn, params=params)
+    
+    next_cursor = None
+    if limit is not None and len(df) > limit:
+        df = df.iloc[:limit]
+        columns = ['row_id' if key == 'rowid' else key for key in keys]
+        # tolist() por coluna devolve tipos nativos, que o sqlite3 aceita como parâmetro
+        next_cursor = tuple(df[column].iloc[-1:].tolist()[0] for column in columns)
+    
+    return df.drop(columns='row_id'), next_cursor
@@ -0,0 +1,311 @@
+"""
+Importação em massa do CSV legado (data/feedback_data.csv) para o SQLite.
+
+O CSV é lido em blocos (iter_feedback_chunks) e cada linha vira um feedback
+do usuário com aquele e-mail; e-mails ainda sem usuário ganham um usuário
+novo (sem login/senha). As inserções usam executemany em transações grandes
+e os índices secundários de `feedback` são removidos durante a carga e
+recriados no final, o que é bem mais rápido do que mantê-los linha a linha.
+
+Os nomes de produto digitados no CSV ('camisa', 'short', ...) são convertidos
+para o catálogo do chatbot (feedsmart.products), para que os feedbacks
+importados entrem nos filtros e agregados do produto certo.
+
+Os IDs dos feedbacks são derivados de todas as colunas da linha, então
+importar o mesmo arquivo de novo não duplica registros (e linhas idênticas
+no CSV viram um único feedback). Linhas sem nenhuma nota são
+ignoradas (e contadas em 'skipped'). Feedbacks importados não entram na fila
+de processamento; no fim, os agregados por usuário são recalculados e os
+feedbacks novos são somados aos agregados por produto (catch-up), também
+quando a importação é interrompida no meio. O cache de leitura dos usuários
+afetados é invalidado neste processo, e a geração dos dados no banco é
+incrementada para que os processos do app descartem os seus.
+Bancos novos ou desatualizados são migrados antes da importação.
+
+Uso:
+    python -m feedsmart.storage.importer data/feedback_data.csv
+    python -m feedsmart.storage.importer legado.csv --db feedback_app.db --chunksize 200000
+"""
+import argparse
+import hashlib
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from feedsmart.cache import user_data_cache
+from feedsmart.products import canonical_product
+from feedsmart.storage import database
+from feedsmart.analytics.data_processing import (
+    CHUNK_SIZE,
+    CSV_COLUMNS,
+    DATA_FILE,
+    RATING_COLUMNS,
+    average_rating,
+    iter_feedback_chunks,
+)
+from feedsmart.storage.migrations import ensure_schema
+from feedsmart.storage.product_stats import catch_up
+from feedsmart.storage.user_stats import bump_generation, rebuild_stats
+from feedsmart.tracing import traced
+
+# Linhas gravadas por transação
+COMMIT_EVERY = 500000
+
+
+def _objects(series):
+    """Converte uma coluna em array de objetos Python, com None no lugar de valores ausentes."""
+    return series.astype(object).to_numpy(dtype=object, na_value=None)
+
+
+class FeedbackImporter:
+    """
+    Importa blocos do CSV legado para as tabelas `users` e `feedback`.
+
+    Args:
+        manager: ConnectionManager (padrão: o gerenciador do processo)
+        commit_every (int): Linhas por transação
+    """
+
+    def __init__(self, manager=None, commit_every=COMMIT_EVERY):
+        self.manager = manager or database.get_manager()
+        self.commit_every = commit_every
+        self.user_ids = {}
+        self.rows = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.users_created = 0
+        self.touched_users = set()
+
+    def load_users(self, conn):
+        """Carrega o mapa e-mail -> ID dos usuários já cadastrados."""
+        for user_id, email in conn.execute(
+            "SELECT id, LOWER(TRIM(email)) FROM users WHERE email IS NOT NULL ORDER BY rowid"
+        ):
+            self.user_ids.setdefault(email, user_id)
+
+    def resolve_users(self, conn, chunk):
+        """
+        Mapeia os e-mails do bloco para IDs de usuário, criando os que faltam.
+
+        Returns:
+            pandas.Series: user_id de cada linha
+        """
+        emails = chunk['email'].fillna('').str.strip().str.lower()
+        pending = [email for email in emails.unique() if email not in self.user_ids]
+
+        # E-mails novos: um usuário por e-mail, com o primeiro nome encontrado
+        names = chunk['nome'].groupby(emails, sort=False).first()
+        new_users = []
+        for email in pending:
+            user_id = str(uuid.uuid4())
+            self.user_ids[email] = user_id
+            name = names.get(email)
+            new_users.append((user_id, None if pd.isna(name) else name, email or None))
+        conn.executemany("INSERT INTO users (id, name, email) VALUES (?, ?, ?)", new_users)
+        self.users_created += len(new_users)
+
+        return emails.map(self.user_ids)
+
+    def import_chunk(self, conn, chunk):
+        """
+        Grava um bloco na transação aberta.
+
+        Returns:
+            int: Linhas lidas do bloco
+        """
+        if chunk.empty:
+            return 0
+        rows = len(chunk)
+        # Sem nenhuma nota não há avaliação a gravar (rating NULL quebraria os agregados)
+        chunk = chunk[chunk[RATING_COLUMNS].notna().any(axis=1)]
+        self.skipped += rows - len(chunk)
+        self.rows += rows
+        if chunk.empty:
+            return rows
+        user_ids = self.resolve_users(conn, chunk)
+        self.touched_users.update(user_ids.unique())
+        cursor = conn.executemany(
+            "INSERT OR IGNORE INTO feedback (id, user_id, rating, comment, timestamp, "
+            "priority, product, product_rating, delivery_rating) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self.feedback_rows(chunk, user_ids)
+        )
+        self.inserted += cursor.rowcount
+        return rows
+
+    def feedback_rows(self, chunk, user_ids):
+        """Converte um bloco do CSV nas tuplas de INSERT da tabela `feedback`."""
+        # Nota geral: média das três notas do CSV (produto, entrega e atendimento),
+        # a mesma avaliacao_media das análises do CSV. save_feedback recebe do
+        # chatbot a média de produto e entrega, pois lá não há nota de atendimento.
+        rating = average_rating(chunk)
+        # Prioridade com a fórmula de save_feedback: avaliações baixas = prioridade alta
+        priority = (6 - np.floor(rating)).astype(int)
+
+        # Nomes do catálogo; cada nome distinto do bloco é convertido uma vez
+        names = chunk['produto'].astype('string')
+        product = names.map({name: canonical_product(name) for name in names.dropna().unique()})
+        product_rating = chunk['avaliacao_produto']
+        delivery_rating = chunk['avaliacao_entrega']
+        comment = (
+            "Produto: " + product.fillna('')
+            + " | Avaliação do produto: " + product_rating.astype('string').fillna('')
+            + "/5 | Avaliação da entrega: " + delivery_rating.astype('string').fillna('')
+            + "/5 | Comentário: " + chunk['comentario'].fillna('')
+        )
+        # Mesmo formato de data de save_feedback
+        timestamp = chunk['data'].dt.strftime("%Y-%m-%d %H:%M:%S")
+
+        # ID determinístico a partir de todas as colunas de origem: reimportar a
+        # mesma linha não cria duplicata, e linhas que diferem em qualquer
+        # coluna (inclusive a nota de atendimento, que não é gravada) não colidem
+        keys = timestamp.fillna('')
+        for column in CSV_COLUMNS:
+            if column != 'data':
+                keys = keys + '\x1f' + chunk[column].astype('string').fillna('')
+        keys = keys.to_numpy(dtype=object)
+        ids = [hashlib.blake2b(key.encode(), digest_size=16).hexdigest() for key in keys]
+
+        rows = list(zip(
+            ids,
+            _objects(user_ids),
+            _objects(rating.round(2)),
+            _objects(comment),
+            _objects(timestamp),
+            priority.tolist(),
+            _objects(product),
+            _objects(product_rating),
+            _objects(delivery_rating),
+        ))
+        # Inserir em ordem de chave mantém as escritas no índice da PK localizadas
+        rows.sort()
+        return rows
+
+    @traced
+    def import_chunks(self, chunks, progress=None):
+        """
+        Importa blocos (DataFrames com as colunas do CSV).
+
+        Args:
+            chunks: Iterável de DataFrames
+            progress: Função chamada após cada commit com o total de linhas lidas
+
+        Returns:
+            dict: Linhas lidas, feedbacks inseridos, linhas sem nota ignoradas,
+            usuários criados, tempo e linhas/s
+        """
+        started = time.perf_counter()
+        ensure_schema(self.manager)
+        with self.manager.transaction() as conn:
+            self.load_users(conn)
+            indexes = self._drop_feedback_indexes(conn)
+
+        try:
+            chunks = iter(chunks)
+            finished = False
+            while not finished:
+                # Uma transação a cada `commit_every` linhas
+                with self.manager.transaction(immediate=True) as conn:
+                    pending = 0
+                    for chunk in chunks:
+                        pending += self.import_chunk(conn, chunk)
+                        if pending >= self.commit_every:
+                            break
+                    else:
+                        finished = True
+                if progress and pending:
+                    progress(self.rows)
+        finally:
+            with self.manager.transaction() as conn:
+                self._create_indexes(conn, indexes)
+            # Também após uma falha: os blocos já gravados entram nos agregados
+            self._refresh_aggregates()
+
+        elapsed = time.perf_counter() - started
+        return {
+            'rows': self.rows,
+            'inserted': self.inserted,
+            'skipped': self.skipped,
+            'users_created': self.users_created,
+            'elapsed': elapsed,
+            'rows_per_second': self.rows / elapsed if elapsed else 0.0,
+        }
+
+    def _refresh_aggregates(self):
+        """
+        Recalcula os agregados por usuário, soma os feedbacks novos aos
+        agregados por produto e invalida os caches de leitura.
+        """
+        try:
+            with self.manager.transaction() as conn:
+                rebuild_stats(conn)
+                bump_generation(conn)
+        finally:
+            # Depois do commit, como em save_feedback
+            for user_id in self.touched_users:
+                user_data_cache.bump(user_id)
+            # Só os feedbacks novos (depois do marcador) entram nos agregados por produto
+            catch_up(self.manager)
+
+    def _drop_feedback_indexes(self, conn):
+        """Remove os índices secundários de `feedback` e devolve o SQL para recriá-los."""
+        indexes = conn.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = 'feedback' AND sql IS NOT NULL"
+        ).fetchall()
+        for name, _ in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+        return [sql for _, sql in indexes]
+
+    def _create_indexes(self, conn, indexes):
+        """Recria (de uma vez, já com os dados carregados) os índices removidos."""
+        for sql in indexes:
+            conn.execute(sql)
+
+
+def import_csv(path=None, chunksize=CHUNK_SIZE, commit_every=COMMIT_EVERY, manager=None, progress=None):
+    """
+    Importa um CSV legado para o SQLite.
+
+    Args:
+        path (str): Arquivo CSV (padrão: DATA_FILE)
+        chunksize (int): Linhas lidas por bloco
+        commit_every (int): Linhas por transação
+        manager: ConnectionManager (padrão: o gerenciador do processo)
+        progress: Função chamada após cada commit com o total de linhas lidas
+
+    Returns:
+        dict: Ver FeedbackImporter.import_chunks
+    """
+    importer = FeedbackImporter(manager, commit_every=commit_every)
+    return importer.import_chunks(iter_feedback_chunks(path, chunksize), progress=progress)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa o CSV legado de feedbacks para o SQLite")
+    parser.add_argument('csv', nargs='?', default=DATA_FILE, help="Arquivo CSV de origem")
+    parser.add_argument('--db', default=database.DB_PATH, help="Caminho do banco SQLite")
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE, help="Linhas por bloco lido")
+    parser.add_argument('--commit-every', type=int, default=COMMIT_EVERY, help="Linhas por transação")
+    args = parser.parse_args()
+
+    database.configure(args.db)
+    started = time.perf_counter()
+
+    def progress(rows):
+        elapsed = time.perf_counter() - started
+        print(f"  {rows} linhas, {rows / elapsed:.0f} linhas/s")
+
+    print(f"📥 Importando {args.csv} para {args.db}")
+    totals = import_csv(args.csv, args.chunksize, args.commit_every, progress=progress)
+    print(f"✅ {totals['rows']} linhas lidas, {totals['inserted']} feedbacks inseridos, "
+          f"{totals['users_created']} usuários criados em {totals['elapsed']:.1f} s "
+          f"({totals['rows_per_second']:.0f} linhas/s)")
+    if totals['skipped']:
+        print(f"⚠️ {totals['skipped']} linhas sem nenhuma nota foram ignoradas")
+
+
+if __name__ == '__main__':
+    main()
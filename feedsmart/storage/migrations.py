@@ -0,0 +1,237 @@
+"""
+Migrações versionadas do banco, controladas por `PRAGMA user_version`.
+
+Cada passo de MIGRATIONS leva o banco da versão anterior para a sua; os
+passos pendentes são aplicados em ordem, cada um na sua transação (BEGIN
+IMMEDIATE), junto com a atualização de user_version. Bancos criados antes
+deste módulo estão na versão 0 mas já podem ter parte do esquema, por isso
+os passos verificam o que já existe antes de alterar.
+
+ensure_schema() roda as migrações uma vez por processo e por banco; as
+chamadas seguintes (ex.: a cada rerun do Streamlit) não acessam o banco.
+
+Uso:
+    python -m feedsmart.storage.migrations            # aplica as migrações pendentes
+    python -m feedsmart.storage.migrations --status   # mostra a versão do banco
+"""
+import argparse
+import threading
+import weakref
+
+from feedsmart.storage import database
+from feedsmart.comments import STRUCTURED_COMMENT_PATTERN
+from feedsmart.queue.durable_queue import create_queue_table
+from feedsmart.storage.product_stats import (
+    create_product_stats_table,
+    create_rollup_state_table,
+    rebuild_all_product_stats,
+    rebuild_product_stats,
+)
+from feedsmart.storage.user_stats import create_generation_table, create_stats_table, rebuild_stats
+from feedsmart.tracing import traced
+
+_lock = threading.Lock()
+# Gerenciadores de conexão (um por banco) já migrados neste processo
+_migrated = weakref.WeakSet()
+
+
+def _columns(conn, table):
+    """Nomes das colunas de uma tabela."""
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def backfill_rating_columns(conn, batch_size=1000):
+    """
+    Preenche product/product_rating/delivery_rating a partir dos comentários
+    estruturados já gravados. Executado uma única vez, na migração.
+
+    Args:
+        conn: Conexão SQLite (dentro da transação da migração)
+        batch_size (int): Quantidade de linhas lidas/atualizadas por lote
+
+    Returns:
+        int: Número de feedbacks preenchidos
+    """
+    updated = 0
+    last_rowid = 0
+    while True:
+        # Paginação por rowid: cada lote é lido por completo antes do UPDATE
+        rows = conn.execute(
+            "SELECT rowid, comment FROM feedback WHERE rowid > ? AND product_rating IS NULL "
+            "ORDER BY rowid LIMIT ?",
+            (last_rowid, batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        last_rowid = rows[-1][0]
+
+        params = []
+        for rowid, comment in rows:
+            match = STRUCTURED_COMMENT_PATTERN.match(comment or '')
+            if match:
+                params.append((match.group(1), int(match.group(2)), int(match.group(3)), rowid))
+
+        conn.executemany(
+            "UPDATE feedback SET product = ?, product_rating = ?, delivery_rating = ? WHERE rowid = ?",
+            params
+        )
+        updated += len(params)
+
+    return updated
+
+
+# ==================== PASSOS ====================
+
+def _create_tables_with_priority(conn):
+    """Tabelas users e feedback, com a coluna priority."""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS users (
+        id TEXT PRIMARY KEY,
+        username TEXT UNIQUE,
+        password TEXT,
+        name TEXT,
+        email TEXT
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS feedback (
+        id TEXT PRIMARY KEY,
+        user_id TEXT,
+        rating REAL,
+        comment TEXT,
+        timestamp TEXT,
+        priority INTEGER DEFAULT 0,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+    # Bancos antigos: tabela feedback sem a coluna priority
+    if 'priority' not in _columns(conn, 'feedback'):
+        conn.execute("ALTER TABLE feedback ADD COLUMN priority INTEGER DEFAULT 0")
+        print("✅ Migração: Coluna 'priority' adicionada à tabela feedback")
+
+
+def _add_rating_columns(conn):
+    """Colunas tipadas para produto e notas (antes só no comentário)."""
+    columns = _columns(conn, 'feedback')
+    if {'product', 'product_rating', 'delivery_rating'} <= columns:
+        return
+    for name, kind in (('product', 'TEXT'), ('product_rating', 'INTEGER'), ('delivery_rating', 'INTEGER')):
+        if name not in columns:
+            conn.execute(f"ALTER TABLE feedback ADD COLUMN {name} {kind}")
+    updated = backfill_rating_columns(conn)
+    print(f"✅ Migração: Colunas de produto/notas adicionadas ({updated} feedbacks preenchidos)")
+
+
+def _create_feedback_indexes(conn):
+    """Índices de feedback, inclusive os compostos da paginação por usuário."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_user_id ON feedback(user_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON feedback(timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_priority ON feedback(priority)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_user_timestamp ON feedback(user_id, timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_user_rating ON feedback(user_id, rating, timestamp)")
+
+
+def _create_stats(conn):
+    """Agregados por usuário; na criação, preenchidos a partir do histórico."""
+    if create_stats_table(conn):
+        users = rebuild_stats(conn)
+        print(f"✅ Migração: Tabela user_feedback_stats criada ({users} usuários)")
+
+
+def _create_product_stats(conn):
+    """Agregados diários por produto; na criação, preenchidos a partir do histórico."""
+    if create_product_stats_table(conn):
+        rows = rebuild_product_stats(conn)
+        print(f"✅ Migração: Tabela product_daily_stats criada ({rows} linhas dia/produto)")
+
+
+def _create_hourly_stats(conn):
+    """Agregados por hora e marcador de agregação; recalcula tudo a partir do histórico."""
+    created = create_product_stats_table(conn, 'hour')
+    create_rollup_state_table(conn)
+    rows = rebuild_all_product_stats(conn)
+    if created:
+        print(f"✅ Migração: Tabela product_hourly_stats criada ({rows['hour']} linhas hora/produto)")
+
+
+# (versão, descrição, função) em ordem; nunca altere um passo já publicado,
+# acrescente um novo no final
+MIGRATIONS = [
+    (1, "tabelas users/feedback e coluna priority", _create_tables_with_priority),
+    (2, "colunas product/product_rating/delivery_rating", _add_rating_columns),
+    (3, "índices de feedback", _create_feedback_indexes),
+    (4, "fila de processamento persistente", create_queue_table),
+    (5, "agregados por usuário", _create_stats),
+    (6, "agregados diários por produto", _create_product_stats),
+    (7, "agregados por hora e marcador de agregação", _create_hourly_stats),
+    (8, "geração dos dados em cache", create_generation_table),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn):
+    """Versão do esquema gravada no banco."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+@traced
+def migrate(manager=None):
+    """
+    Aplica as migrações pendentes.
+
+    Cada passo roda em uma transação BEGIN IMMEDIATE e relê a versão depois
+    de obter o lock, então processos concorrentes não aplicam o mesmo passo
+    duas vezes.
+
+    Returns:
+        list[int]: Versões aplicadas por esta chamada
+    """
+    manager = manager or database.get_manager()
+    applied = []
+    for version, _, step in MIGRATIONS:
+        with manager.transaction(immediate=True) as conn:
+            if get_version(conn) >= version:
+                continue
+            step(conn)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            applied.append(version)
+    return applied
+
+
+@traced
+def ensure_schema(manager=None):
+    """
+    Garante o esquema atualizado, migrando apenas na primeira chamada do processo.
+
+    Returns:
+        list[int]: Versões aplicadas (vazia se já estava atualizado)
+    """
+    manager = manager or database.get_manager()
+    if manager in _migrated:
+        return []
+    with _lock:
+        if manager in _migrated:
+            return []
+        applied = migrate(manager)
+        _migrated.add(manager)
+        return applied
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrações do banco do FeedSmart")
+    parser.add_argument('--db', default=database.DB_PATH, help="Caminho do banco SQLite")
+    parser.add_argument('--status', action='store_true', help="Só mostra a versão atual")
+    args = parser.parse_args()
+
+    manager = database.configure(args.db)
+    if not args.status:
+        applied = migrate(manager)
+        print(f"✅ {len(applied)} migração(ões) aplicada(s)")
+    with manager.connection() as conn:
+        version = get_version(conn)
+    print(f"Versão do esquema: {version} (mais recente: {LATEST_VERSION})")
+
+
+if __name__ == '__main__':
+    main()
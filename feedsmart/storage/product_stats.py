@@ -0,0 +1,458 @@
+"""
+Agregados por produto em intervalos de tempo (hora e dia), para as análises
+globais e os gráficos de tendência.
+
+As tabelas `product_hourly_stats` e `product_daily_stats` guardam, para cada
+(intervalo, produto), contagem e somas das avaliações e os histogramas das
+notas do produto e da entrega. As consultas agregam estas tabelas (no máximo
+intervalos x produtos linhas) e nunca leem a tabela `feedback`: um gráfico de
+2 anos lê cerca de 730 dias por produto, com qualquer volume de feedbacks.
+
+Um marcador (high-water mark) em `rollup_state` guarda o maior rowid de
+`feedback` já somado aos agregados. save_feedback soma o novo feedback na
+mesma transação do INSERT quando o marcador está em dia. Feedbacks gravados
+por fora (importação, dados sintéticos, inserções manuais) ficam depois do
+marcador e são somados em lotes por catch_up_product_stats: no fim da
+importação, no worker da fila quando ele está ocioso e no próprio
+save_feedback, que alcança até SAVE_CATCH_UP_ROWS pendentes antes de somar o
+seu feedback. Assim os agregados nunca ficam parados por causa de uma
+lacuna.
+
+Feedbacks antigos sem produto ficam sob o produto '' (vazio).
+
+Uso:
+    python -m feedsmart.storage.product_stats              # totais por produto
+    python -m feedsmart.storage.product_stats --catch-up   # soma os feedbacks pendentes
+    python -m feedsmart.storage.product_stats --rebuild    # recalcula a partir do histórico
+"""
+import argparse
+
+from feedsmart.storage import database
+from feedsmart.storage.user_stats import HIST_COLUMNS, STARS, star_histogram
+from feedsmart.tracing import traced
+
+# Granularidade -> (tabela, coluna do intervalo, prefixo do timestamp 'AAAA-MM-DD HH:MM:SS')
+ROLLUPS = {
+    'hour': ('product_hourly_stats', 'hour', 13),
+    'day': ('product_daily_stats', 'day', 10),
+}
+
+# Nome do marcador em rollup_state
+WATERMARK = 'product_stats'
+
+# Feedbacks somados por transação em catch_up_product_stats
+CATCH_UP_BATCH = 500_000
+
+# Máximo de feedbacks pendentes somados dentro de um save_feedback
+SAVE_CATCH_UP_ROWS = 10_000
+
+_SUM_COLUMNS = ['feedback_count', 'rating_sum', 'product_sum', 'delivery_sum'] + HIST_COLUMNS
+
+
+def create_product_stats_table(conn, granularity='day'):
+    """
+    Cria a tabela de agregados da granularidade ('hour' ou 'day'), se necessário.
+
+    Returns:
+        bool: True se a tabela acabou de ser criada (precisa de backfill)
+    """
+    table, key, _ = ROLLUPS[granularity]
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    if exists:
+        return False
+
+    hist = ",\n        ".join(f"{col} INTEGER NOT NULL DEFAULT 0" for col in HIST_COLUMNS)
+    conn.execute(f'''
+    CREATE TABLE {table} (
+        {key} TEXT NOT NULL,
+        product TEXT NOT NULL,
+        feedback_count INTEGER NOT NULL DEFAULT 0,
+        rating_sum REAL NOT NULL DEFAULT 0,
+        product_sum REAL NOT NULL DEFAULT 0,
+        delivery_sum REAL NOT NULL DEFAULT 0,
+        {hist},
+        PRIMARY KEY ({key}, product)
+    ) WITHOUT ROWID
+    ''')
+    # A chave primária atende filtros por período; este índice, filtros por produto
+    conn.execute(f"CREATE INDEX idx_{table}_product ON {table}(product, {key})")
+    return True
+
+
+def create_rollup_state_table(conn):
+    """
+    Cria a tabela dos marcadores de agregação, se necessário.
+
+    Returns:
+        bool: True se a tabela acabou de ser criada
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollup_state'"
+    ).fetchone()
+    if exists:
+        return False
+    conn.execute('''
+    CREATE TABLE rollup_state (
+        name TEXT PRIMARY KEY,
+        last_rowid INTEGER NOT NULL
+    )
+    ''')
+    return True
+
+
+def get_watermark(conn):
+    """Maior rowid de `feedback` já somado aos agregados."""
+    row = conn.execute("SELECT last_rowid FROM rollup_state WHERE name = ?", (WATERMARK,)).fetchone()
+    return row[0] if row else 0
+
+
+def _set_watermark(conn, rowid):
+    conn.execute(
+        "INSERT INTO rollup_state (name, last_rowid) VALUES (?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET last_rowid = excluded.last_rowid",
+        (WATERMARK, rowid)
+    )
+
+
+def record_feedback(conn, rowid, timestamp, product, rating, product_rating=None, delivery_rating=None):
+    """
+    Soma um novo feedback aos agregados por hora e por dia (upsert).
+
+    Deve ser chamado na mesma transação do INSERT em `feedback` (que já
+    detém o lock de escrita). Com o marcador em dia (rowid - 1), soma o
+    feedback e avança o marcador. Com feedbacks pendentes antes dele, roda
+    catch_up_product_stats, que soma os pendentes e este feedback em ordem
+    (até SAVE_CATCH_UP_ROWS por chamada; o restante fica para a próxima).
+    Um rowid abaixo do marcador (reaproveitado depois de apagar o último
+    feedback) ainda não foi somado e é somado sem mexer no marcador.
+
+    Args:
+        rowid (int): rowid do feedback recém-inserido (cursor.lastrowid)
+
+    Returns:
+        bool: True se o feedback já está nos agregados
+    """
+    watermark = get_watermark(conn)
+    if watermark < rowid - 1:
+        catch_up_product_stats(conn, max_rows=SAVE_CATCH_UP_ROWS)
+        return get_watermark(conn) >= rowid
+    if watermark == rowid - 1:
+        _set_watermark(conn, rowid)
+
+    product_value = rating if product_rating is None else product_rating
+    delivery_value = rating if delivery_rating is None else delivery_rating
+    hist = star_histogram(product_value, delivery_value)
+
+    columns = ", ".join(HIST_COLUMNS)
+    placeholders = ", ".join("?" * len(HIST_COLUMNS))
+    increments = ",\n            ".join(
+        f"{col} = {col} + excluded.{col}" for col in _SUM_COLUMNS
+    )
+    for table, key, prefix in ROLLUPS.values():
+        conn.execute(f'''
+            INSERT INTO {table} (
+                {key}, product, feedback_count, rating_sum, product_sum, delivery_sum, {columns}
+            ) VALUES (?, ?, 1, ?, ?, ?, {placeholders})
+            ON CONFLICT({key}, product) DO UPDATE SET
+                {increments}
+        ''', (timestamp[:prefix], product or '', rating, product_value, delivery_value, *hist.values()))
+    return True
+
+
+def _aggregate_feedback(conn, granularity, first_rowid=None, last_rowid=None):
+    """
+    Soma à tabela da granularidade os feedbacks com rowid em [first_rowid, last_rowid].
+
+    Returns:
+        int: Linhas (intervalo, produto) inseridas ou atualizadas
+    """
+    table, key, prefix = ROLLUPS[granularity]
+    product = "COALESCE(product_rating, rating)"
+    delivery = "COALESCE(delivery_rating, rating)"
+    hist = ",\n            ".join(
+        [f"COALESCE(SUM({product} = {k}), 0)" for k in STARS]
+        + [f"COALESCE(SUM({delivery} = {k}), 0)" for k in STARS]
+    )
+    increments = ",\n            ".join(
+        f"{col} = {col} + excluded.{col}" for col in _SUM_COLUMNS
+    )
+
+    conditions, params = ["timestamp IS NOT NULL"], []
+    if first_rowid is not None:
+        conditions.append("rowid >= ?")
+        params.append(first_rowid)
+    if last_rowid is not None:
+        conditions.append("rowid <= ?")
+        params.append(last_rowid)
+
+    cursor = conn.execute(f'''
+        INSERT INTO {table} (
+            {key}, product, feedback_count, rating_sum, product_sum, delivery_sum,
+            {", ".join(HIST_COLUMNS)}
+        )
+        SELECT
+            substr(timestamp, 1, {prefix}), COALESCE(product, ''), COUNT(*), COALESCE(SUM(rating), 0),
+            COALESCE(SUM({product}), 0), COALESCE(SUM({delivery}), 0),
+            {hist}
+        FROM feedback
+        WHERE {' AND '.join(conditions)}
+        GROUP BY 1, 2
+        ON CONFLICT({key}, product) DO UPDATE SET
+            {increments}
+    ''', params)
+    return cursor.rowcount
+
+
+@traced
+def rebuild_product_stats(conn, granularity='day'):
+    """
+    Recalcula os agregados de uma granularidade a partir da tabela `feedback`.
+
+    Não mexe no marcador; para recalcular tudo de forma consistente use
+    rebuild_all_product_stats.
+
+    Args:
+        conn: Conexão SQLite (dentro de uma transação)
+        granularity (str): 'hour' ou 'day'
+
+    Returns:
+        int: Quantidade de linhas (intervalo, produto) geradas
+    """
+    conn.execute(f"DELETE FROM {ROLLUPS[granularity][0]}")
+    return _aggregate_feedback(conn, granularity)
+
+
+@traced
+def rebuild_all_product_stats(conn):
+    """
+    Recalcula todos os agregados e põe o marcador no último feedback.
+
+    Returns:
+        dict: Linhas geradas por granularidade
+    """
+    last_rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM feedback").fetchone()[0]
+    rows = {}
+    for granularity, (table, _, _) in ROLLUPS.items():
+        conn.execute(f"DELETE FROM {table}")
+        rows[granularity] = _aggregate_feedback(conn, granularity, last_rowid=last_rowid)
+    _set_watermark(conn, last_rowid)
+    return rows
+
+
+@traced
+def catch_up_product_stats(conn, max_rows=CATCH_UP_BATCH):
+    """
+    Soma aos agregados os feedbacks depois do marcador e avança o marcador.
+
+    Processa no máximo `max_rows` rowids por chamada, para não segurar o lock
+    de escrita por muito tempo; chame de novo (em outra transação) até
+    retornar 0.
+
+    Args:
+        conn: Conexão SQLite (dentro de uma transação)
+        max_rows (int): Máximo de rowids processados (None = todos)
+
+    Returns:
+        int: Rowids processados por esta chamada
+    """
+    watermark = get_watermark(conn)
+    last_rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM feedback").fetchone()[0]
+    if max_rows is not None:
+        last_rowid = min(last_rowid, watermark + max_rows)
+    if last_rowid <= watermark:
+        return 0
+    for granularity in ROLLUPS:
+        _aggregate_feedback(conn, granularity, watermark + 1, last_rowid)
+    _set_watermark(conn, last_rowid)
+    return last_rowid - watermark
+
+
+def catch_up(manager=None, max_rows=CATCH_UP_BATCH, progress=None):
+    """
+    Roda catch_up_product_stats em transações sucessivas até alcançar o fim de `feedback`.
+
+    Args:
+        progress: Função chamada com o marcador após cada lote
+
+    Returns:
+        int: Rowids processados no total
+    """
+    manager = manager or database.get_manager()
+    total = 0
+    while True:
+        with manager.transaction(immediate=True) as conn:
+            done = catch_up_product_stats(conn, max_rows)
+            watermark = get_watermark(conn)
+        if not done:
+            return total
+        total += done
+        if progress:
+            progress(watermark)
+
+# ==================== CONSULTAS ====================
+
+def _period_filter(key, start=None, end=None, product=None):
+    """
+    Cláusula WHERE e parâmetros para período e produto.
+
+    start/end são inclusivos e comparados como texto com a coluna do
+    intervalo ('AAAA-MM-DD' ou 'AAAA-MM-DD HH'); um dia inteiro como fim de
+    um período por hora deve ser passado como 'AAAA-MM-DD 23'.
+    """
+    conditions, params = [], []
+    if start is not None:
+        conditions.append(f"{key} >= ?")
+        params.append(str(start))
+    if end is not None:
+        conditions.append(f"{key} <= ?")
+        params.append(str(end))
+    if product is not None:
+        conditions.append("product = ?")
+        params.append(product)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+def _summaries(cursor):
+    """Converte linhas (chave, somas...) em dicts com médias e histogramas."""
+    columns = [col[0] for col in cursor.description]
+    rows = []
+    for values in cursor.fetchall():
+        data = dict(zip(columns, values))
+        count = data['feedback_count']
+        summary = {key: data[key] for key in columns if key not in _SUM_COLUMNS}
+        summary.update({
+            'count': count,
+            'avg_rating': data['rating_sum'] / count if count else None,
+            'avg_product': data['product_sum'] / count if count else None,
+            'avg_delivery': data['delivery_sum'] / count if count else None,
+            'product_hist': [data[f"product_{k}"] for k in STARS],
+            'delivery_hist': [data[f"delivery_{k}"] for k in STARS],
+        })
+        rows.append(summary)
+    return rows
+
+
+def _sums():
+    return ", ".join(f"SUM({col}) AS {col}" for col in _SUM_COLUMNS)
+
+
+@traced
+def store_totals(start=None, end=None):
+    """
+    Totais da loja no período.
+
+    Returns:
+        dict: count, avg_rating, avg_product, avg_delivery e histogramas
+    """
+    where, params = _period_filter('day', start, end)
+    with database.get_manager().connection() as conn:
+        cursor = conn.execute(f"SELECT {_sums()} FROM product_daily_stats {where}", params)
+        summary = _summaries(cursor)[0]
+    if not summary['count']:
+        summary.update(count=0, product_hist=[0] * len(STARS), delivery_hist=[0] * len(STARS))
+    return summary
+
+
+@traced
+def product_summary(start=None, end=None):
+    """
+    Médias e histogramas por produto no período, do mais avaliado para o menos.
+
+    Returns:
+        list[dict]: Um dict por produto (product, count, avg_rating,
+        avg_product, avg_delivery, product_hist, delivery_hist)
+    """
+    where, params = _period_filter('day', start, end)
+    with database.get_manager().connection() as conn:
+        cursor = conn.execute(f'''
+            SELECT product, {_sums()} FROM product_daily_stats {where}
+            GROUP BY product ORDER BY feedback_count DESC, product
+        ''', params)
+        return _summaries(cursor)
+
+
+@traced
+def trend_summary(granularity='day', start=None, end=None, product=None):
+    """
+    Médias por hora ou por dia no período (todos os produtos ou um só), em ordem cronológica.
+
+    Intervalos sem feedbacks não aparecem.
+
+    Args:
+        granularity (str): 'hour' ou 'day'
+        start, end: Limites inclusivos no formato da coluna do intervalo
+
+    Returns:
+        list[dict]: Um dict por intervalo, com a chave 'hour' ou 'day' além
+        de count, avg_rating, avg_product, avg_delivery e histogramas
+    """
+    table, key, _ = ROLLUPS[granularity]
+    where, params = _period_filter(key, start, end, product)
+    with database.get_manager().connection() as conn:
+        cursor = conn.execute(f'''
+            SELECT {key}, {_sums()} FROM {table} {where}
+            GROUP BY {key} ORDER BY {key}
+        ''', params)
+        return _summaries(cursor)
+
+
+@traced
+def worst_products(limit=5, min_count=1, start=None, end=None):
+    """
+    Produtos com a pior média (produto + entrega) no período.
+
+    Args:
+        limit (int): Quantidade de produtos
+        min_count (int): Mínimo de feedbacks para entrar no ranking
+
+    Returns:
+        list[dict]: Como product_summary, com 'score' (média de produto e entrega)
+    """
+    where, params = _period_filter('day', start, end)
+    with database.get_manager().connection() as conn:
+        cursor = conn.execute(f'''
+            SELECT product, (SUM(product_sum) + SUM(delivery_sum)) / (2.0 * SUM(feedback_count)) AS score,
+                   {_sums()}
+            FROM product_daily_stats {where}
+            GROUP BY product
+            HAVING SUM(feedback_count) >= ?
+            ORDER BY score, product
+            LIMIT ?
+        ''', (*params, min_count, limit))
+        return _summaries(cursor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agregados por produto (hora e dia)")
+    parser.add_argument('--db', default=database.DB_PATH, help="Caminho do banco SQLite")
+    parser.add_argument('--rebuild', action='store_true', help="Recalcula a partir do histórico")
+    parser.add_argument('--catch-up', action='store_true', help="Soma os feedbacks depois do marcador")
+    parser.add_argument('--batch', type=int, default=CATCH_UP_BATCH, help="Feedbacks por transação no catch-up")
+    args = parser.parse_args()
+
+    # Import local: migrations importa este módulo
+    from feedsmart.storage.migrations import ensure_schema
+
+    manager = database.configure(args.db)
+    ensure_schema(manager)
+    if args.rebuild:
+        with manager.transaction(immediate=True) as conn:
+            rows = rebuild_all_product_stats(conn)
+        print(f"✅ Agregados por produto recalculados ({rows['day']} linhas dia/produto, "
+              f"{rows['hour']} linhas hora/produto)")
+    elif args.catch_up:
+        total = catch_up(manager, args.batch, progress=lambda mark: print(f"   marcador em {mark}"))
+        print(f"✅ {total} feedback(s) somados aos agregados")
+    else:
+        totals = store_totals()
+        print(f"{totals['count']} feedbacks")
+        for row in product_summary():
+            print(f"{row['product'] or '(sem produto)':<15} {row['count']:>10} "
+                  f"produto {row['avg_product']:.2f}  entrega {row['avg_delivery']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
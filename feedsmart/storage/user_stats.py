@@ -0,0 +1,230 @@
+"""
+Agregados de feedback por usuário, mantidos de forma incremental.
+
+A tabela `user_feedback_stats` guarda, para cada usuário, contagem, soma,
+mínimo e máximo das avaliações, data do último feedback e histogramas por
+nota (0 a 5) do produto e da entrega. save_feedback atualiza a linha do
+usuário na mesma transação em que grava o feedback, de modo que as páginas
+leem tudo com uma única consulta pela chave primária.
+
+A tabela `user_data_generation` guarda um contador incrementado a cada
+reescrita em massa dos dados (importação): os processos do app o comparam
+a cada rerun e descartam o cache de leitura quando ele muda.
+
+Para preencher ou corrigir a tabela a partir do histórico:
+    python -m feedsmart.storage.user_stats --rebuild
+"""
+import argparse
+
+from feedsmart.storage import database
+from feedsmart.tracing import traced
+
+# Notas possíveis no chatbot
+STARS = range(0, 6)
+
+HIST_COLUMNS = [f"product_{k}" for k in STARS] + [f"delivery_{k}" for k in STARS]
+
+
+def create_stats_table(conn):
+    """
+    Cria a tabela de agregados, se necessário.
+
+    Returns:
+        bool: True se a tabela acabou de ser criada (precisa de backfill)
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_feedback_stats'"
+    ).fetchone()
+    if exists:
+        return False
+
+    hist = ",\n        ".join(f"{col} INTEGER NOT NULL DEFAULT 0" for col in HIST_COLUMNS)
+    conn.execute(f'''
+    CREATE TABLE user_feedback_stats (
+        user_id TEXT PRIMARY KEY,
+        feedback_count INTEGER NOT NULL DEFAULT 0,
+        rating_sum REAL NOT NULL DEFAULT 0,
+        rating_min REAL,
+        rating_max REAL,
+        last_timestamp TEXT,
+        product_sum REAL NOT NULL DEFAULT 0,
+        delivery_sum REAL NOT NULL DEFAULT 0,
+        {hist},
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+    return True
+
+
+def _star(value):
+    """Retorna a nota inteira (0-5) ou None se o valor não for uma nota exata."""
+    if value is None or value != int(value) or not 0 <= value <= 5:
+        return None
+    return int(value)
+
+
+def star_histogram(product_value, delivery_value):
+    """Incrementos das colunas de histograma (HIST_COLUMNS) para um feedback."""
+    hist = dict.fromkeys(HIST_COLUMNS, 0)
+    if _star(product_value) is not None:
+        hist[f"product_{_star(product_value)}"] = 1
+    if _star(delivery_value) is not None:
+        hist[f"delivery_{_star(delivery_value)}"] = 1
+    return hist
+
+
+def record_feedback(conn, user_id, rating, timestamp, product_rating=None, delivery_rating=None):
+    """
+    Soma um novo feedback aos agregados do usuário (upsert).
+
+    Deve ser chamado na mesma transação do INSERT em `feedback`. Sem notas
+    específicas, produto e entrega usam a nota geral, como no dashboard.
+    """
+    product_value = rating if product_rating is None else product_rating
+    delivery_value = rating if delivery_rating is None else delivery_rating
+    hist = star_histogram(product_value, delivery_value)
+
+    columns = ", ".join(HIST_COLUMNS)
+    placeholders = ", ".join("?" * len(HIST_COLUMNS))
+    increments = ", ".join(f"{col} = {col} + excluded.{col}" for col in HIST_COLUMNS)
+    conn.execute(f'''
+        INSERT INTO user_feedback_stats (
+            user_id, feedback_count, rating_sum, rating_min, rating_max, last_timestamp,
+            product_sum, delivery_sum, {columns}
+        ) VALUES (?, 1, ?, ?, ?, ?, ?, ?, {placeholders})
+        ON CONFLICT(user_id) DO UPDATE SET
+            feedback_count = feedback_count + 1,
+            rating_sum = rating_sum + excluded.rating_sum,
+            -- MIN/MAX escalares retornam NULL se um dos lados for NULL
+            rating_min = MIN(COALESCE(rating_min, excluded.rating_min),
+                             COALESCE(excluded.rating_min, rating_min)),
+            rating_max = MAX(COALESCE(rating_max, excluded.rating_max),
+                             COALESCE(excluded.rating_max, rating_max)),
+            last_timestamp = MAX(COALESCE(last_timestamp, excluded.last_timestamp),
+                                 COALESCE(excluded.last_timestamp, last_timestamp)),
+            product_sum = product_sum + excluded.product_sum,
+            delivery_sum = delivery_sum + excluded.delivery_sum,
+            {increments}
+    ''', (user_id, rating, rating, rating, timestamp, product_value, delivery_value,
+          *hist.values()))
+
+
+@traced
+def rebuild_stats(conn, user_id=None):
+    """
+    Recalcula os agregados a partir da tabela `feedback`.
+
+    Args:
+        conn: Conexão SQLite (dentro de uma transação)
+        user_id (str): Recalcula só este usuário (padrão: todos)
+
+    Returns:
+        int: Quantidade de usuários recalculados
+    """
+    where = "WHERE user_id = ?" if user_id is not None else ""
+    params = (user_id,) if user_id is not None else ()
+
+    product = "COALESCE(product_rating, rating)"
+    delivery = "COALESCE(delivery_rating, rating)"
+    hist = ",\n            ".join(
+        [f"COALESCE(SUM({product} = {k}), 0)" for k in STARS]
+        + [f"COALESCE(SUM({delivery} = {k}), 0)" for k in STARS]
+    )
+
+    conn.execute(f"DELETE FROM user_feedback_stats {where}", params)
+    cursor = conn.execute(f'''
+        INSERT INTO user_feedback_stats (
+            user_id, feedback_count, rating_sum, rating_min, rating_max, last_timestamp,
+            product_sum, delivery_sum, {", ".join(HIST_COLUMNS)}
+        )
+        SELECT
+            user_id, COUNT(*), COALESCE(SUM(rating), 0), MIN(rating), MAX(rating), MAX(timestamp),
+            COALESCE(SUM({product}), 0), COALESCE(SUM({delivery}), 0),
+            {hist}
+        FROM feedback
+        {where}
+        GROUP BY user_id
+    ''', params)
+    return cursor.rowcount
+
+
+@traced
+def get_user_stats(user_id):
+    """
+    Lê os agregados de um usuário.
+
+    Returns:
+        dict: count, avg, min, max, last_timestamp, avg_product, avg_delivery,
+        product_hist e delivery_hist (listas com as contagens das notas 0 a 5).
+        Usuários sem feedback recebem contagem 0.
+    """
+    with database.get_manager().connection() as conn:
+        cursor = conn.execute("SELECT * FROM user_feedback_stats WHERE user_id = ?", (user_id,))
+        row = cursor.fetchone()
+        columns = [col[0] for col in cursor.description]
+
+    if row is None:
+        return {
+            'count': 0, 'avg': None, 'min': None, 'max': None, 'last_timestamp': None,
+            'avg_product': None, 'avg_delivery': None,
+            'product_hist': [0] * len(STARS), 'delivery_hist': [0] * len(STARS),
+        }
+
+    data = dict(zip(columns, row))
+    count = data['feedback_count']
+    return {
+        'count': count,
+        'avg': data['rating_sum'] / count if count else None,
+        'min': data['rating_min'],
+        'max': data['rating_max'],
+        'last_timestamp': data['last_timestamp'],
+        'avg_product': data['product_sum'] / count if count else None,
+        'avg_delivery': data['delivery_sum'] / count if count else None,
+        'product_hist': [data[f"product_{k}"] for k in STARS],
+        'delivery_hist': [data[f"delivery_{k}"] for k in STARS],
+    }
+
+
+# ==================== GERAÇÃO DOS DADOS ====================
+
+def create_generation_table(conn):
+    """Cria a tabela da geração dos dados (linha única, começando em 0)."""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS user_data_generation (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        generation INTEGER NOT NULL
+    )
+    ''')
+    conn.execute("INSERT OR IGNORE INTO user_data_generation (id, generation) VALUES (1, 0)")
+
+
+def get_generation(conn):
+    """Geração atual dos dados de usuário."""
+    row = conn.execute("SELECT generation FROM user_data_generation WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+
+def bump_generation(conn):
+    """Incrementa a geração: os caches de leitura de todos os processos serão descartados."""
+    conn.execute("UPDATE user_data_generation SET generation = generation + 1 WHERE id = 1")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manutenção da tabela user_feedback_stats")
+    parser.add_argument('--db', default=database.DB_PATH, help="Caminho do banco SQLite")
+    parser.add_argument('--rebuild', action='store_true', help="Recalcula todos os agregados")
+    parser.add_argument('--user', default=None, help="Recalcula apenas este usuário")
+    args = parser.parse_args()
+
+    if not args.rebuild and args.user is None:
+        parser.error("use --rebuild ou --user USER_ID")
+
+    manager = database.configure(args.db)
+    with manager.transaction() as conn:
+        create_stats_table(conn)
+        users = rebuild_stats(conn, args.user)
+    print(f"✅ Agregados recalculados para {users} usuário(s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Cadastro e autenticação de usuários.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import uuid
+
+from feedsmart.storage.database import get_manager
+from feedsmart.tracing import traced
+
+# Usuários com acesso às análises globais (FEEDSMART_ADMINS=ana,bruno)
+ADMIN_USERNAMES = frozenset(
+    name.strip() for name in os.environ.get('FEEDSMART_ADMINS', '').split(',') if name.strip()
+)
+
+
+def hash_password(password):
+    """Criptografa uma senha usando SHA-256."""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+@traced
+def verify_login(username, password):
+    """
+    Verifica as credenciais de login do usuário.
+    
+    Args:
+        username (str): Nome de usuário
+        password (str): Senha em texto plano
+        
+    Returns:
+        dict or None: Dados do usuário se válido, None se inválido
+    """
+    with get_manager().connection() as conn:
+        result = conn.execute(
+            "SELECT id, password, name FROM users WHERE username = ?", (username,)
+        ).fetchone()
+    
+    if result and result[1] == hash_password(password):
+        return {"id": result[0], "name": result[2], "username": username}
+    return None
+
+@traced
+def register_user(username, password, name, email):
+    """
+    Registra um novo usuário no sistema com validação completa.
+    
+    Args:
+        username (str): Nome de usuário único
+        password (str): Senha em texto plano
+        name (str): Nome completo
+        email (str): Email do usuário
+        
+    Returns:
+        tuple: (success, message)
+    """
+    # Validação de email usando regex
+    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    
+    if not re.match(email_pattern, email):
+        return False, "Email inválido. Use o formato: exemplo@dominio.com"
+    
+    # Validações adicionais
+    if not all([username, password, name, email]):
+        return False, "Todos os campos são obrigatórios"
+    
+    if len(password) < 6:
+        return False, "A senha deve ter pelo menos 6 caracteres"
+    
+    if len(username) < 3:
+        return False, "O nome de usuário deve ter pelo menos 3 caracteres"
+    
+    if len(name) < 2:
+        return False, "O nome deve ter pelo menos 2 caracteres"
+    
+    try:
+        user_id = str(uuid.uuid4())
+        with get_manager().transaction() as conn:
+            conn.execute(
+                "INSERT INTO users (id, username, password, name, email) VALUES (?, ?, ?, ?, ?)",
+                (user_id, username, hash_password(password), name, email)
+            )
+        return True, "Usuário registrado com sucesso!"
+        
+    except sqlite3.IntegrityError:
+        return False, "Nome de usuário já existe. Escolha outro."
+    except Exception as e:
+        return False, f"Erro inesperado: {str(e)}"
+
+
+def is_admin(user):
+    """
+    Indica se o usuário logado pode ver as análises globais (todos os usuários).
+    
+    Args:
+        user (dict): Usuário retornado por verify_login
+    """
+    return user is not None and user.get('username') in ADMIN_USERNAMES
@@ -0,0 +1,310 @@
+"""
+Rastreamento leve de tempos (spans) para achar onde uma execução gasta tempo.
+
+Um span mede um trecho de código; spans abertos dentro de outro viram filhos
+dele, formando uma árvore. O app abre um span raiz por rerun do Streamlit
+(start_trace/end_trace); fora de um rerun (worker, CLIs), um span de nível
+superior é a raiz da sua própria árvore.
+
+    @traced
+    def save_feedback(...): ...
+
+    with span('st.image'):
+        st.image(image)
+
+Cada árvore concluída vai para `recent_traces` e, se configurado, para um
+arquivo JSONL com rotação (uma linha por árvore, com os spans achatados).
+
+O rastreamento fica desligado por padrão: ligue com FEEDSMART_TRACE=1 (o
+arquivo vem de FEEDSMART_TRACE_FILE) ou com enable(). Desligado, um span fora
+de uma árvore em andamento custa só uma consulta a uma variável de thread.
+"""
+import datetime
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from collections import deque
+
+TRACE_FILE = os.environ.get('FEEDSMART_TRACE_FILE', 'traces.jsonl')
+
+# Rotação do arquivo JSONL
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# Árvores concluídas mantidas em memória
+RECENT_TRACES = 100
+
+_enabled = False
+
+
+class _ThreadState(threading.local):
+    """Pilha de spans abertos, uma por thread."""
+
+    def __init__(self):
+        self.stack = []
+
+
+_local = _ThreadState()
+_logger = logging.getLogger('feedsmart.trace')
+_logger.propagate = False
+
+recent_traces = deque(maxlen=RECENT_TRACES)
+
+
+class Span:
+    """
+    Trecho de código medido; também é o gerenciador de contexto que o mede.
+
+    Attributes:
+        name (str): Nome do trecho
+        attrs (dict): Atributos livres (ex.: quantidade de linhas)
+        start (float): Início (time.perf_counter)
+        duration (float): Duração em segundos (None enquanto aberto)
+        children (list): Spans abertos dentro deste
+    """
+
+    __slots__ = ('name', 'attrs', 'start', 'duration', 'children', 'started_at')
+
+    def __init__(self, name, attrs=None):
+        self.name = name
+        self.attrs = attrs or {}
+        self.start = None
+        self.duration = None
+        self.children = []
+        self.started_at = None
+
+    def set(self, **attrs):
+        """Adiciona atributos ao span."""
+        self.attrs.update(attrs)
+
+    @property
+    def self_time(self):
+        """Tempo gasto no próprio span, fora dos filhos."""
+        return self.duration - sum(child.duration or 0 for child in self.children)
+
+    def __enter__(self):
+        stack = _local.stack
+        if stack:
+            stack[-1].children.append(self)
+        else:
+            self.started_at = time.time()
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        stack = _local.stack
+        # Fecha também filhos deixados abertos (ex.: exceção entre enter e exit)
+        while stack and stack.pop() is not self:
+            pass
+        if not stack:
+            _finish(self)
+        return False
+
+
+class _NoopSpan:
+    """Span vazio devolvido quando o rastreamento está desligado."""
+
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+# ==================== API ====================
+
+def is_enabled():
+    """Indica se o rastreamento está ligado para todo o processo."""
+    return _enabled
+
+
+def is_active():
+    """Indica se um span aberto agora seria registrado."""
+    return _enabled or bool(_local.stack)
+
+
+def enable(path=TRACE_FILE, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT):
+    """
+    Liga o rastreamento no processo.
+
+    Args:
+        path (str): Arquivo JSONL das árvores concluídas (None = só em memória)
+        max_bytes (int): Tamanho a partir do qual o arquivo é rotacionado
+        backup_count (int): Arquivos antigos mantidos (traces.jsonl.1, .2, ...)
+    """
+    global _enabled
+    _close_sink()
+    if path:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _logger.addHandler(handler)
+        _logger.setLevel(logging.INFO)
+    _enabled = True
+
+
+def disable():
+    """Desliga o rastreamento e fecha o arquivo JSONL."""
+    global _enabled
+    _enabled = False
+    _close_sink()
+
+
+def _close_sink():
+    for handler in list(_logger.handlers):
+        _logger.removeHandler(handler)
+        handler.close()
+
+
+def span(name, **attrs):
+    """
+    Mede um trecho de código: `with span('nome', chave=valor): ...`.
+
+    Fora de uma árvore em andamento e com o rastreamento desligado, devolve
+    um span vazio que não registra nada.
+    """
+    if not _enabled and not _local.stack:
+        return _NOOP
+    return Span(name, attrs)
+
+
+def traced(name=None):
+    """
+    Decorador que mede cada chamada da função.
+
+    Aceita `@traced` (nome = módulo.função, sem o pacote) ou
+    `@traced('nome')`.
+    """
+    def decorator(func):
+        label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled and not _local.stack:
+                return func(*args, **kwargs)
+            with Span(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    if callable(name):
+        func, name = name, None
+        return decorator(func)
+    return decorator
+
+
+def start_trace(name, **attrs):
+    """
+    Abre a raiz de uma árvore na thread atual (ex.: um rerun do Streamlit).
+
+    Registra mesmo com o rastreamento desligado, o que permite ligar o painel
+    de tempos só para uma sessão. Feche com end_trace; uma árvore deixada
+    aberta na thread é descartada.
+
+    Returns:
+        Span: A raiz da árvore
+    """
+    _local.stack = []
+    root = Span(name, attrs)
+    root.__enter__()
+    return root
+
+
+def end_trace():
+    """
+    Fecha a árvore aberta por start_trace na thread atual.
+
+    Returns:
+        Span: A raiz concluída (None se não havia árvore aberta)
+    """
+    stack = _local.stack
+    if not stack:
+        return None
+    root = stack[0]
+    root.__exit__(None, None, None)
+    return root
+
+# ==================== RESULTADOS ====================
+
+def flatten(root):
+    """
+    Achata a árvore em uma lista na ordem de execução.
+
+    Returns:
+        list: Um dict por span (id, parent, depth, name, start_ms,
+        duration_ms, self_ms e os atributos do span)
+    """
+    rows = []
+
+    def visit(node, parent, depth):
+        index = len(rows)
+        rows.append({
+            'id': index,
+            'parent': parent,
+            'depth': depth,
+            'name': node.name,
+            'start_ms': round((node.start - root.start) * 1000, 3),
+            'duration_ms': round(node.duration * 1000, 3),
+            'self_ms': round(node.self_time * 1000, 3),
+            **node.attrs,
+        })
+        for child in node.children:
+            visit(child, index, depth + 1)
+
+    visit(root, None, 0)
+    return rows
+
+
+def summarize(root):
+    """
+    Agrupa os spans da árvore por nome.
+
+    Returns:
+        list: Um dict por nome (name, calls, total_ms, self_ms, max_ms),
+        do maior para o menor tempo próprio
+    """
+    totals = {}
+    for row in flatten(root):
+        entry = totals.setdefault(row['name'], {
+            'name': row['name'], 'calls': 0, 'total_ms': 0.0, 'self_ms': 0.0, 'max_ms': 0.0
+        })
+        entry['calls'] += 1
+        entry['total_ms'] += row['duration_ms']
+        entry['self_ms'] += row['self_ms']
+        entry['max_ms'] = max(entry['max_ms'], row['duration_ms'])
+    return sorted(totals.values(), key=lambda entry: entry['self_ms'], reverse=True)
+
+
+def _finish(root):
+    """Guarda a árvore concluída e grava no arquivo JSONL, se configurado."""
+    recent_traces.append(root)
+    if _logger.handlers:
+        record = {
+            'trace': root.name,
+            'started_at': datetime.datetime.fromtimestamp(root.started_at).isoformat(timespec='milliseconds'),
+            'duration_ms': round(root.duration * 1000, 3),
+            'thread': threading.current_thread().name,
+            'pid': os.getpid(),
+            'spans': flatten(root),
+        }
+        _logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+if os.environ.get('FEEDSMART_TRACE') == '1':
+    enable()
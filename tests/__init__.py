@@ -0,0 +1 @@
+# Este arquivo está vazio para marcar o diretório como um pacote Python
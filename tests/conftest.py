@@ -0,0 +1,35 @@
+"""
+Fixtures compartilhadas pelos testes.
+
+Cada teste recebe um banco SQLite novo em um diretório temporário; o banco
+do app (feedback_app.db) nunca é tocado.
+"""
+import pytest
+
+from feedsmart.cache import user_data_cache
+from feedsmart.storage import database
+from feedsmart.storage.migrations import ensure_schema
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Gerenciador de conexões do processo apontando para um banco temporário já migrado."""
+    manager = database.configure(str(tmp_path / 'feedsmart_test.db'))
+    ensure_schema(manager)
+    # O cache de leitura é global: resultados de outro banco não podem vazar
+    user_data_cache.lru.clear()
+    yield manager
+    user_data_cache.lru.clear()
+    manager.close_all()
+
+
+def insert_feedback(manager, feedback_id, user_id, rating, timestamp, product=None,
+                    product_rating=None, delivery_rating=None):
+    """Grava um feedback direto na tabela (sem agregados nem fila), como um import."""
+    with manager.transaction() as conn:
+        cursor = conn.execute(
+            "INSERT INTO feedback (id, user_id, rating, comment, timestamp, priority, "
+            "product, product_rating, delivery_rating) VALUES (?, ?, ?, '', ?, ?, ?, ?, ?)",
+            (feedback_id, user_id, rating, timestamp, 0, product, product_rating, delivery_rating)
+        )
+        return cursor.lastrowid
@@ -0,0 +1,63 @@
+"""Testes da escrita append-only do CSV de feedbacks."""
+import time
+
+import pandas as pd
+
+from feedsmart.analytics.data_processing import (
+    CSV_COLUMNS,
+    FeedbackAppendBuffer,
+    append_feedback_rows,
+    compact_data_file,
+)
+
+
+def feedback(name, date):
+    return {'nome': name, 'email': f"{name}@email.com", 'produto': 'Camiseta',
+            'avaliacao_produto': 4, 'avaliacao_entrega': 5, 'avaliacao_atendimento': 3,
+            'comentario': 'ok', 'data': date}
+
+
+def read(path):
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def new_csv(tmp_path):
+    path = tmp_path / 'feedback.csv'
+    path.write_text(",".join(CSV_COLUMNS) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def test_buffer_flushes_after_max_delay_without_new_rows(tmp_path):
+    path = new_csv(tmp_path)
+    buffer = FeedbackAppendBuffer(path, max_rows=100, max_delay=0.05)
+    buffer.add(feedback('ana', '2025-05-05 10:00:00'))
+
+    deadline = time.monotonic() + 5
+    while len(read(path)) < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert list(read(path)['nome']) == ['ana']
+    buffer.close()
+
+
+def test_buffer_flushes_full_batch_and_on_exit(tmp_path):
+    path = new_csv(tmp_path)
+    with FeedbackAppendBuffer(path, max_rows=2, max_delay=60) as buffer:
+        buffer.add(feedback('ana', '2025-05-05 10:00:00'))
+        buffer.add(feedback('bia', '2025-05-05 11:00:00'))
+        assert len(read(path)) == 2
+        buffer.add(feedback('caio', '2025-05-05 12:00:00'))
+
+    assert list(read(path)['nome']) == ['ana', 'bia', 'caio']
+
+
+def test_compaction_keeps_rows_and_order_by_default(tmp_path):
+    path = new_csv(tmp_path)
+    rows = [feedback('bia', '2025-05-06 10:00:00'), feedback('ana', '2025-05-05 10:00:00')]
+    append_feedback_rows(rows + rows[:1], path)
+
+    assert compact_data_file(path) == 3
+    assert list(read(path)['nome']) == ['bia', 'ana', 'bia']
+
+    assert compact_data_file(path, drop_duplicates=True, sort=True) == 2
+    assert list(read(path)['nome']) == ['ana', 'bia']
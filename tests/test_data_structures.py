@@ -0,0 +1,132 @@
+"""Testes da fila de prioridade em memória (heap indexado)."""
+import random
+
+import pytest
+
+from feedsmart.queue.data_structures import FeedbackQueue
+
+
+def check_invariants(queue):
+    """Heap ordenado, mapa id -> posição coerente e contadores por prioridade corretos."""
+    heap = queue._heap
+    for position, entry in enumerate(heap):
+        assert queue._index[entry[1]] == position
+        assert entry[0][0] == -entry[2].get('priority', 0)
+        for child in (2 * position + 1, 2 * position + 2):
+            if child < len(heap):
+                assert heap[position][0] <= heap[child][0]
+    assert len(queue._index) == len(heap)
+    counts = {}
+    for entry in heap:
+        priority = entry[2].get('priority', 0)
+        counts[priority] = counts.get(priority, 0) + 1
+    assert queue.priority_counts() == counts
+
+
+def drain(queue):
+    items = []
+    while not queue.is_empty():
+        items.append(queue.dequeue()['id'])
+    return items
+
+
+def test_dequeue_by_priority_then_fifo():
+    queue = FeedbackQueue()
+    for item_id, priority in [('a', 1), ('b', 5), ('c', 3), ('d', 5), ('e', 1)]:
+        queue.enqueue({'id': item_id, 'priority': priority})
+
+    assert queue.peek()['id'] == 'b'
+    assert [item['id'] for item in queue.get_sorted_by_priority()] == ['b', 'd', 'c', 'a', 'e']
+    assert [item['id'] for item in queue.get_all()] == ['a', 'b', 'c', 'd', 'e']
+    assert drain(queue) == ['b', 'd', 'c', 'a', 'e']
+    assert queue.dequeue() is None
+    assert queue.peek() is None
+
+
+def test_same_priority_is_fifo():
+    queue = FeedbackQueue()
+    for i in range(20):
+        queue.enqueue({'id': i})
+
+    assert drain(queue) == list(range(20))
+
+
+def test_duplicate_id_is_rejected():
+    queue = FeedbackQueue()
+    queue.enqueue({'id': 'a', 'priority': 1})
+
+    with pytest.raises(ValueError):
+        queue.enqueue({'id': 'a', 'priority': 5})
+
+    assert queue.size() == 1
+    assert queue.peek()['priority'] == 1
+    check_invariants(queue)
+    # Depois de sair da fila, o mesmo id pode voltar
+    queue.dequeue()
+    queue.enqueue({'id': 'a', 'priority': 2})
+    assert 'a' in queue
+
+
+def test_items_without_id_are_accepted():
+    queue = FeedbackQueue()
+    queue.enqueue({'priority': 1, 'comment': 'x'})
+    queue.enqueue({'priority': 1, 'comment': 'y'})
+
+    assert [queue.dequeue()['comment'] for _ in range(2)] == ['x', 'y']
+
+
+def test_update_priority_keeps_arrival_order():
+    queue = FeedbackQueue()
+    for item_id, priority in [('a', 1), ('b', 3), ('c', 1)]:
+        queue.enqueue({'id': item_id, 'priority': priority})
+
+    assert queue.update_priority('c', 3) is True
+    assert queue.update_priority('x', 3) is False
+    check_invariants(queue)
+    assert queue.count_by_priority(3) == 2
+    assert drain(queue) == ['b', 'c', 'a']
+
+
+def test_remove_returns_item_and_keeps_heap():
+    queue = FeedbackQueue()
+    for i in range(10):
+        queue.enqueue({'id': i, 'priority': i % 3})
+
+    assert queue.remove(4)['id'] == 4
+    assert queue.remove(4) is None
+    assert 4 not in queue
+    check_invariants(queue)
+    assert drain(queue) == [2, 5, 8, 1, 7, 0, 3, 6, 9]
+
+
+def test_random_operations_keep_invariants():
+    rng = random.Random(0)
+    queue = FeedbackQueue()
+    expected = {}
+    arrival = {}
+    for step in range(2000):
+        op = rng.random()
+        if op < 0.4 or not expected:
+            item_id = step
+            priority = rng.randint(0, 5)
+            queue.enqueue({'id': item_id, 'priority': priority})
+            expected[item_id] = priority
+            arrival[item_id] = step
+        elif op < 0.6:
+            item_id = rng.choice(list(expected))
+            expected[item_id] = rng.randint(0, 5)
+            assert queue.update_priority(item_id, expected[item_id])
+        elif op < 0.8:
+            item_id = rng.choice(list(expected))
+            assert queue.remove(item_id)['id'] == item_id
+            del expected[item_id]
+        else:
+            best = min(expected, key=lambda i: (-expected[i], arrival[i]))
+            assert queue.dequeue()['id'] == best
+            del expected[best]
+        if step % 50 == 0:
+            check_invariants(queue)
+
+    check_invariants(queue)
+    assert queue.size() == len(expected)
+    assert drain(queue) == sorted(expected, key=lambda i: (-expected[i], arrival[i]))
@@ -0,0 +1,43 @@
+"""Testes do gerenciador de conexões."""
+import os
+import threading
+
+from feedsmart.storage import database
+from feedsmart.storage.migrations import ensure_schema
+
+
+def test_memory_database_accepts_concurrent_writers():
+    manager = database.ConnectionManager(':memory:')
+    ensure_schema(manager)
+    errors = []
+
+    def write(worker):
+        for i in range(100):
+            try:
+                with manager.transaction(immediate=True) as conn:
+                    conn.execute("INSERT INTO feedback (id, user_id, rating) VALUES (?, ?, 3)",
+                                 (f"{worker}-{i}", worker))
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(f"w{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert manager.execute("SELECT COUNT(*) FROM feedback") == [(400,)]
+    temp_dir = manager._temp_dir
+    manager.close_all()
+    assert not os.path.exists(temp_dir)
+
+
+def test_memory_databases_are_independent():
+    first, second = database.ConnectionManager(':memory:'), database.ConnectionManager(':memory:')
+    try:
+        ensure_schema(first)
+        assert second.execute("SELECT name FROM sqlite_master WHERE name = 'feedback'") == []
+    finally:
+        first.close_all()
+        second.close_all()
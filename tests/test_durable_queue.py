@@ -0,0 +1,124 @@
+"""Testes da fila durável (lease/ack, estados e escopo por usuário)."""
+import time
+
+import pytest
+
+from feedsmart.queue.durable_queue import DurableFeedbackQueue
+from tests.conftest import insert_feedback
+
+
+@pytest.fixture
+def queue(db):
+    return DurableFeedbackQueue(db, visibility_timeout=60, max_attempts=2)
+
+
+def enqueue(db, queue, feedback_id, user_id='ana', priority=0):
+    insert_feedback(db, feedback_id, user_id, 3, '2025-05-05 10:00:00')
+    queue.enqueue(feedback_id, priority)
+
+
+def expire_leases(db):
+    with db.transaction() as conn:
+        conn.execute("UPDATE feedback_queue SET lease_expires_at = ? WHERE lease_owner IS NOT NULL",
+                     (time.time() - 1,))
+
+
+def test_claim_follows_priority_then_fifo(db, queue):
+    enqueue(db, queue, 'a', priority=1)
+    enqueue(db, queue, 'b', priority=5)
+    enqueue(db, queue, 'c', priority=1)
+
+    items = queue.claim('w1', batch_size=3)
+
+    assert [item['id'] for item in items] == ['b', 'a', 'c']
+    assert all(item['lease_owner'] == 'w1' and item['attempts'] == 1 for item in items)
+
+
+def test_enqueue_is_idempotent(db, queue):
+    enqueue(db, queue, 'a')
+    queue.enqueue('a', 3)
+
+    assert queue.size() == 1
+
+
+def test_leased_item_is_invisible_and_only_owner_can_ack(db, queue):
+    enqueue(db, queue, 'a')
+    item = queue.claim('w1')[0]
+
+    assert queue.claim('w2') == []
+    assert queue.ready_count() == 0
+    assert queue.ack(item['queue_id'], 'w2') is False
+    assert queue.ack(item['queue_id'], 'w1') is True
+    assert queue.size() == 0
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_loses_ack(db, queue):
+    enqueue(db, queue, 'a')
+    item = queue.claim('w1')[0]
+    expire_leases(db)
+
+    reclaimed = queue.claim('w2')
+
+    assert [i['queue_id'] for i in reclaimed] == [item['queue_id']]
+    assert reclaimed[0]['attempts'] == 2
+    assert queue.ack(item['queue_id'], 'w1') is False
+    assert queue.ack(item['queue_id'], 'w2') is True
+
+
+def test_release_makes_item_visible_again(db, queue):
+    enqueue(db, queue, 'a')
+    item = queue.claim('w1')[0]
+
+    assert queue.release(item['queue_id'], 'w1') is True
+    assert queue.ready_count() == 1
+    assert queue.claim('w2')[0]['id'] == 'a'
+
+
+def test_item_fails_after_max_attempts(db, queue):
+    enqueue(db, queue, 'a')
+    for _ in range(queue.max_attempts):
+        assert queue.claim('w1')
+        expire_leases(db)
+
+    assert queue.claim('w1') == []
+    assert queue.stats() == {'ready': 0, 'leased': 0, 'failed': 1}
+    assert queue.item_state(queue.get_sorted_by_priority()[0]) == 'failed'
+    # size/is_empty contam todas as linhas; ready_count só as entregáveis
+    assert queue.size() == 1
+    assert not queue.is_empty()
+    assert queue.ready_count() == 0
+
+
+def test_stats_and_item_state(db, queue):
+    enqueue(db, queue, 'a')
+    enqueue(db, queue, 'b')
+    queue.claim('w1')
+
+    assert queue.stats() == {'ready': 1, 'leased': 1, 'failed': 0}
+    states = {item['id']: queue.item_state(item) for item in queue.get_sorted_by_priority()}
+    assert states == {'a': 'leased', 'b': 'ready'}
+
+
+def test_clear_keeps_leased_items(db, queue):
+    enqueue(db, queue, 'a')
+    enqueue(db, queue, 'b')
+    leased = queue.claim('w1')[0]
+
+    assert queue.clear() == 1
+    assert [item['id'] for item in queue.get_sorted_by_priority()] == ['a']
+    assert queue.ack(leased['queue_id'], 'w1') is True
+
+
+def test_user_scope(db, queue):
+    enqueue(db, queue, 'a1', user_id='ana', priority=1)
+    enqueue(db, queue, 'b1', user_id='bia', priority=5)
+    enqueue(db, queue, 'a2', user_id='ana', priority=2)
+
+    assert queue.ready_count(user_id='ana') == 2
+    assert queue.priority_counts(user_id='ana') == {1: 1, 2: 1}
+    assert [item['id'] for item in queue.get_sorted_by_priority(user_id='ana')] == ['a2', 'a1']
+    assert queue.peek(user_id='ana')['id'] == 'a2'
+    assert queue.process_next('w1', user_id='ana')['id'] == 'a2'
+
+    assert queue.clear(user_id='ana') == 1
+    assert [item['id'] for item in queue.get_sorted_by_priority()] == ['b1']
@@ -0,0 +1,69 @@
+"""Testes da leitura paginada de feedbacks (query_user_feedbacks)."""
+import pytest
+
+from feedsmart.storage.feedback import get_user_feedbacks, query_user_feedbacks, save_feedback
+from tests.conftest import insert_feedback
+
+
+@pytest.fixture
+def feedbacks(db):
+    """Feedbacks da 'ana' com muitos empates de timestamp e nota, e um de outro usuário."""
+    rows = [
+        ('f1', 5, '2025-05-05 10:00:00'),
+        ('f2', 3, '2025-05-05 10:00:00'),
+        ('f3', 3, '2025-05-05 10:00:00'),
+        ('f4', 3, '2025-05-06 09:00:00'),
+        ('f5', 1, '2025-05-04 08:00:00'),
+        ('f6', 3, '2025-05-05 10:00:00'),
+        ('f7', 5, '2025-05-06 09:00:00'),
+    ]
+    for feedback_id, rating, timestamp in rows:
+        insert_feedback(db, feedback_id, 'ana', rating, timestamp)
+    insert_feedback(db, 'outro', 'bia', 4, '2025-05-05 10:00:00')
+    return rows
+
+
+def _all_pages(sort_method, limit):
+    ids, cursor = [], None
+    while True:
+        df, cursor = query_user_feedbacks('ana', sort_method, limit=limit, cursor=cursor)
+        assert len(df) <= limit
+        ids.extend(df['id'])
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize('sort_method', ['timestamp', 'rating'])
+@pytest.mark.parametrize('limit', [1, 2, 3, 7, 10])
+def test_pages_match_unpaginated_order(feedbacks, sort_method, limit):
+    full, cursor = query_user_feedbacks('ana', sort_method)
+
+    assert cursor is None
+    assert len(full) == len(feedbacks)
+    assert _all_pages(sort_method, limit) == list(full['id'])
+
+
+def test_sort_orders(feedbacks):
+    by_time, _ = query_user_feedbacks('ana', 'timestamp')
+    by_rating, _ = query_user_feedbacks('ana', 'rating')
+
+    # Empates desempatados pelo rowid, do mais recente para o mais antigo
+    assert list(by_time['id']) == ['f7', 'f4', 'f6', 'f3', 'f2', 'f1', 'f5']
+    assert list(by_rating['id']) == ['f7', 'f1', 'f4', 'f6', 'f3', 'f2', 'f5']
+
+
+def test_unknown_user_returns_empty_page(feedbacks):
+    df, cursor = query_user_feedbacks('ninguem', limit=5)
+
+    assert df.empty
+    assert cursor is None
+
+
+def test_cached_read_sees_new_feedback(db):
+    save_feedback('ana', 4, 'primeiro')
+    first, _ = get_user_feedbacks('ana')
+    assert get_user_feedbacks('ana')[0] is first
+
+    save_feedback('ana', 2, 'segundo')
+
+    assert len(get_user_feedbacks('ana')[0]) == 2
@@ -0,0 +1,143 @@
+"""Testes da importação do CSV legado."""
+import pytest
+
+from feedsmart.analytics.data_processing import CSV_COLUMNS, iter_feedback_chunks
+from feedsmart.storage import database, product_stats
+from feedsmart.storage.feedback import get_cached_user_stats, get_user_feedbacks, sync_user_data_cache
+from feedsmart.storage.importer import FeedbackImporter, import_csv
+from feedsmart.storage.user_stats import bump_generation, get_user_stats, rebuild_stats
+
+HEADER = ",".join(CSV_COLUMNS)
+
+
+def write_csv(tmp_path, lines, name='legado.csv'):
+    path = tmp_path / name
+    path.write_text("\n".join([HEADER, *lines]) + "\n", encoding='utf-8')
+    return str(path)
+
+
+def watermark(manager):
+    with manager.connection() as conn:
+        return product_stats.get_watermark(conn)
+
+
+def test_rows_without_ratings_are_skipped(db, tmp_path):
+    path = write_csv(tmp_path, [
+        "ana,ana@email.com,camisa,5,4,3,bom,2025-05-05 10:00:00",
+        "ana,ana@email.com,camisa,,,,sem nota,2025-05-05 11:00:00",
+        "bia,bia@email.com,boné,,,,sem nota,2025-05-06 09:00:00",
+        "bia,bia@email.com,boné,2,,,ruim,2025-05-06 10:00:00",
+    ])
+
+    result = import_csv(path, manager=db)
+
+    assert (result['rows'], result['inserted'], result['skipped']) == (4, 2, 2)
+    assert result['users_created'] == 2
+    assert db.execute("SELECT COUNT(*) FROM feedback WHERE rating IS NULL") == [(0,)]
+    # Os agregados foram recalculados e o catch-up alcançou o fim da tabela
+    assert watermark(db) == 2
+    assert product_stats.store_totals()['count'] == 2
+    bia = db.execute("SELECT id FROM users WHERE email = 'bia@email.com'")[0][0]
+    assert get_user_stats(bia)['count'] == 1
+
+
+def test_rating_and_priority_from_csv(db, tmp_path):
+    path = write_csv(tmp_path, ["ana,ana@email.com, camisa ,5,4,3,bom,2025-05-05 10:00:00"])
+
+    import_csv(path, manager=db)
+
+    row = db.execute("SELECT rating, priority, product, product_rating, delivery_rating FROM feedback")[0]
+    assert row == (4.0, 2, 'Camiseta', 5, 4)
+
+
+def test_legacy_product_names_map_to_catalog(db, tmp_path):
+    path = write_csv(tmp_path, [
+        f"ana,ana@email.com,{name},4,4,4,ok,2025-05-05 1{i}:00:00"
+        for i, name in enumerate(['camisa', 'camisa ', 'CAMISETA', 'short', 'calca', 'Tênis', 'boné'])
+    ] + ["ana,ana@email.com,,4,4,4,sem produto,2025-05-05 18:00:00"])
+
+    import_csv(path, manager=db)
+
+    products = [row[0] for row in db.execute("SELECT product FROM feedback ORDER BY timestamp")]
+    assert products == ['Camiseta', 'Camiseta', 'Camiseta', 'Shorts', 'Calça', 'Tênis', 'boné', None]
+    summary = {row['product']: row['count'] for row in product_stats.product_summary()}
+    assert summary == {'Camiseta': 3, 'Shorts': 1, 'Calça': 1, 'Tênis': 1, 'boné': 1, '': 1}
+
+
+def test_rows_differing_only_in_service_rating_are_distinct(db, tmp_path):
+    lines = [f"ana,ana@email.com,camisa,4,4,{k},ok,2025-05-05 10:00:00" for k in (1, 2, 3, 4)]
+    path = write_csv(tmp_path, lines)
+
+    assert import_csv(path, manager=db)['inserted'] == 4
+    # Reimportar o mesmo arquivo não duplica nada
+    again = import_csv(path, manager=db)
+    assert (again['rows'], again['inserted'], again['users_created']) == (4, 0, 0)
+    assert db.execute("SELECT COUNT(*) FROM feedback") == [(4,)]
+
+
+def test_existing_user_is_matched_by_email(db, tmp_path):
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO users (id, username, name, email) VALUES ('u1', 'ana', 'Ana', 'Ana@Email.com')")
+    path = write_csv(tmp_path, ["ana,ana@email.com ,camisa,5,5,5,ótimo,2025-05-05 10:00:00"])
+
+    result = import_csv(path, manager=db)
+
+    assert result['users_created'] == 0
+    assert db.execute("SELECT user_id FROM feedback") == [('u1',)]
+
+
+def test_interrupted_import_still_refreshes_aggregates(db, tmp_path):
+    path = write_csv(tmp_path, [
+        "ana,ana@email.com,camisa,5,4,3,bom,2025-05-05 10:00:00",
+        "bia,bia@email.com,boné,2,2,2,ruim,2025-05-06 10:00:00",
+    ])
+
+    def chunks():
+        yield from iter_feedback_chunks(path, chunksize=1)
+        raise RuntimeError("leitura interrompida")
+
+    with pytest.raises(RuntimeError):
+        FeedbackImporter(db, commit_every=1).import_chunks(chunks())
+
+    assert db.execute("SELECT COUNT(*) FROM feedback") == [(2,)]
+    assert watermark(db) == 2
+    assert db.execute("SELECT SUM(feedback_count) FROM user_feedback_stats") == [(2,)]
+    # Os índices removidos durante a carga foram recriados
+    assert db.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = 'feedback' "
+                      "AND name = 'idx_feedback_user_timestamp'") == [(1,)]
+
+
+def test_import_invalidates_cached_reads(db, tmp_path):
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO users (id, username, name, email) VALUES ('u1', 'ana', 'Ana', 'ana@email.com')")
+    assert get_cached_user_stats('u1')['count'] == 0
+    assert get_user_feedbacks('u1')[0].empty
+    path = write_csv(tmp_path, ["ana,ana@email.com,Camiseta,5,5,5,ótimo,2025-05-05 10:00:00"])
+
+    import_csv(path, manager=db)
+
+    assert get_cached_user_stats('u1')['count'] == 1
+    assert len(get_user_feedbacks('u1')[0]) == 1
+
+
+def test_import_from_another_process_invalidates_cache(db, tmp_path):
+    sync_user_data_cache()
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO users (id, username, name, email) VALUES ('u1', 'ana', 'Ana', 'ana@email.com')")
+    assert get_cached_user_stats('u1')['count'] == 0
+
+    # Outro processo: gerenciador próprio e cache próprio (as versões daqui não mudam)
+    other = database.ConnectionManager(db.db_path)
+    try:
+        with other.transaction() as conn:
+            conn.execute("INSERT INTO feedback (id, user_id, rating, timestamp) "
+                         "VALUES ('f1', 'u1', 5, '2025-05-05 10:00:00')")
+            rebuild_stats(conn)
+            bump_generation(conn)
+    finally:
+        other.close_all()
+    assert get_cached_user_stats('u1')['count'] == 0
+
+    sync_user_data_cache()
+
+    assert get_cached_user_stats('u1')['count'] == 1
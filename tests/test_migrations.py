@@ -0,0 +1,53 @@
+"""Testes das migrações do esquema."""
+from feedsmart.storage import database
+from feedsmart.storage.migrations import LATEST_VERSION, MIGRATIONS, ensure_schema, get_version, migrate
+
+
+def _tables(manager):
+    return {row[0] for row in manager.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def test_fresh_database_applies_every_step(tmp_path):
+    manager = database.ConnectionManager(str(tmp_path / 'novo.db'))
+    try:
+        assert migrate(manager) == [version for version, _, _ in MIGRATIONS]
+        with manager.connection() as conn:
+            assert get_version(conn) == LATEST_VERSION
+        assert {
+            'users', 'feedback', 'feedback_queue', 'user_feedback_stats',
+            'product_daily_stats', 'product_hourly_stats', 'rollup_state',
+        } <= _tables(manager)
+    finally:
+        manager.close_all()
+
+
+def test_migrate_is_idempotent(db):
+    assert migrate(db) == []
+    assert ensure_schema(db) == []
+    with db.connection() as conn:
+        assert get_version(conn) == LATEST_VERSION
+
+
+def test_legacy_database_is_upgraded_and_backfilled(tmp_path):
+    manager = database.ConnectionManager(str(tmp_path / 'legado.db'))
+    try:
+        # Esquema original: sem priority nem colunas de notas, notas só no comentário
+        with manager.transaction() as conn:
+            conn.execute("CREATE TABLE users (id TEXT PRIMARY KEY, username TEXT UNIQUE, "
+                         "password TEXT, name TEXT, email TEXT)")
+            conn.execute("CREATE TABLE feedback (id TEXT PRIMARY KEY, user_id TEXT, rating REAL, "
+                         "comment TEXT, timestamp TEXT)")
+            conn.execute(
+                "INSERT INTO feedback VALUES ('f1', 'ana', 4.5, "
+                "'Produto: camisa | Avaliação do produto: 4/5 | Avaliação da entrega: 5/5', "
+                "'2025-05-05 10:00:00')"
+            )
+
+        migrate(manager)
+
+        row = manager.execute("SELECT product, product_rating, delivery_rating FROM feedback")[0]
+        assert row == ('camisa', 4, 5)
+        assert manager.execute("SELECT feedback_count FROM user_feedback_stats WHERE user_id = 'ana'") == [(1,)]
+        assert manager.execute("SELECT feedback_count FROM product_daily_stats") == [(1,)]
+    finally:
+        manager.close_all()
@@ -0,0 +1,109 @@
+"""Testes dos agregados por produto (hora/dia) e do marcador de agregação."""
+from feedsmart.storage import product_stats
+from feedsmart.storage.feedback import save_feedback
+from tests.conftest import insert_feedback
+
+
+def snapshot(manager):
+    """Conteúdo das tabelas de agregados, para comparar com um recálculo completo."""
+    return {
+        table: manager.execute(f"SELECT * FROM {table} ORDER BY 1, 2")
+        for table, _, _ in product_stats.ROLLUPS.values()
+    }
+
+
+def rebuilt(manager):
+    """Agregados recalculados do zero (a transação é desfeita no final)."""
+    with manager.connection() as conn:
+        conn.execute("BEGIN")
+        try:
+            product_stats.rebuild_all_product_stats(conn)
+            return snapshot(manager)
+        finally:
+            conn.rollback()
+
+
+def watermark(manager):
+    with manager.connection() as conn:
+        return product_stats.get_watermark(conn)
+
+
+def test_save_feedback_updates_rollups_incrementally(db):
+    save_feedback('ana', 4.5, 'ok', 'camisa', 4, 5)
+    save_feedback('bia', 2, 'ruim', 'camisa', 1, 3)
+    save_feedback('ana', 5, 'ótimo', 'boné', 5, 5)
+
+    assert watermark(db) == 3
+    assert snapshot(db) == rebuilt(db)
+    totals = product_stats.store_totals()
+    assert totals['count'] == 3
+    assert totals['product_hist'] == [0, 1, 0, 0, 1, 1]
+    assert [row['product'] for row in product_stats.product_summary()] == ['camisa', 'boné']
+
+
+def test_save_feedback_closes_watermark_gap(db):
+    save_feedback('ana', 4, 'antes', 'camisa', 4, 4)
+    # Inserção por fora de save_feedback: fica depois do marcador
+    insert_feedback(db, 'manual', 'ana', 2, '2025-05-05 10:00:00', 'camisa', 2, 2)
+    assert watermark(db) == 1
+
+    save_feedback('ana', 5, 'depois', 'camisa', 5, 5)
+
+    assert watermark(db) == 3
+    assert snapshot(db) == rebuilt(db)
+
+
+def test_catch_up_in_batches(db):
+    for i in range(5):
+        insert_feedback(db, f"f{i}", 'ana', 3, f"2025-05-0{i + 1} 10:00:00", 'camisa', 3, 3)
+    seen = []
+
+    assert product_stats.catch_up(db, max_rows=2, progress=seen.append) == 5
+    assert seen == [2, 4, 5]
+    assert snapshot(db) == rebuilt(db)
+    assert product_stats.catch_up(db) == 0
+
+
+def test_null_rating_does_not_break_rollups(db):
+    insert_feedback(db, 'sem-nota', 'ana', None, '2025-05-05 10:00:00', 'camisa')
+
+    assert product_stats.catch_up(db) == 1
+    assert product_stats.store_totals()['count'] == 1
+
+
+def test_reused_rowid_is_counted_once(db):
+    save_feedback('ana', 4, 'a', 'camisa', 4, 4)
+    save_feedback('ana', 3, 'b', 'camisa', 3, 3)
+    # Apagar o último feedback libera o rowid 2 (já abaixo do marcador) para o próximo INSERT
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM feedback WHERE rowid = 2")
+        for granularity in product_stats.ROLLUPS:
+            product_stats.rebuild_product_stats(conn, granularity)
+
+    save_feedback('ana', 1, 'c', 'camisa', 1, 1)
+
+    assert watermark(db) == 2
+    assert product_stats.store_totals()['count'] == 2
+    assert snapshot(db) == rebuilt(db)
+
+
+def test_trend_summary_by_hour_and_day(db):
+    rows = [
+        ('a', 5, '2025-05-05 10:15:00', 'camisa'),
+        ('b', 3, '2025-05-05 10:45:00', 'camisa'),
+        ('c', 1, '2025-05-05 14:00:00', 'boné'),
+        ('d', 4, '2025-05-06 09:00:00', 'camisa'),
+    ]
+    for feedback_id, rating, timestamp, product in rows:
+        insert_feedback(db, feedback_id, 'ana', rating, timestamp, product, rating, rating)
+    product_stats.catch_up(db)
+
+    days = product_stats.trend_summary('day')
+    assert [(row['day'], row['count']) for row in days] == [('2025-05-05', 3), ('2025-05-06', 1)]
+    assert days[0]['avg_rating'] == 3
+
+    hours = product_stats.trend_summary('hour', start='2025-05-05 00', end='2025-05-05 23', product='camisa')
+    assert [(row['hour'], row['avg_rating']) for row in hours] == [('2025-05-05 10', 4)]
+
+    worst = product_stats.worst_products(limit=1)
+    assert worst[0]['product'] == 'boné'
@@ -0,0 +1,105 @@
+"""Testes do motor de ordenação, comparado com o merge sort recursivo original."""
+import random
+
+import numpy as np
+import pytest
+
+from feedsmart.sorting import (
+    NUMPY_THRESHOLD,
+    argsort_by_rating,
+    merge_sort_by_rating,
+    sort_by_keys,
+    sort_indices_by_rating,
+)
+
+SIZES = [0, 1, 2, 3, NUMPY_THRESHOLD - 1, NUMPY_THRESHOLD, NUMPY_THRESHOLD + 1, 500]
+
+
+def baseline_merge_sort(arr):
+    """Merge sort recursivo da versão original (decrescente e estável)."""
+    def merge_sort(items):
+        if len(items) <= 1:
+            return items
+        mid = len(items) // 2
+        left, right = merge_sort(items[:mid]), merge_sort(items[mid:])
+        result, i, j = [], 0, 0
+        while i < len(left) and j < len(right):
+            if left[i][0] >= right[j][0]:
+                result.append(left[i])
+                i += 1
+            else:
+                result.append(right[j])
+                j += 1
+        return result + left[i:] + right[j:]
+
+    return [index for _, index in merge_sort([(value, i) for i, value in enumerate(arr)])]
+
+
+def ratings(n, seed=0, missing=0.0):
+    """Notas com muitos empates (meias estrelas de 0 a 5) e, opcionalmente, NaN."""
+    rng = random.Random(seed)
+    return [float('nan') if rng.random() < missing else rng.randint(0, 10) / 2 for _ in range(n)]
+
+
+def expected_with_missing(arr):
+    """Ordem de referência: baseline para as notas presentes e ausentes no final."""
+    present = [i for i, value in enumerate(arr) if value == value]
+    missing = [i for i, value in enumerate(arr) if value != value]
+    return [present[i] for i in baseline_merge_sort([arr[i] for i in present])] + missing
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_matches_baseline_with_ties(n):
+    arr = ratings(n, seed=n)
+    expected = baseline_merge_sort(arr)
+
+    assert merge_sort_by_rating(arr) == expected
+    assert argsort_by_rating(arr).tolist() == expected
+    assert sort_indices_by_rating(arr) == expected
+    assert sort_by_keys(arr).tolist() == expected
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_missing_ratings_go_last_on_every_path(n):
+    arr = ratings(n, seed=n, missing=0.2)
+    expected = expected_with_missing(arr)
+
+    assert merge_sort_by_rating(arr) == expected
+    assert argsort_by_rating(arr).tolist() == expected
+    assert sort_indices_by_rating(arr) == expected
+    assert sort_by_keys(arr).tolist() == expected
+
+
+def test_none_counts_as_missing():
+    arr = [3, None, 5, None, 3]
+
+    assert merge_sort_by_rating(arr) == [2, 0, 4, 1, 3]
+    assert argsort_by_rating(arr).tolist() == [2, 0, 4, 1, 3]
+
+
+def test_stability_of_equal_ratings():
+    arr = [4.0] * 10 + [5.0] * 10
+    expected = list(range(10, 20)) + list(range(10))
+
+    assert merge_sort_by_rating(arr) == expected
+    assert argsort_by_rating(arr).tolist() == expected
+
+
+def test_tuples_sort_by_several_keys():
+    arr = [(4, '2025-05-05'), (5, '2025-05-01'), (4, '2025-05-07'), (4, '2025-05-05')]
+
+    assert merge_sort_by_rating(arr) == baseline_merge_sort(arr) == [1, 2, 0, 3]
+
+
+@pytest.mark.parametrize('n', SIZES)
+@pytest.mark.parametrize('descending', [True, False])
+def test_sort_by_keys_matches_sorted(n, descending):
+    rng = random.Random(n)
+    rating = ratings(n, seed=n)
+    timestamp = [f"2025-05-0{rng.randint(1, 3)} 10:00:00" for _ in range(n)]
+    priority = np.array([rng.randint(0, 2) for _ in range(n)], dtype=np.uint8)
+
+    # sorted(reverse=True) também é estável
+    expected = sorted(range(n), key=lambda i: (rating[i], timestamp[i], priority[i]), reverse=descending)
+
+    assert sort_by_keys(rating, timestamp, priority, descending=descending).tolist() == expected
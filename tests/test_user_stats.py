@@ -0,0 +1,39 @@
+"""Testes dos agregados por usuário."""
+from feedsmart.storage.user_stats import get_user_stats, rebuild_stats, record_feedback
+
+
+def test_min_max_recover_after_null_ratings(db):
+    # Histórico só com notas vazias: o recálculo grava mínimo e máximo NULL
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO feedback (id, user_id, rating, timestamp) "
+                     "VALUES ('f0', 'ana', NULL, '2025-05-05 10:00:00')")
+        rebuild_stats(conn)
+    assert (get_user_stats('ana')['min'], get_user_stats('ana')['max']) == (None, None)
+
+    with db.transaction() as conn:
+        record_feedback(conn, 'ana', 4, '2025-05-06 10:00:00', 4, 4)
+        record_feedback(conn, 'ana', 2, '2025-05-04 10:00:00', 2, 2)
+
+    stats = get_user_stats('ana')
+    assert stats['count'] == 3
+    assert (stats['min'], stats['max']) == (2, 4)
+    assert stats['last_timestamp'] == '2025-05-06 10:00:00'
+
+
+def test_incremental_stats_match_rebuild(db):
+    rows = [(5, '2025-05-05 10:00:00', 5, 5), (3.5, '2025-05-06 10:00:00', 3, 4), (1, '2025-05-04 10:00:00', 1, 1)]
+    with db.transaction() as conn:
+        for i, (rating, timestamp, product_rating, delivery_rating) in enumerate(rows):
+            conn.execute(
+                "INSERT INTO feedback (id, user_id, rating, timestamp, product_rating, delivery_rating) "
+                "VALUES (?, 'ana', ?, ?, ?, ?)", (f"f{i}", rating, timestamp, product_rating, delivery_rating)
+            )
+            record_feedback(conn, 'ana', rating, timestamp, product_rating, delivery_rating)
+    incremental = get_user_stats('ana')
+
+    with db.transaction() as conn:
+        rebuild_stats(conn)
+
+    assert get_user_stats('ana') == incremental
+    assert incremental['product_hist'] == [0, 1, 0, 1, 0, 1]
+    assert incremental['delivery_hist'] == [0, 1, 0, 0, 1, 1]